@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from depth_benchmark import nested_blocks, nested_brackets, operator_chain, negations
+from compiler.lexer.lexer import Lexer
+from compiler.limits import CompilerLimits, UNTRUSTED_LIMITS
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+STAGES = ("lex", "parse", "analyze", "codegen")
+
+
+def long_identifier(size: int) -> str:
+    name = "a" * size
+    return f"# 😀 🐷 🐖{name}🐖 @ 1 #\n# ... 🐖{name}🐖 ... #\n"
+
+
+def long_number(size: int) -> str:
+    return f"# 😀 🐷 🐖x🐖 @ {'9' * size} #\n# ... 🐖x🐖 ... #\n"
+
+
+def variable_name(index: int) -> str:
+    name = "v"
+    while True:
+        index, letter = divmod(index, 26)
+        name += chr(ord("a") + letter)
+        if index == 0:
+            return name
+
+
+def many_variables(size: int) -> str:
+    return "".join(f"# 😀 🐷 🐖{variable_name(i)}🐖 @ {i} #\n" for i in range(size)) + "# ... 🐖va🐖 ... #\n"
+
+
+def comment_flood(size: int) -> str:
+    return "👀 " + "oink " * size + "\n👀👀👀" + " oink\n" * size + "👀👀👀\n# 😀 🐷 🐖x🐖 @ 1 #\n# ... 🐖x🐖 ... #\n"
+
+
+def nested_comparisons(size: int) -> str:
+    return ("# 😀 wow 🐖b🐖 @ " + "** " * size + "LOVE" + " 🌸🌸 LOVE **" * size + " #\n"
+            + "# ... 🐖b🐖 ... #\n")
+
+
+SHAPES = {
+    "long identifier": long_identifier,
+    "long number": long_number,
+    "many variables": many_variables,
+    "comment flood": comment_flood,
+    "nested blocks": nested_blocks,
+    "nested brackets": nested_brackets,
+    "operator chain": operator_chain,
+    "negations": negations,
+    "nested comparisons": nested_comparisons,
+}
+
+
+def time_stages(source: str, limits: CompilerLimits) -> tuple[list[float], str]:
+    timings = []
+    try:
+        start = time.perf_counter()
+        tokens = Lexer(source, limits=limits).tokenize()
+        timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        ast = SyntaxParser(tokens, limits=limits).parse_program()
+        timings.append(time.perf_counter() - start)
+
+        for visitor in (SemanticAnalyzer(limits=limits), CodeGenerator(limits)):
+            start = time.perf_counter()
+            visitor.visit(ast)
+            timings.append(time.perf_counter() - start)
+    except ValueError as e:
+        timings.append(time.perf_counter() - start)
+        return timings, f"rejected in {STAGES[len(timings) - 1]}: {str(e)[:60]}"
+    return timings, "compiled"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2_000, 8_000, 32_000],
+                        help="Sizes of each adversarial input, smallest first")
+    parser.add_argument('--shapes', nargs='+', choices=list(SHAPES), default=list(SHAPES),
+                        help="Kinds of adversarial input to generate")
+    parser.add_argument('--untrusted', action='store_true',
+                        help="Compile with the limits for untrusted code instead of only an instruction budget")
+    parser.add_argument('--max-slowdown', type=float, default=3.0,
+                        help="Largest allowed growth of the time per unit of input between the smallest and largest size")
+    args = parser.parse_args()
+
+    limits = UNTRUSTED_LIMITS if args.untrusted else CompilerLimits(max_instructions=1 << 16)
+    superlinear = []
+
+    print(f"{'shape':>18} {'size':>7} " + " ".join(f"{stage:>8}" for stage in STAGES) + "  outcome")
+    for name in args.shapes:
+        per_unit = []
+        for size in args.sizes:
+            timings, outcome = time_stages(SHAPES[name](size), limits)
+            per_unit.append(sum(timings) / size)
+            print(f"{name:>18} {size:>7} " + " ".join(f"{stage:7.3f}s" for stage in timings)
+                  + "         " * (len(STAGES) - len(timings)) + f"  {outcome}")
+
+        slowdown = per_unit[-1] / per_unit[0]
+        if slowdown > args.max_slowdown:
+            superlinear.append(f"{name} ({slowdown:.1f}x slower per unit)")
+
+    if superlinear:
+        print("Not linear: " + ", ".join(superlinear))
+        sys.exit(1)
+    print("Every shape stays linear in its input size")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+import argparse
+import resource
+import sys
+import os
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from program_generator import generate_program
+from compiler.lexer.lexer import Lexer
+from compiler.node.ast_arena import ArenaBuilder
+from compiler.node.node_builder import NodeBuilder
+from compiler.node.ast_node import ASTNode
+from compiler.syntax_parser import SyntaxParser
+
+
+def count_nodes(root: ASTNode) -> tuple[int, int]:
+    total, distinct, seen = 0, 0, set()
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, list):
+            pending.extend(node)
+            continue
+        if not isinstance(node, ASTNode):
+            continue
+        total += 1
+        if id(node) not in seen:
+            seen.add(id(node))
+            distinct += 1
+        for cls in type(node).__mro__:
+            pending.extend(getattr(node, name) for name in getattr(cls, "__slots__", ()))
+        pending.extend(getattr(node, "__dict__", {}).values())
+    return total, distinct
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=1_000_000, help="Approximate number of AST nodes to build")
+    parser.add_argument('--arena', action='store_true', help="Build the flat array-backed arena instead of objects")
+    args = parser.parse_args()
+
+    # the generated programs average about three and a half nodes per line
+    source = generate_program(max(args.nodes * 2 // 7, 1))
+    tokens = Lexer(source).tokenize()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    builder = ArenaBuilder() if args.arena else NodeBuilder()
+    ast = SyntaxParser(tokens, builder=builder).parse_program()
+    elapsed = time.perf_counter() - start
+    ast_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if args.arena:
+        total = len(builder.arena)
+        print(f"AST nodes:      {total} (arena rows, literals are shared)")
+    else:
+        total, distinct = count_nodes(ast)
+        print(f"AST nodes:      {total} ({distinct} distinct objects, the rest are shared)")
+    print(f"Parse time:     {elapsed:.2f}s")
+    print(f"AST memory:     {ast_bytes / 1_000_000:.1f} MB ({ast_bytes / total:.1f} bytes per node)")
+    print(f"Parse peak:     {peak_bytes / 1_000_000:.1f} MB")
+    print(f"Peak RSS:       {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adversarial_benchmark import nested_comparisons
+from compiler.lexer.lexer import Lexer
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+
+def arithmetic_operands(size: int) -> str:
+    operand = " ❤️ ".join(["** 🐖a🐖 💞 🐖b🐖 **"] * size)
+    return ("# 😀 🐷 🐖a🐖 @ 3 #\n# 😀 🐗 🐖b🐖 @ 4 #\n"
+            + f"# 😀 wow 🐖c🐖 @ {operand} < {operand} #\n# OINK {operand} 🌸> {operand} #\n# 🐖🐖🐖 #\n"
+            + "# 🐖a🐖 @ 🐖a🐖 ❤️ 1 #\n# 🐖🐖🐖 #\n# ... 🐖a🐖 ... #\n")
+
+
+SHAPES = {
+    "arithmetic operands": arithmetic_operands,
+    "nested comparisons": nested_comparisons,
+}
+
+
+def generate(source: str) -> tuple[int, float]:
+    ast = SyntaxParser(Lexer(source).tokenize()).parse_program()
+    SemanticAnalyzer().visit(ast)
+    code_generator = CodeGenerator()
+    start = time.perf_counter()
+    code_generator.visit(ast)
+    return code_generator.written_lines, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 4, 16, 64, 256, 1024],
+                        help="Operators in each comparison operand, smallest first")
+    parser.add_argument('--shapes', nargs='+', choices=list(SHAPES), default=list(SHAPES),
+                        help="Kinds of comparison operands to generate")
+    parser.add_argument('--max-growth', type=float, default=2.0,
+                        help="Largest allowed growth of the instructions per operator between the smallest and largest size")
+    args = parser.parse_args()
+
+    superlinear = []
+
+    print(f"{'shape':>20} {'size':>6} {'instructions':>13} {'per operator':>13} {'codegen':>9}")
+    for name in args.shapes:
+        per_operator = []
+        for size in args.sizes:
+            instructions, seconds = generate(SHAPES[name](size))
+            per_operator.append(instructions / size)
+            print(f"{name:>20} {size:>6} {instructions:>13} {instructions / size:>13.1f} {seconds:8.3f}s")
+
+        growth = per_operator[-1] / per_operator[0]
+        if growth > args.max_growth:
+            superlinear.append(f"{name} ({growth:.1f}x more instructions per operator)")
+
+    if superlinear:
+        print("Not linear: " + ", ".join(superlinear))
+        sys.exit(1)
+    print("Every comparison emits its operands once")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import argparse
+import glob
+import shutil
+import subprocess
+import sys
+import os
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from program_generator import generate_program
+from compiler.lexer.lexer import Lexer
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+
+# Returns the LLVM IR of the source with and without copy propagation, or None if it does not compile.
+def compile_both(source: str):
+    codes = []
+    for propagate_copies in (False, True):
+        try:
+            ast = SyntaxParser(Lexer(source).tokenize()).parse_program()
+            SemanticAnalyzer().visit(ast)
+            codes.append(CodeGenerator(propagate_copies=propagate_copies).visit(ast))
+        except ValueError:
+            return None
+    return codes
+
+
+def count_instructions(code: str) -> int:
+    main = code[code.index("define i32 @main()"):]
+    return sum(1 for line in main.splitlines() if line.startswith("  "))
+
+
+def llc_time(code: str) -> str:
+    with tempfile.NamedTemporaryFile('w', suffix='.ll') as file:
+        file.write(code)
+        file.flush()
+        start = time.perf_counter()
+        result = subprocess.run(['llc', file.name, '-o', os.devnull], capture_output=True)
+        # e.g. variable names that are not valid LLVM identifiers
+        return f"{time.perf_counter() - start:.2f}s" if result.returncode == 0 else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--test-cases', default=os.path.join(ROOT, "test_cases"),
+                        help="Directory with the programs to compile")
+    parser.add_argument('--lines', type=int, nargs='*', default=[10_000],
+                        help="Also compile generated programs with this many lines")
+    parser.add_argument('--llc', action='store_true',
+                        help="Also measure how long llc takes for the IR of every program")
+    parser.add_argument('--min-reduction', type=float, default=0.2,
+                        help="Smallest allowed share of instructions that copy propagation removes from the test cases")
+    args = parser.parse_args()
+
+    if args.llc and shutil.which('llc') is None:
+        print("llc was not found")
+        sys.exit(1)
+
+    programs = []
+    for path in sorted(glob.glob(os.path.join(args.test_cases, "*.txt"))):
+        with open(path) as file:
+            programs.append((os.path.basename(path), file.read()))
+    generated = [(f"generated {lines} lines", generate_program(lines)) for lines in args.lines]
+
+    print(f"{'program':>24} {'instructions':>13} {'propagated':>11} {'removed':>8} {'bytes removed':>14}"
+          + (f" {'llc':>8} {'propagated':>11}" if args.llc else ""))
+    totals = [0, 0]
+    for index, (name, source) in enumerate(programs + generated):
+        codes = compile_both(source)
+        if codes is None:
+            continue
+        copied, propagated = count_instructions(codes[0]), count_instructions(codes[1])
+        if index < len(programs):
+            totals[0] += copied
+            totals[1] += propagated
+        removed_bytes = 1 - len(codes[1].encode()) / len(codes[0].encode())
+        row = f"{name:>24} {copied:>13} {propagated:>11} {1 - propagated / copied:>8.0%} {removed_bytes:>14.0%}"
+        if args.llc:
+            row += f" {llc_time(codes[0]):>8} {llc_time(codes[1]):>11}"
+        print(row)
+
+    reduction = 1 - totals[1] / totals[0]
+    print(f"{'all test cases':>24} {totals[0]:>13} {totals[1]:>11} {reduction:>8.0%}")
+    if reduction < args.min_reduction:
+        print(f"Copy propagation only removes {reduction:.0%} of the instructions of the test cases")
+        sys.exit(1)
+    print(f"Copy propagation removes {reduction:.0%} of the instructions of the test cases")
+
+
+if __name__ == '__main__':
+    main()
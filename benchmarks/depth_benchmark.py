@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compiler.lexer.lexer import Lexer
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+
+def nested_blocks(depth: int) -> str:
+    return ("# 😀 🐷 🐖x🐖 @ 1 #\n"
+            + "# SAVE 🐖x🐖 > 0 #\n# 🐖🐖🐖 #\n" * depth
+            + "# 🐖x🐖 @ 2 #\n"
+            + "# 🐖🐖🐖 #\n" * depth
+            + "# ... 🐖x🐖 ... #\n")
+
+
+def nested_brackets(depth: int) -> str:
+    return ("# 😀 🐷 🐖x🐖 @ " + "1 ❤️ ** " * depth + "1" + " **" * depth + " #\n"
+            + "# ... 🐖x🐖 ... #\n")
+
+
+def operator_chain(depth: int) -> str:
+    return ("# 😀 🐷 🐖x🐖 @ 1" + " ❤️ 1" * depth + " #\n"
+            + "# ... 🐖x🐖 ... #\n")
+
+
+def negations(depth: int) -> str:
+    return ("# 😀 wow 🐖b🐖 @ " + "💩 " * depth + "LOVE #\n"
+            + "# ... 🐖b🐖 ... #\n")
+
+
+SHAPES = {
+    "nested blocks": nested_blocks,
+    "nested brackets": nested_brackets,
+    "operator chain": operator_chain,
+    "negations": negations,
+}
+
+
+def time_stages(source: str) -> list[float]:
+    timings = []
+    start = time.perf_counter()
+    ast = SyntaxParser(Lexer(source).tokenize()).parse_program()
+    timings.append(time.perf_counter() - start)
+
+    for visitor in (SemanticAnalyzer(), CodeGenerator()):
+        start = time.perf_counter()
+        visitor.visit(ast)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--depths', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help="Nesting depths to compile")
+    parser.add_argument('--shapes', nargs='+', choices=list(SHAPES), default=list(SHAPES),
+                        help="Kinds of nesting to generate")
+    args = parser.parse_args()
+
+    print(f"{'shape':>16} {'depth':>7} {'parse':>8} {'analyze':>8} {'codegen':>8}  us per level")
+    for name in args.shapes:
+        for depth in args.depths:
+            timings = time_stages(SHAPES[name](depth))
+            per_level = " / ".join(f"{stage / depth * 1_000_000:.1f}" for stage in timings)
+            print(f"{name:>16} {depth:>7} " + " ".join(f"{stage:7.3f}s" for stage in timings) + f"  {per_level}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import argparse
+import resource
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from program_generator import generate_program
+from compiler.lexer.lexer import Lexer
+from compiler.syntax_parser import SyntaxParser
+
+
+def peak_rss_megabytes() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lines', type=int, default=500_000, help="Lines in the generated program")
+    parser.add_argument('--stream', action='store_true', help="Parse while lexing instead of materializing all tokens")
+    parser.add_argument('--bytes', action='store_true', help="Lex the UTF-8 encoded source instead of a str")
+    args = parser.parse_args()
+
+    source = generate_program(args.lines)
+    if args.bytes:
+        source = source.encode('utf-8')
+    baseline_rss = peak_rss_megabytes()
+    print(f"Source: {args.lines} lines, {len(source.encode('utf-8') if isinstance(source, str) else source) / 1_000_000:.1f} MB")
+
+    start = time.perf_counter()
+    if args.stream:
+        SyntaxParser(Lexer(source).stream()).parse_program()
+        print(f"Lex and parse time: {time.perf_counter() - start:.2f}s")
+    else:
+        tokens = Lexer(source).tokenize()
+        lexed = time.perf_counter()
+        SyntaxParser(tokens).parse_program()
+        parsed = time.perf_counter()
+
+        print(f"{len(tokens)} tokens")
+        print(f"Lex time:   {lexed - start:.2f}s")
+        print(f"Parse time: {parsed - lexed:.2f}s")
+    print(f"Peak RSS:   {peak_rss_megabytes():.0f} MB ({peak_rss_megabytes() - baseline_rss:.0f} MB above the source)")
+
+
+if __name__ == '__main__':
+    main()
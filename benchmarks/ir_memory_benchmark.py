@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import argparse
+import gc
+import resource
+import subprocess
+import sys
+import os
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from program_generator import generate_program
+from compiler.lexer.lexer import Lexer
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+
+# Generates the code of one program in this process, so that its peak RSS only belongs to that size and mode.
+def measure(lines: int, in_memory: bool):
+    ast = SyntaxParser(Lexer(generate_program(lines)).tokenize()).parse_program()
+    SemanticAnalyzer().visit(ast)
+    gc.collect()
+
+    with open(os.devnull, 'w') as output:
+        code_generator = CodeGenerator(output=None if in_memory else output)
+        tracemalloc.start()
+        start = time.perf_counter()
+        code = code_generator.visit(ast)
+        if code is not None:
+            output.write(code)
+        elapsed = time.perf_counter() - start
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    print(code_generator.written_lines, peak_bytes, rss, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lines', type=int, nargs='+', default=[100_000, 400_000, 1_600_000],
+                        help="Lines in the generated programs, smallest first")
+    parser.add_argument('--in-memory', action='store_true',
+                        help="Also measure generating the whole IR as one string before writing it")
+    parser.add_argument('--max-growth', type=float, default=1.5,
+                        help="Largest allowed growth of the streaming peak between the smallest and largest program")
+    parser.add_argument('--measure', nargs=2, metavar=('LINES', 'MODE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(int(args.measure[0]), args.measure[1] == "in-memory")
+        return
+
+    modes = ["streaming", "in-memory"] if args.in_memory else ["streaming"]
+    peaks = []
+
+    print(f"{'mode':>10} {'lines':>9} {'instructions':>13} {'codegen peak':>13} {'peak RSS':>9} {'codegen':>9}")
+    for mode in modes:
+        for lines in args.lines:
+            result = subprocess.run([sys.executable, __file__, '--measure', str(lines), mode],
+                                    capture_output=True, text=True, check=True)
+            instructions, peak_bytes, rss, elapsed = result.stdout.split()
+            if mode == "streaming":
+                peaks.append(int(peak_bytes))
+            print(f"{mode:>10} {lines:>9} {instructions:>13} {int(peak_bytes) / 1_000_000:>10.1f} MB "
+                  f"{int(rss) / 1_000_000:>6.0f} MB {float(elapsed):>8.2f}s")
+
+    growth = peaks[-1] / peaks[0]
+    if growth > args.max_growth:
+        print(f"The streaming code generator needs {growth:.1f}x more memory for the largest program")
+        sys.exit(1)
+    print("The streaming code generator needs the same memory for every program size")
+
+
+if __name__ == '__main__':
+    main()
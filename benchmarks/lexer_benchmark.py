@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from program_generator import generate_program
+from compiler.lexer.lexer import Lexer
+from state_machine_lexer import StateMachineLexer
+
+
+def measure(lexer_class, source: str) -> tuple[float, list]:
+    start = time.perf_counter()
+    tokens = lexer_class(source).tokenize()
+    return time.perf_counter() - start, tokens
+
+
+def token_stream(tokens) -> list[tuple]:
+    return [(t.token_type, t.value, t.line, t.index) for t in tokens]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lines', type=int, default=200_000, help="Lines in the generated program")
+    args = parser.parse_args()
+
+    source = generate_program(args.lines)
+    megabytes = len(source.encode('utf-8')) / 1_000_000
+    print(f"Source: {args.lines} lines, {megabytes:.1f} MB")
+
+    reference_time, reference_tokens = measure(StateMachineLexer, source)
+    table_time, table_tokens = measure(Lexer, source)
+
+    if token_stream(reference_tokens) != token_stream(table_tokens):
+        print("Token streams differ!")
+        sys.exit(1)
+
+    print(f"{len(table_tokens)} tokens, identical streams")
+    print(f"StateMachineLexer: {reference_time:.2f}s ({megabytes / reference_time:.2f} MB/s)")
+    print(f"Lexer:             {table_time:.2f}s ({megabytes / table_time:.2f} MB/s)")
+    print(f"Speedup: {reference_time / table_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+import random
+
+INT_VARIABLES = ["alpha", "beta", "gamma", "delta"]
+BOOL_VARIABLES = ["flag", "done"]
+ARITHMETIC = ["❤️", "💔", "💞"]
+COMPARISONS = [">", "<", "🌸>", "🌸<", "🌸🌸", "💩🌸"]
+
+
+def variable(name: str) -> str:
+    return f"🐖{name}🐖"
+
+
+def arithmetic_expression(rng: random.Random, terms: int) -> str:
+    parts = [variable(rng.choice(INT_VARIABLES))]
+    for _ in range(terms - 1):
+        operand = str(rng.randint(1, 9)) if rng.random() < 0.5 else variable(rng.choice(INT_VARIABLES))
+        parts.append(f"{rng.choice(ARITHMETIC)} {operand}")
+    return " ".join(parts)
+
+
+def condition(rng: random.Random) -> str:
+    left = f"{variable(rng.choice(INT_VARIABLES))} {rng.choice(COMPARISONS)} {rng.randint(0, 100)}"
+    if rng.random() < 0.3:
+        return f"{left} hru {variable(rng.choice(BOOL_VARIABLES))}"
+    return left
+
+
+def statement_lines(rng: random.Random) -> list[str]:
+    roll = rng.random()
+    target = rng.choice(INT_VARIABLES)
+
+    if roll < 0.45:
+        return [f"# {variable(target)} @ {arithmetic_expression(rng, rng.randint(2, 5))} #"]
+    if roll < 0.55:
+        return [f"#~ {variable(target)} @ {arithmetic_expression(rng, rng.randint(2, 4))} ~#"]
+    if roll < 0.65:
+        return [f"# {variable(rng.choice(BOOL_VARIABLES))} @ {condition(rng)} #"]
+    if roll < 0.70:
+        return [f"👀 {target} is about to change", f"# {variable(target)} @ {rng.randint(0, 1000)} #"]
+    if roll < 0.85:
+        return [
+            f"# SAVE {condition(rng)} #", "# 🐖🐖🐖 #",
+            f"# {variable(target)} @ {arithmetic_expression(rng, 3)} #", "# 🐖🐖🐖 #",
+            f"# HURT {condition(rng)} #", "# 🐖🐖🐖 #",
+            f"# {variable(target)} @ {rng.randint(0, 1000)} #", "# 🐖🐖🐖 #",
+            "# KILL #", "# 🐖🐖🐖 #",
+            f"# {variable(target)} @ {arithmetic_expression(rng, 2)} #", "# 🐖🐖🐖 #",
+        ]
+    return [
+        f"# OINK {variable(target)} < {rng.randint(10, 100)} #", "# 🐖🐖🐖 #",
+        f"# {variable(target)} @ {variable(target)} ❤️ 1 #", "# 🐖🐖🐖 #",
+    ]
+
+
+def generate_program(line_count: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    lines = ["👀👀👀", "Generated PigLang benchmark program", "👀👀👀"]
+    lines += [f"# 😀 🐷 {variable(name)} @ {index} #" for index, name in enumerate(INT_VARIABLES)]
+    lines += [f"# 😀 wow {variable(name)} @ HATE #" for name in BOOL_VARIABLES]
+
+    while len(lines) < line_count:
+        lines.extend(statement_lines(rng))
+
+    lines.append(f"# ... {variable(INT_VARIABLES[0])} ... #")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ast_memory_benchmark import count_nodes
+from program_generator import generate_program
+from compiler.lexer.lexer import Lexer
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.fused_code_generator import FusedCodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+
+def best_time(run, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lines', type=int, default=100_000, help="Lines in the generated program")
+    parser.add_argument('--repeat', type=int, default=3, help="Report the best of this many runs")
+    args = parser.parse_args()
+
+    ast = SyntaxParser(Lexer(generate_program(args.lines)).tokenize()).parse_program()
+    visits, _ = count_nodes(ast)
+    print(f"AST nodes: {visits}")
+
+    analysis = best_time(lambda: SemanticAnalyzer().visit(ast), args.repeat)
+    print(f"Semantic analysis: {analysis:.2f}s ({visits / analysis / 1_000_000:.2f}M visits/s)")
+    generation = best_time(lambda: CodeGenerator().visit(ast), args.repeat)
+    print(f"Code generation:   {generation:.2f}s ({visits / generation / 1_000_000:.2f}M visits/s)")
+    fused = best_time(lambda: FusedCodeGenerator().generate(ast), args.repeat)
+    print(f"Fused pass:        {fused:.2f}s ({(analysis + generation) / fused:.2f}x as fast as both passes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from typing import Optional, Union
+
+from .constants import COMPILER_VERSION
+from .limits import CompilerLimits
+from .node.ast_arena import ASTArena
+from .node.program_node import ProgramNode
+from .visitor.arena_writer import ArenaWriter
+
+DEFAULT_CACHE_SIZE = 256 << 20
+ENTRY_SUFFIX = ".ast"
+TEMP_SUFFIX = ".ast.tmp"
+
+
+class ASTCache:
+    def __init__(self, directory: str, max_size: int = DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(source: Union[str, bytes, mmap.mmap], limits: CompilerLimits, shared_expressions: bool = False) -> str:
+        options = f"{COMPILER_VERSION}\0{sorted(vars(limits).items())}\0{shared_expressions}\0"
+        digest = hashlib.sha256(options.encode("utf-8"))
+        digest.update(source.encode("utf-8") if isinstance(source, str) else source)
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Optional[ProgramNode]:
+        path = self.__path(key)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+            # the modification time is the recency that eviction goes by
+            os.utime(path)
+        except OSError:
+            return None
+
+        try:
+            return ASTArena.from_bytes(data).to_nodes()
+        except (ValueError, IndexError, struct.error):
+            self.__remove(path)
+            return None
+
+    def store(self, key: str, ast: ProgramNode):
+        data = ArenaWriter().write(ast).to_bytes()
+        # other compiler processes only ever see complete entries because the rename is atomic
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=TEMP_SUFFIX)
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, self.__path(key))
+        except OSError:
+            self.__remove(temp_path)
+            return
+        self.__evict()
+
+    def __evict(self):
+        entries = []
+        total_size = 0
+        try:
+            with os.scandir(self.directory) as directory:
+                for entry in directory:
+                    if not entry.name.endswith((ENTRY_SUFFIX, TEMP_SUFFIX)):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total_size += stat.st_size
+        except OSError:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            self.__remove(path)
+            total_size -= size
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    @staticmethod
+    def __remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
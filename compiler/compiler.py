@@ -1,29 +1,78 @@
 #!/usr/bin/env python3
+import json
+import mmap
 import os.path
 import sys
+from typing import TextIO, Union
 from .lexer.lexer import Lexer
+from .lexer.parallel_lexer import ParallelLexer
 import argparse
+from .ast_cache import ASTCache
+from .node.hash_cons_builder import HashConsBuilder
+from .node.node_builder import NodeBuilder
+from .diagnostic import Diagnostic
+from .output_file import OutputFile, STDOUT
+from .limits import NO_LIMITS, UNTRUSTED_LIMITS
 from .visitor.code_generator import CodeGenerator
+from .visitor.fused_code_generator import FusedCodeGenerator
 from .visitor.semantic_analyzer import SemanticAnalyzer
 from .syntax_parser import SyntaxParser
+from .parallel_syntax_parser import ParallelSyntaxParser
+from .token.line_index import LineIndex
+from .token.token_buffer import TokenBuffer
+from .token.token_stream import TokenStream
 
 
 class Compiler:
     def __init__(self):
-        self.input_file, self.output_file = self.__parse_arguments()
+        self.options = self.__parse_arguments()
+        self.input_file, self.output_file = self.options.input_file, self.options.output_file
+        self.limits = UNTRUSTED_LIMITS if self.options.untrusted else NO_LIMITS
+        self.cache = ASTCache(self.options.cache_dir, self.options.cache_size << 20) if self.options.cache_dir else None
+        self.diagnostics: list[Diagnostic] = []
+        # the messages must not end up in the IR when it goes to stdout
+        self.messages = sys.stderr if self.output_file == STDOUT else sys.stdout
 
     @staticmethod
-    def __parse_arguments() -> tuple[str, str]:
+    def __parse_arguments() -> argparse.Namespace:
         parser = argparse.ArgumentParser()
         parser.add_argument('input_file', help="Input file that contains source code")
-        parser.add_argument('output_file', help="Output LLVM IR file")
+        parser.add_argument('output_file', help="Output LLVM IR file, or - to write the IR to stdout")
+        lexing_mode = parser.add_mutually_exclusive_group()
+        lexing_mode.add_argument('--stream', action='store_true',
+                                 help="Parse while lexing instead of collecting all tokens first")
+        lexing_mode.add_argument('--jobs', type=int, default=1,
+                                 help="Lex and parse large sources in this many worker processes")
+        parser.add_argument('--mmap', action='store_true',
+                            help="Lex the memory-mapped UTF-8 bytes instead of decoding the whole file")
+        parser.add_argument('--all-errors', action='store_true',
+                            help="Recover at the next line border and report every error in one run")
+        parser.add_argument('--json', action='store_true',
+                            help="Print the diagnostics as JSON (implies --all-errors)")
+        parser.add_argument('--untrusted', action='store_true',
+                            help="Reject sources that exceed the size, nesting and output limits for untrusted code")
+        parser.add_argument('--cache-dir',
+                            help="Keep analyzed ASTs in this directory and skip the frontend for unchanged sources")
+        parser.add_argument('--cache-size', type=int, default=256,
+                            help="Evict the least recently used cached ASTs beyond this many megabytes")
+        parser.add_argument('--share-expressions', action='store_true',
+                            help="Analyze and emit repeated subexpressions of straight-line code only once")
+        parser.add_argument('--fused', action='store_true',
+                            help="Type-check and emit LLVM IR in a single walk over the AST "
+                                 "(--all-errors keeps its separate checking pass)")
+        parser.add_argument('--stack-variables', action='store_true',
+                            help="Keep variables in allocas and leave their phi nodes to LLVM's mem2reg pass")
+        parser.add_argument('--propagate-copies', action='store_true',
+                            help="Bind variables to the values assigned to them instead of copying those into "
+                                 "registers named after the variables")
         args = parser.parse_args()
 
         if not os.path.exists(args.input_file):
             print(f"File '{args.input_file}' was not found!")
             sys.exit(1)
 
-        return args.input_file, args.output_file
+        args.all_errors = args.all_errors or args.json
+        return args
 
     @staticmethod
     def __read_source_file(file_name: str) -> str:
@@ -31,52 +80,127 @@ class Compiler:
             return file.read()
 
     @staticmethod
-    def __write_output_file(file_name: str, content: str):
-        with open(file_name, 'w') as file:
-            file.write(content)
-
-    @staticmethod
-    def __get_tokens(source_code: str) -> list:
-        lexer = Lexer(source_code)
-        return lexer.tokenize()
-
-    @staticmethod
-    def __get_ast(tokens: list):
-        parser = SyntaxParser(tokens)
+    def __map_source_file(file_name: str) -> Union[bytes, mmap.mmap]:
+        with open(file_name, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __get_tokens(self, source_code: Union[str, bytes, mmap.mmap]) -> Union[TokenBuffer, TokenStream]:
+        if self.options.jobs > 1:
+            return ParallelLexer(source_code, self.options.jobs, limits=self.limits).tokenize()
+        lexer = Lexer(source_code, limits=self.limits)
+        return lexer.stream() if self.options.stream else lexer.tokenize()
+
+    def __builder_type(self) -> type:
+        return HashConsBuilder if self.options.share_expressions else NodeBuilder
+
+    def __get_ast(self, tokens: Union[TokenBuffer, TokenStream]):
+        if self.options.jobs > 1:
+            return ParallelSyntaxParser(tokens, self.options.jobs, limits=self.limits,
+                                        builder_type=self.__builder_type()).parse_program()
+        parser = SyntaxParser(tokens, limits=self.limits, builder=self.__builder_type()())
         return parser.parse_program()
 
-    @staticmethod
-    def __analyze_semantics(ast):
-        semantic_analyzer = SemanticAnalyzer()
-        ast.accept(semantic_analyzer)
-
-    @staticmethod
-    def __generate_code(ast) -> str:
-        code_generator = CodeGenerator()
-        return ast.accept(code_generator)
-
-    def __compile(self) -> str:
-        source_code = self.__read_source_file(self.input_file)
-        tokens = self.__get_tokens(source_code)
-        ast = self.__get_ast(tokens)
-        self.__analyze_semantics(ast)
-        llvm_ir = self.__generate_code(ast)
-        return llvm_ir
+    def __analyze_semantics(self, ast):
+        semantic_analyzer = SemanticAnalyzer(limits=self.limits, shared_expressions=self.options.share_expressions)
+        semantic_analyzer.visit(ast)
+
+    def __generate_code(self, ast, output: TextIO):
+        code_generator = CodeGenerator(self.limits, shared_expressions=self.options.share_expressions,
+                                       stack_variables=self.options.stack_variables, output=output,
+                                       propagate_copies=self.options.propagate_copies)
+        code_generator.visit(ast)
+
+    def __analyze_and_generate_code(self, ast, output: TextIO):
+        code_generator = FusedCodeGenerator(self.limits, shared_expressions=self.options.share_expressions,
+                                            stack_variables=self.options.stack_variables, output=output,
+                                            propagate_copies=self.options.propagate_copies)
+        code_generator.generate(ast)
+
+    def __check_all(self, source_code: Union[str, bytes, mmap.mmap]):
+        lexer = Lexer(source_code, recover=True, limits=self.limits)
+        tokens = lexer.stream() if self.options.stream else lexer.tokenize()
+        parser = SyntaxParser(tokens, recover=True, limits=self.limits, builder=self.__builder_type()())
+        ast = parser.parse_program()
+        semantic_analyzer = SemanticAnalyzer(recover=True, limits=self.limits,
+                                             shared_expressions=self.options.share_expressions)
+        semantic_analyzer.visit(ast)
+        self.diagnostics = lexer.diagnostics + parser.diagnostics + semantic_analyzer.diagnostics
+        return ast
+
+    def __compile(self, output: TextIO):
+        if not self.options.mmap:
+            self.__compile_source(self.__read_source_file(self.input_file), output)
+            return
+        source_code = self.__map_source_file(self.input_file)
+        try:
+            self.__compile_source(source_code, output)
+        finally:
+            # the lexer workers, the cache key and the diagnostics read the mapping until the compilation ends
+            if isinstance(source_code, mmap.mmap):
+                source_code.close()
+
+    def __compile_source(self, source_code: Union[str, bytes, mmap.mmap], output: TextIO):
+        if self.cache:
+            cache_key = ASTCache.key(source_code, self.limits, self.options.share_expressions)
+            ast = self.cache.load(cache_key)
+            if ast is not None:
+                ast.lines = LineIndex(source_code)
+                self.__generate_code(ast, output)
+                return
+        if self.options.all_errors:
+            ast = self.__check_all(source_code)
+            if self.diagnostics:
+                return
+        else:
+            tokens = self.__get_tokens(source_code)
+            ast = self.__get_ast(tokens)
+            if self.options.fused:
+                self.__analyze_and_generate_code(ast, output)
+                if self.cache:
+                    self.cache.store(cache_key, ast)
+                return
+            self.__analyze_semantics(ast)
+        if self.cache:
+            self.cache.store(cache_key, ast)
+        self.__generate_code(ast, output)
+
+    def __print_diagnostics(self):
+        if self.options.json:
+            print(json.dumps({"file": self.input_file,
+                              "diagnostics": [diagnostic.to_dict() for diagnostic in self.diagnostics]}),
+                  file=self.messages)
+        elif self.diagnostics:
+            print(f"OHHHH NOOOO, compilation failed with {len(self.diagnostics)} error(s):", file=self.messages)
+            for diagnostic in self.diagnostics:
+                print(f"  [{diagnostic.stage}] {diagnostic.message}", file=self.messages)
 
     def run_program(self):
         try:
-            translated_code = self.__compile()
-            self.__write_output_file(self.output_file, translated_code)
-            print(f"Successfully compiled '{self.input_file}' to '{self.output_file}'")
+            with OutputFile(self.output_file) as output:
+                self.__compile(output.stream)
+                if self.options.all_errors:
+                    self.__print_diagnostics()
+                    if self.diagnostics:
+                        sys.exit(1)
+                output.commit()
+            if not self.options.json:
+                print(f"Successfully compiled '{self.input_file}' to '{self.output_file}'", file=self.messages)
             sys.exit(0)
 
         except ValueError as e:
-            print(f"OHHHH NOOOO, compilation failed: {e}")
+            if self.options.all_errors:
+                self.diagnostics.append(Diagnostic("compiler", str(e)))
+                self.__print_diagnostics()
+            else:
+                print(f"OHHHH NOOOO, compilation failed: {e}", file=self.messages)
             sys.exit(1)
         except Exception as e:
-            print(f"Unexpected error :((((: {e}")
+            print(f"Unexpected error :((((: {e}", file=self.messages)
             sys.exit(1)
 
 
-compiler = Compiler()
-compiler.run_program()
\ No newline at end of file
+if __name__ == '__main__':
+    compiler = Compiler()
+    compiler.run_program()
\ No newline at end of file
@@ -4,4 +4,7 @@ I32_MIN = -2147483648
 I32_MAX = 2147483647
 FALSE = "HATE"
 TRUE = "LOVE"
-NOT = "💩"
\ No newline at end of file
+NOT = "💩"
+
+# bump whenever the AST, its annotations or their serialized form change, so cached ASTs are rebuilt
+COMPILER_VERSION = "1.5"
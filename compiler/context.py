@@ -6,40 +6,49 @@ from .variable_info import VariableInfo
 
 class Context:
     def __init__(self):
-        self.scopes: list[dict[str, VariableInfo]] = [{}]
+        # PigLang forbids shadowing, so every visible variable fits in one flat map
+        self.variables: dict[str, VariableInfo] = {}
+        # the names declared in each open scope, which are forgotten again when it exits
+        self.scopes: list[list[str]] = [[]]
+        # the index in scopes of the scope that declared each visible variable
+        self.depths: dict[str, int] = {}
+        # every variable name gets one slot, shared by all of its declarations in sibling scopes
+        self.slots: dict[str, int] = {}
         self.currently_initializing: Optional[str] = None
 
     def enter_scope(self) -> int:
-        self.scopes.append({})
+        self.scopes.append([])
 
     def exit_scope(self):
         if len(self.scopes) > 1:
-            self.scopes.pop()
+            variables, depths = self.variables, self.depths
+            for name in self.scopes.pop():
+                del variables[name]
+                del depths[name]
 
     def declare_variable(self, name: str, data_type: DataType, mutable: bool):
-        if self.is_variable_declared(name):
+        if name in self.variables:
             return False
-        
-        current_scope = self.scopes[-1]
-        current_scope[name] = VariableInfo(data_type, mutable)
+
+        slot = self.slots.setdefault(name, len(self.slots))
+        self.variables[name] = VariableInfo(data_type, mutable, slot)
+        self.depths[name] = len(self.scopes) - 1
+        self.scopes[-1].append(name)
         return True
 
     def lookup_variable(self, name: str) -> Optional[VariableInfo]:
-        for scope in reversed(self.scopes):
-            if name in scope:
-                return scope[name]
-        return None
+        return self.variables.get(name)
 
     def is_declared_in_current_scope(self, name: str) -> bool:
-        return name in self.scopes[-1]
+        return self.depths.get(name) == len(self.scopes) - 1
 
     def get_variable_type(self, name: str) -> Optional[DataType]:
-        var_info = self.lookup_variable(name)
+        var_info = self.variables.get(name)
         return var_info.data_type if var_info else None
 
     def is_variable_mutable(self, name: str) -> bool:
-        var_info = self.lookup_variable(name)
+        var_info = self.variables.get(name)
         return var_info.mutable if var_info else False
 
     def is_variable_declared(self, name: str) -> bool:
-        return self.lookup_variable(name) is not None
\ No newline at end of file
+        return name in self.variables
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+from typing import Optional
+
+
+class Diagnostic:
+    def __init__(self, stage: str, message: str, line: Optional[int] = None):
+        self.stage = stage
+        self.message = message
+        self.line = line
+
+    def to_dict(self) -> dict:
+        return {"stage": self.stage, "line": self.line, "message": self.message}
+
+    def __str__(self) -> str:
+        return self.message
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+from typing import Optional
+from .instruction import Instruction, Phi, Value
+
+
+class BasicBlock:
+    __slots__ = ('label', 'predecessors', 'sealed', 'definitions', 'incomplete_phis', 'dominator', 'first_write',
+                 'phis', 'instructions', 'continued')
+
+    def __init__(self, label: str):
+        self.label = label
+        # the blocks that jump here, known once the code generator reaches the block
+        self.predecessors: list['BasicBlock'] = []
+        # a block is sealed once all of its predecessors are known, which for a loop header is after its body
+        self.sealed = True
+        # the current value of every variable slot that was written or looked up in this block
+        self.definitions: dict[int, Value] = {}
+        # the phis that wait for the predecessors of an unsealed block
+        self.incomplete_phis: Optional[dict[int, Phi]] = None
+        # where an if or loop that merges into this block started, and how many writes came before it:
+        # a variable that was not written since then has the value it had in the dominator
+        self.dominator: Optional['BasicBlock'] = None
+        self.first_write = 0
+        # every phi that was placed here, the ones that turned out trivial are not printed
+        self.phis: list[Phi] = []
+        self.instructions: list[Instruction] = []
+        # the label and the first instructions were already written out with an earlier chunk
+        self.continued = False
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+from ..llvm_specifics.data_type import DataType
+from .basic_block import BasicBlock
+from .instruction import Alloca
+
+
+class Function:
+    __slots__ = ('name', 'return_type', 'allocas', 'blocks')
+
+    def __init__(self, name: str, return_type: DataType):
+        self.name = name
+        self.return_type = return_type
+        # the stack slots of the variables, which lead the entry block
+        self.allocas: list[Alloca] = []
+        # in the order of the code, without the ones that were already written out
+        self.blocks: list[BasicBlock] = []
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+from typing import Optional, Union
+from ..llvm_specifics.data_type import DataType
+from .opcode import Opcode
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .basic_block import BasicBlock
+
+# the value of a variable on a path that never assigned it, e.g. in a block that nothing jumps to
+UNDEF = "undef"
+
+
+class Instruction:
+    # the register of the result, None for the instructions without one
+    __slots__ = ('name',)
+    # one of Opcode, set by every concrete instruction class
+    opcode: int
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+
+
+# An operand is the instruction that computes it, or a string for constants, undef and the registers
+# of the instructions that were already written out.
+Value = Union[str, Instruction]
+
+
+class BinaryInstruction(Instruction):
+    __slots__ = ('operation', 'data_type', 'left', 'right')
+    opcode = Opcode.BINARY
+
+    def __init__(self, name: str, operation: str, data_type: DataType, left: Value, right: Value):
+        self.name = name
+        # the LLVM operation, e.g. "add" or "icmp slt", and the type of its operands
+        self.operation = operation
+        self.data_type = data_type
+        self.left = left
+        self.right = right
+
+
+class CastInstruction(Instruction):
+    __slots__ = ('operation', 'value', 'from_type', 'to_type')
+    opcode = Opcode.CAST
+
+    def __init__(self, name: str, operation: str, value: Value, from_type: DataType, to_type: DataType):
+        self.name = name
+        self.operation = operation
+        self.value = value
+        self.from_type = from_type
+        self.to_type = to_type
+
+
+class Alloca(Instruction):
+    __slots__ = ('data_type',)
+    opcode = Opcode.ALLOCA
+
+    def __init__(self, name: str, data_type: DataType):
+        self.name = name
+        self.data_type = data_type
+
+
+class Load(Instruction):
+    __slots__ = ('data_type', 'pointer')
+    opcode = Opcode.LOAD
+
+    def __init__(self, name: str, data_type: DataType, pointer: Alloca):
+        self.name = name
+        self.data_type = data_type
+        self.pointer = pointer
+
+
+class Store(Instruction):
+    __slots__ = ('data_type', 'value', 'pointer')
+    opcode = Opcode.STORE
+
+    def __init__(self, data_type: DataType, value: Value, pointer: Alloca):
+        self.name = None
+        self.data_type = data_type
+        self.value = value
+        self.pointer = pointer
+
+
+class PrintResult(Instruction):
+    __slots__ = ('value',)
+    opcode = Opcode.PRINT_RESULT
+
+    def __init__(self, value: Value):
+        self.name = None
+        self.value = value
+
+
+class Return(Instruction):
+    __slots__ = ('data_type', 'value')
+    opcode = Opcode.RETURN
+
+    def __init__(self, data_type: DataType, value: Value):
+        self.name = None
+        self.data_type = data_type
+        self.value = value
+
+
+class Branch(Instruction):
+    __slots__ = ('target',)
+    opcode = Opcode.BRANCH
+
+    def __init__(self, target: 'BasicBlock'):
+        self.name = None
+        self.target = target
+
+
+class ConditionalBranch(Instruction):
+    __slots__ = ('condition', 'if_true', 'if_false')
+    opcode = Opcode.CONDITIONAL_BRANCH
+
+    def __init__(self, condition: Value, if_true: 'BasicBlock', if_false: 'BasicBlock'):
+        self.name = None
+        self.condition = condition
+        self.if_true = if_true
+        self.if_false = if_false
+
+
+class Phi(Instruction):
+    __slots__ = ('slot', 'data_type', 'block', 'operands', 'users', 'replacement')
+    opcode = Opcode.PHI
+
+    def __init__(self, slot: int, data_type: DataType, block: 'BasicBlock'):
+        # the register is only picked once the phi turned out to be needed
+        self.name: Optional[str] = None
+        self.slot = slot
+        self.data_type = data_type
+        self.block = block
+        # one value per predecessor of the block, in the same order
+        self.operands: list = []
+        # the phis that have this phi as an operand
+        self.users: list['Phi'] = []
+        # the value that replaced this phi once it turned out trivial
+        self.replacement: Optional[Value] = None
+
+
+def resolve(value: Optional[Value]) -> Optional[Value]:
+    while type(value) is Phi and value.replacement is not None:
+        value = value.replacement
+    return value
+
+
+def value_name(value: Value) -> str:
+    if type(value) is Phi:
+        value = resolve(value)
+    return value if type(value) is str else value.name
+
+
+# Returns the only value besides the phi itself that flows into it, or None if there are several.
+# An undef comes from a block that nothing jumps to, so it may as well be that value.
+def trivial_value(phi: Phi) -> Optional[Value]:
+    same = None
+    for operand in phi.operands:
+        operand = resolve(operand)
+        if operand is phi or operand == same or operand == UNDEF:
+            continue
+        if same is not None:
+            return None
+        same = operand
+    return UNDEF if same is None else same
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+from typing import TextIO
+from .function import Function
+from .instruction import (Alloca, BinaryInstruction, Branch, CastInstruction, ConditionalBranch, Instruction, Load,
+                          Phi, PrintResult, Return, Store, value_name)
+from .opcode import Opcode
+
+PRINT_RESULT_FUNCTION = """declare i32 @printf(i8*, ...)
+
+@exit_format = private unnamed_addr constant [29 x i8] c"Program exit with result %d\\0A\\00", align 1
+
+define void @printResult(i32 %val) {
+  %fmt_ptr = getelementptr inbounds [29 x i8], [29 x i8]* @exit_format, i32 0, i32 0
+  call i32 (i8*, ...) @printf(i8* %fmt_ptr, i32 %val)
+  ret void
+}
+"""
+
+FORMAT_METHODS = {
+    Opcode.BINARY: "format_binary",
+    Opcode.CAST: "format_cast",
+    Opcode.ALLOCA: "format_alloca",
+    Opcode.LOAD: "format_load",
+    Opcode.STORE: "format_store",
+    Opcode.PRINT_RESULT: "format_print_result",
+    Opcode.RETURN: "format_return",
+    Opcode.BRANCH: "format_branch",
+    Opcode.CONDITIONAL_BRANCH: "format_conditional_branch",
+    Opcode.PHI: "format_phi",
+}
+
+
+# Turns the IR into LLVM assembly. The code generator hands over the blocks in chunks, so the blocks of a
+# function can be written out while the later ones are still being built.
+class IRPrinter:
+
+    def __init__(self, output: TextIO):
+        self.output = output
+        # the format method of every opcode, so formatting an instruction is one list lookup
+        self.formatters = [getattr(self, FORMAT_METHODS[opcode]) for opcode in range(len(FORMAT_METHODS))]
+
+    def write_prelude(self):
+        self.output.write(PRINT_RESULT_FUNCTION)
+
+    def begin_function(self, function: Function):
+        self.output.write(f"\ndefine {function.return_type.to_llvm()} @{function.name}() {{\n")
+
+    def write_blocks(self, function: Function):
+        formatters = self.formatters
+        lines = []
+        for block in function.blocks:
+            if not block.continued:
+                lines.append(f"{block.label}:")
+                if block is function.blocks[0]:
+                    lines += [self.format_alloca(alloca) for alloca in function.allocas]
+                lines += [self.format_phi(phi) for phi in block.phis if phi.replacement is None]
+            lines += [formatters[instruction.opcode](instruction) for instruction in block.instructions]
+        if lines:
+            self.output.write("\n".join(lines) + "\n")
+
+    def end_function(self):
+        self.output.write("}")
+
+    def format(self, instruction: Instruction) -> str:
+        return self.formatters[instruction.opcode](instruction)
+
+    @staticmethod
+    def format_binary(instruction: BinaryInstruction) -> str:
+        return (f"  {instruction.name} = {instruction.operation} {instruction.data_type.llvm_representation} "
+                f"{value_name(instruction.left)}, {value_name(instruction.right)}")
+
+    @staticmethod
+    def format_cast(instruction: CastInstruction) -> str:
+        return (f"  {instruction.name} = {instruction.operation} {instruction.from_type.llvm_representation} "
+                f"{value_name(instruction.value)} to {instruction.to_type.llvm_representation}")
+
+    @staticmethod
+    def format_alloca(instruction: Alloca) -> str:
+        return f"  {instruction.name} = alloca {instruction.data_type.llvm_representation}"
+
+    @staticmethod
+    def format_load(instruction: Load) -> str:
+        llvm_type = instruction.data_type.llvm_representation
+        return f"  {instruction.name} = load {llvm_type}, {llvm_type}* {instruction.pointer.name}"
+
+    @staticmethod
+    def format_store(instruction: Store) -> str:
+        llvm_type = instruction.data_type.llvm_representation
+        return f"  store {llvm_type} {value_name(instruction.value)}, {llvm_type}* {instruction.pointer.name}"
+
+    @staticmethod
+    def format_print_result(instruction: PrintResult) -> str:
+        return f"  call void @printResult(i32 {value_name(instruction.value)})"
+
+    @staticmethod
+    def format_return(instruction: Return) -> str:
+        return f"  ret {instruction.data_type.llvm_representation} {value_name(instruction.value)}"
+
+    @staticmethod
+    def format_branch(instruction: Branch) -> str:
+        return f"  br label %{instruction.target.label}"
+
+    @staticmethod
+    def format_conditional_branch(instruction: ConditionalBranch) -> str:
+        return (f"  br i1 {value_name(instruction.condition)}, "
+                f"label %{instruction.if_true.label}, label %{instruction.if_false.label}")
+
+    @staticmethod
+    def format_phi(phi: Phi) -> str:
+        incoming = ", ".join(f"[ {value_name(value)}, %{predecessor.label} ]"
+                             for value, predecessor in zip(phi.operands, phi.block.predecessors))
+        return f"  {phi.name} = phi {phi.data_type.llvm_representation} {incoming}"
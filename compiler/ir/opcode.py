@@ -0,0 +1,5 @@
+#!/usr/bin/env python3
+
+
+class Opcode:
+    BINARY, CAST, ALLOCA, LOAD, STORE, PRINT_RESULT, RETURN, BRANCH, CONDITIONAL_BRANCH, PHI = range(10)
@@ -1,202 +1,226 @@
 #!/usr/bin/env python3
-from .lexer_state import LexerState
-from ..token.token_class import Token
+import re
+from mmap import mmap
+from typing import Callable, Iterator, Union
+from ..diagnostic import Diagnostic
+from ..limits import CompilerLimits, NO_LIMITS
+from ..token.line_index import LineIndex
+from ..token.token_buffer import TokenBuffer
+from ..token.token_stream import TokenStream
 from .lexer_constants import *
 
+FIXED_TOKENS = {**MULTI_CHAR_TOKENS, **SPECIAL_CHARS, **EMOJI_TOKENS}
+del FIXED_TOKENS[COMMENT], FIXED_TOKENS[MULTILINE_COMMENT]
+FIXED_TOKEN_CODES = {sequence: token_type.value for sequence, token_type in FIXED_TOKENS.items()}
+KEYWORD_CODES = {keyword: token_type.value for keyword, token_type in KEYWORDS.items()}
+UTF8_FIXED_TOKEN_CODES = {sequence.encode(): code for sequence, code in FIXED_TOKEN_CODES.items()}
+UTF8_KEYWORD_CODES = {keyword.encode(): code for keyword, code in KEYWORD_CODES.items()}
+
+FIXED, WORD, NUMBER, LINE_BREAK, MULTILINE, SINGLE_LINE = range(1, 7)
+
+FIXED_REGEX = '|'.join(re.escape(sequence) for sequence in sorted(FIXED_TOKENS, key=len, reverse=True))
+TOKEN_REGEX = f"[{re.escape(WHITESPACE)}]*(?:" + '|'.join([
+    f"({FIXED_REGEX})",
+    f"([A-Za-z][A-Za-z{re.escape(VARIABLE_ALLOWED_SIGHN)}]*)",
+    "(-?[0-9]+)",
+    f"({re.escape(NEWLINE)})",
+    f"({MULTILINE_COMMENT}.*?(?:{MULTILINE_COMMENT}|\\Z))",
+    f"({COMMENT}[^{re.escape(NEWLINE)}]*)",
+]) + ")"
+WHITESPACE_REGEX = f"[{re.escape(WHITESPACE)}]*"
+
+TOKEN_PATTERN = re.compile(TOKEN_REGEX, re.DOTALL)
+WHITESPACE_PATTERN = re.compile(WHITESPACE_REGEX)
+UTF8_TOKEN_PATTERN = re.compile(TOKEN_REGEX.encode(), re.DOTALL)
+UTF8_FIXED_PATTERN = re.compile(FIXED_REGEX.encode())
+UTF8_WHITESPACE_PATTERN = re.compile(WHITESPACE_REGEX.encode())
+
 
 class Lexer:
-    def __init__(self, source: str):
+    def __init__(self, source: Union[str, bytes, mmap], first_line: int = 1, recover: bool = False,
+                 limits: CompilerLimits = NO_LIMITS):
         self.source = source
-        self.current_position = 0
-        self.line = 1
-        self.index = 1
-        self.tokens = []
-        self.state = LexerState.INITIAL
+        self.recover = recover
+        self.limits = limits
+        self.diagnostics: list[Diagnostic] = []
+        self.line_index = LineIndex(source, first_line)
+        self.tokens = TokenBuffer(source, self.line_index)
         self.line_has_content = False
-        self.current_token_start = 0
-        self.current_token_start_line = 1
-        self.current_token_start_index = 1
-
-    @staticmethod
-    def __is_whitespace(char: str):
-        return char is not None and char in WHITESPACE
-
-    def __add_token(self, token_type: TokenType, value: str, line: int = None, index: int = None):
-        line = line if line is not None else self.line
-        index = index if index is not None else self.index
-        self.tokens.append(Token(token_type, value, line, index))
-
-    def __peek_ahead(self, length: int) -> str:
-        end_pos = self.current_position + length
-        if end_pos <= len(self.source):
-            return self.source[self.current_position:end_pos]
-        return ""
-
-    def __start_new_token(self, new_state: LexerState):
-        self.state = new_state
-        self.current_token_start = self.current_position
-        self.current_token_start_line = self.line
-        self.current_token_start_index = self.index
-        self.__move_to_next_char()
-
-    def __move_to_next_char(self, count: int = 1):
-        i = 0
-        while i < count and self.current_position < len(self.source):
-            if self.source[self.current_position] == NEWLINE:
-                self.line += 1
-                self.index = 1
-            else:
-                self.index += 1
-            self.current_position += 1
-            i += 1
-
-    def tokenize(self) -> list[Token]:
-        while self.current_position < len(self.source):
-            char = self.source[self.current_position]
-            
-            match self.state:
-                case LexerState.INITIAL:
-                    self.__manage_initial_state(char)
-                case LexerState.VARIABLE:
-                    self.__manage_identifier_state(char)
-                case LexerState.NUMBER:
-                    self.__manage_number_state(char)
-                case LexerState.COMMENT:
-                    self.__manage_comment_state(char)
-                case LexerState.MULTILINE_COMMENT:
-                    self.__manage_multiline_comment_state()
-                    
-        self.__build_current_token()
-        self.tokens.append(Token(TokenType.THE_END, "", self.line, self.index))
-        return self.tokens
-
-    def __manage_initial_state(self, char):
-        if char == NEWLINE:
-            if self.line_has_content:
-                self.__add_token(TokenType.NEWLINE, NEWLINE)
-            self.line_has_content = False
-            self.__move_to_next_char()
-            return
-
-        if self.__is_whitespace(char):
-            self.__move_to_next_char()
-            return
+        self.is_utf8 = not isinstance(source, str)
+        if self.is_utf8:
+            self.token_pattern, self.whitespace_pattern = UTF8_TOKEN_PATTERN, UTF8_WHITESPACE_PATTERN
+            self.fixed_codes, self.keyword_codes, self.last_ascii = UTF8_FIXED_TOKEN_CODES, UTF8_KEYWORD_CODES, 0x7f
+        else:
+            self.token_pattern, self.whitespace_pattern = TOKEN_PATTERN, WHITESPACE_PATTERN
+            self.fixed_codes, self.keyword_codes, self.last_ascii = FIXED_TOKEN_CODES, KEYWORD_CODES, '\x7f'
 
-        if self.__peek_ahead(len(MULTILINE_COMMENT)) == MULTILINE_COMMENT:
-            self.state = LexerState.MULTILINE_COMMENT
-            self.__move_to_next_char(len(MULTILINE_COMMENT))
-            return
+    def __add_token(self, token_type: TokenType, start: int, end: int):
+        self.tokens.append(token_type, start, end)
+        self.line_has_content = True
 
-        if self.__peek_ahead(len(COMMENT)) == COMMENT:
-            self.state = LexerState.COMMENT
-            self.__move_to_next_char(len(COMMENT))
-            return
+    def tokenize(self) -> TokenBuffer:
+        for _ in self.__scan_lines():
+            pass
+        return self.tokens
 
-        self.line_has_content = True
+    def stream(self) -> TokenStream:
+        return TokenStream(self.tokens, self.__scan_lines())
+
+    def __scan_lines(self) -> Iterator[None]:
+        source = self.source
+        length = len(source)
+        match_token = self.token_pattern.match
+        fixed_codes = self.fixed_codes
+        last_ascii = self.last_ascii
+        add_kind = self.tokens.kinds.append
+        add_start = self.tokens.starts.append
+        add_end = self.tokens.ends.append
+        keyword_code = self.keyword_codes.get
+        starts_fixed = UTF8_FIXED_PATTERN.match if self.is_utf8 else None
+        variable_code = TokenType.VARIABLE.value
+        number_code = TokenType.NUMBER.value
+        max_identifier_length = self.limits.max_identifier_length
+        max_number_length = self.limits.max_number_length
+        position = 0
+
+        if length > self.limits.max_source_length:
+            raise ValueError(f"Your source code is too long ({length}), "
+                             f"I only read up to {self.limits.max_source_length}! Write less!")
+
+        while position < length:
+            match = match_token(source, position)
+            if match is None:
+                position = self.__scan_unicode(position)
+                continue
+
+            kind = match.lastindex
+            start, end = match.span(kind)
+
+            if kind == FIXED:
+                add_kind(fixed_codes[source[start:end]])
+            elif kind == WORD:
+                if end < length and source[end] > last_ascii and not (starts_fixed and starts_fixed(source, end)):
+                    end = self.__extend_run(end, self.__continues_identifier)
+                if end - start > max_identifier_length:
+                    self.__check_length(start, end, max_identifier_length, "name")
+                add_kind(keyword_code(source[start:end], variable_code))
+            elif kind == NUMBER:
+                if end < length and source[end] > last_ascii:
+                    end = self.__extend_run(end, str.isdigit)
+                if end - start > max_number_length:
+                    self.__check_length(start, end, max_number_length, "number")
+                add_kind(number_code)
+                add_start(start)
+                add_end(end)
+                self.line_has_content = True
+                position = self.__check_number_end(start, end)
+                continue
+            elif kind == LINE_BREAK:
+                position = end
+                if self.line_has_content:
+                    self.tokens.append(TokenType.NEWLINE, start, end)
+                    self.line_has_content = False
+                    yield
+                continue
+            else:
+                if kind == SINGLE_LINE:
+                    self.line_has_content = False
+                position = end
+                continue
 
-        if self.__try_multi_char_token():
-            return
-        if self.__try_emoji_token():
-            return
+            add_start(start)
+            add_end(end)
+            self.line_has_content = True
+            position = end
 
-        if char in SPECIAL_CHARS:
-            self.__add_token(SPECIAL_CHARS[char], char)
-            self.__move_to_next_char()
-            return
+        self.tokens.append(TokenType.THE_END, length, length)
+        yield
 
-        if char == '-' and self.__peek_ahead(2) and self.__peek_ahead(2)[1].isdigit():
-            self.__start_new_token(LexerState.NUMBER)
-            return
+    @staticmethod
+    def __continues_identifier(char: str) -> bool:
+        return char.isalpha() or char == VARIABLE_ALLOWED_SIGHN
+
+    def __char_at(self, position: int) -> tuple[str, int]:
+        if position >= len(self.source):
+            return "", 0
+        if not self.is_utf8:
+            return self.source[position], 1
+
+        lead = self.source[position]
+        if lead < 0x80:
+            return chr(lead), 1
+        width = 2 if lead < 0xe0 else 3 if lead < 0xf0 else 4
+        return self.source[position:position + width].decode('utf-8'), width
+
+    def __text(self, start: int, end: int) -> str:
+        text = self.source[start:end]
+        return text.decode('utf-8') if self.is_utf8 else text
+
+    def __extend_run(self, end: int, continues: Callable[[str], bool]) -> int:
+        char, width = self.__char_at(end)
+        while char and continues(char):
+            end += width
+            char, width = self.__char_at(end)
+        return end
+
+    def __scan_unicode(self, position: int) -> int:
+        position = self.whitespace_pattern.match(self.source, position).end()
+        if position >= len(self.source):
+            return position
+
+        char, width = self.__char_at(position)
+        next_char, _ = self.__char_at(position + width)
+
+        if char == '-' and next_char and next_char.isdigit():
+            end = self.__extend_run(position + width, str.isdigit)
+            self.__build_number_token(position, end)
+            return end
 
         if char.isalpha():
-            self.__start_new_token(LexerState.VARIABLE)
-            return
+            end = self.__extend_run(position, self.__continues_identifier)
+            self.__build_identifier_token(position, end)
+            return end
 
         if char.isdigit():
-            self.__start_new_token(LexerState.NUMBER)
-            return
-
-        raise ValueError(
-            f"I did not expect character '{char}' to be "
-            f"placed at line {self.line}, column {self.index}!!!"
-        )
-
-    def __try_multi_char_token(self) -> bool:
-        for length in [3, 2, 1]:
-            sequence = self.__peek_ahead(length)
-            if sequence in MULTI_CHAR_TOKENS:
-                self.__add_token(MULTI_CHAR_TOKENS[sequence], sequence)
-                self.__move_to_next_char(length)
-                return True
-        return False
-
-    def __try_emoji_token(self) -> bool:
-        if ord(self.source[self.current_position]) <= 127:
-            return False
-
-        for length in [9, 6, 3, 2, 1]:
-            sequence = self.__peek_ahead(length)
-            if sequence in EMOJI_TOKENS:
-                self.__add_token(EMOJI_TOKENS[sequence], sequence)
-                self.__move_to_next_char(len(sequence))
-                return True
-        
-        return False
-
-    def __manage_identifier_state(self, char: str):
-        if char.isalpha() or char == VARIABLE_ALLOWED_SIGHN:
-            self.__move_to_next_char()
-        else:
-            self.__build_current_token()
-            self.state = LexerState.INITIAL
-
-    def __manage_number_state(self, char: str):
-        if char.isdigit():
-            self.__move_to_next_char()
-            return
-
-        if char.isalpha() or char == VARIABLE_ALLOWED_SIGHN:
-            value = self.source[self.current_token_start:self.current_position + 1]
-            raise ValueError(
-                f"Do you think that this is a correct number: '{value}'? It is not!!!"
-                f" You placed that awful thing at line {self.current_token_start_line} "
-                f"and column {self.current_token_start_index}.")
-
-        self.__build_current_token()
-        self.state = LexerState.INITIAL
-
-    def __build_identifier_token(self, value: str):
-        token_type = KEYWORDS.get(value, TokenType.VARIABLE)
-        self.__add_token(token_type, value, self.current_token_start_line, self.current_token_start_index)
-
-    def __build_number_token(self, value: str):
-        if not value.lstrip('-').isdigit():
-            raise ValueError(
-                f"Do you think that this is a correct number: '{value}'? It is not!!!"
-                f"You placed that awful thing at line {self.current_token_start_line} "
-                f"and column {self.current_token_start_index}.")
-        self.__add_token(TokenType.NUMBER, value, self.current_token_start_line, self.current_token_start_index)
-
-    def __build_current_token(self):
-        if self.state == LexerState.INITIAL:
-            return
-        value = self.source[self.current_token_start:self.current_position]
-        match self.state:
-            case LexerState.VARIABLE:
-                self.__build_identifier_token(value)
-            case LexerState.NUMBER:
-                self.__build_number_token(value)
-
-    def __manage_comment_state(self, char: str):
-        while self.current_position < len(self.source) and self.source[self.current_position] != NEWLINE:
-            self.__move_to_next_char()
-        self.state = LexerState.INITIAL
-        self.line_has_content = False
-
-    def __manage_multiline_comment_state(self):
-        while self.current_position < len(self.source):
-            if self.__peek_ahead(len(MULTILINE_COMMENT)) == MULTILINE_COMMENT:
-                self.__move_to_next_char(len(MULTILINE_COMMENT))
-                self.state = LexerState.INITIAL
-                return
-            self.__move_to_next_char()
+            end = self.__extend_run(position, str.isdigit)
+            return self.__build_number_token(position, end)
+
+        line, column = self.line_index.position(position)
+        self.__fail(f"I did not expect character '{char}' to be "
+                    f"placed at line {line}, column {column}!!!", line)
+        return position + width
+
+    def __fail(self, message: str, line: int):
+        if not self.recover:
+            raise ValueError(message)
+        self.diagnostics.append(Diagnostic("lexer", message, line))
+
+    def __check_length(self, start: int, end: int, limit: int, what: str):
+        length = len(self.__text(start, end))
+        if length > limit:
+            line, column = self.line_index.position(start)
+            self.__fail(f"This {what} at line {line}, column {column} is {length} characters long, "
+                        f"but I only accept {limit}! Keep it short!", line)
+
+    def __build_identifier_token(self, start: int, end: int):
+        if end - start > self.limits.max_identifier_length:
+            self.__check_length(start, end, self.limits.max_identifier_length, "name")
+        value = self.__text(start, end)
+        self.__add_token(KEYWORDS.get(value, TokenType.VARIABLE), start, end)
+
+    def __check_number_end(self, start: int, end: int) -> int:
+        char, width = self.__char_at(end)
+        if char and self.__continues_identifier(char):
+            value = self.__text(start, end + width)
+            line, column = self.line_index.position(start)
+            self.__fail(f"Do you think that this is a correct number: '{value}'? It is not!!!"
+                        f" You placed that awful thing at line {line} "
+                        f"and column {column}.", line)
+            return self.__extend_run(end, self.__continues_identifier)
+        return end
+
+    def __build_number_token(self, start: int, end: int) -> int:
+        if end - start > self.limits.max_number_length:
+            self.__check_length(start, end, self.limits.max_number_length, "number")
+        self.__add_token(TokenType.NUMBER, start, end)
+        return self.__check_number_end(start, end)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+import os
+import re
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from mmap import mmap
+from typing import Optional, Union
+from ..limits import CompilerLimits, NO_LIMITS
+from ..token.line_index import LineIndex
+from ..token.token_buffer import TokenBuffer
+from .lexer import Lexer
+from .lexer_constants import *
+
+COMMENT_REGEX = f"({MULTILINE_COMMENT}.*?(?:{MULTILINE_COMMENT}|\\Z))|{COMMENT}[^{re.escape(NEWLINE)}]*"
+COMMENT_PATTERN = re.compile(COMMENT_REGEX, re.DOTALL)
+UTF8_COMMENT_PATTERN = re.compile(COMMENT_REGEX.encode(), re.DOTALL)
+
+
+def lex_chunk(chunk: Union[str, bytes], start: int, first_line: int,
+              limits: CompilerLimits) -> tuple[array, array, array]:
+    tokens = Lexer(chunk, first_line, limits=limits).tokenize()
+    kinds = tokens.kinds[:-1]
+    starts = array('I', [offset + start for offset in tokens.starts[:-1]])
+    ends = array('I', [offset + start for offset in tokens.ends[:-1]])
+    return kinds, starts, ends
+
+
+class ParallelLexer:
+    def __init__(self, source: Union[str, bytes, mmap], workers: Optional[int] = None,
+                 min_chunk_size: int = 1 << 20, limits: CompilerLimits = NO_LIMITS):
+        self.source = source
+        self.limits = limits
+        self.workers = workers or os.cpu_count() or 1
+        self.min_chunk_size = min_chunk_size
+        self.is_utf8 = not isinstance(source, str)
+        self.newline = NEWLINE.encode() if self.is_utf8 else NEWLINE
+
+    def tokenize(self) -> TokenBuffer:
+        boundaries = self.__chunk_boundaries()
+        if len(boundaries) <= 2 or len(self.source) > self.limits.max_source_length:
+            return Lexer(self.source, limits=self.limits).tokenize()
+
+        tokens = TokenBuffer(self.source, LineIndex(self.source))
+        starts = boundaries[:-1]
+        chunks = [self.source[start:end] for start, end in zip(starts, boundaries[1:])]
+        first_lines = [tokens.line_index.line(start) for start in starts]
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for kinds, chunk_starts, chunk_ends in executor.map(lex_chunk, chunks, starts, first_lines,
+                                                                      repeat(self.limits)):
+                tokens.kinds.extend(kinds)
+                tokens.starts.extend(chunk_starts)
+                tokens.ends.extend(chunk_ends)
+
+        tokens.append(TokenType.THE_END, len(self.source), len(self.source))
+        return tokens
+
+    def __multiline_comments(self) -> tuple[list[int], list[int]]:
+        pattern = UTF8_COMMENT_PATTERN if self.is_utf8 else COMMENT_PATTERN
+        starts, ends = [], []
+        for match in pattern.finditer(self.source):
+            if match.lastindex:
+                starts.append(match.start())
+                ends.append(match.end())
+        return starts, ends
+
+    def __chunk_boundaries(self) -> list[int]:
+        length = len(self.source)
+        chunk_count = min(self.workers, length // self.min_chunk_size)
+        if chunk_count <= 1:
+            return [0, length]
+
+        comment_starts, comment_ends = self.__multiline_comments()
+        boundaries = [0]
+        for chunk in range(1, chunk_count):
+            position = max(chunk * length // chunk_count, boundaries[-1])
+            while True:
+                position = self.source.find(self.newline, position)
+                if position == -1:
+                    break
+                comment = bisect_right(comment_starts, position) - 1
+                if comment < 0 or comment_ends[comment] <= position:
+                    break
+                position = comment_ends[comment]
+
+            if position == -1:
+                break
+            if position + 1 < length and position + 1 > boundaries[-1]:
+                boundaries.append(position + 1)
+
+        boundaries.append(length)
+        return boundaries
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+import sys
+
+UNLIMITED = sys.maxsize
+
+
+class CompilerLimits:
+    def __init__(self, max_source_length: int = UNLIMITED, max_identifier_length: int = UNLIMITED,
+                 max_number_length: int = UNLIMITED, max_nesting_depth: int = UNLIMITED,
+                 max_expression_length: int = UNLIMITED, max_variables: int = UNLIMITED,
+                 max_instructions: int = UNLIMITED):
+        self.max_source_length = max_source_length
+        self.max_identifier_length = max_identifier_length
+        self.max_number_length = max_number_length
+        self.max_nesting_depth = max_nesting_depth
+        self.max_expression_length = max_expression_length
+        self.max_variables = max_variables
+        self.max_instructions = max_instructions
+
+
+NO_LIMITS = CompilerLimits()
+
+# for source code submitted by people we do not trust
+UNTRUSTED_LIMITS = CompilerLimits(
+    max_source_length=8 << 20,
+    max_identifier_length=256,
+    max_number_length=64,
+    max_nesting_depth=256,
+    max_expression_length=4096,
+    max_variables=65536,
+    max_instructions=1 << 18,
+)
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 from enum import Enum
+from ..constants import I16_MIN, I16_MAX, I32_MIN, I32_MAX
 
 
 class DataType(Enum):
@@ -19,6 +20,15 @@ class DataType(Enum):
                 return vt
         raise ValueError(f"This type does not exist: {type_str}")
 
+    @staticmethod
+    def of_integer(value: int) -> 'DataType':
+        if I16_MIN <= value <= I16_MAX:
+            return DataType.I16
+        elif I32_MIN <= value <= I32_MAX:
+            return DataType.I32
+        else:
+            return DataType.I64
+
     def to_llvm(self) -> str:
         return self.llvm_representation
 
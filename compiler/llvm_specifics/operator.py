@@ -45,16 +45,18 @@ class Operator(Enum):
         return self in (Operator.AND, Operator.OR)
     
     def invert(self) -> 'Operator':
-        inversions = {
-            Operator.PLUS: Operator.MINUS,
-            Operator.MINUS: Operator.PLUS,
-            Operator.MULTIPLY: Operator.DIVIDE,
-            Operator.DIVIDE: Operator.MULTIPLY,
-            Operator.EQUALS: Operator.NOT_EQUALS,
-            Operator.NOT_EQUALS: Operator.EQUALS,
-            Operator.GREATER: Operator.LESS_EQUAL,
-            Operator.LESS: Operator.GREATER_EQUAL,
-            Operator.GREATER_EQUAL: Operator.LESS,
-            Operator.LESS_EQUAL: Operator.GREATER,
-        }
-        return inversions.get(self, self)
\ No newline at end of file
+        return INVERSIONS.get(self, self)
+
+
+INVERSIONS = {
+    Operator.PLUS: Operator.MINUS,
+    Operator.MINUS: Operator.PLUS,
+    Operator.MULTIPLY: Operator.DIVIDE,
+    Operator.DIVIDE: Operator.MULTIPLY,
+    Operator.EQUALS: Operator.NOT_EQUALS,
+    Operator.NOT_EQUALS: Operator.EQUALS,
+    Operator.GREATER: Operator.LESS_EQUAL,
+    Operator.LESS: Operator.GREATER_EQUAL,
+    Operator.GREATER_EQUAL: Operator.LESS,
+    Operator.LESS_EQUAL: Operator.GREATER,
+}
@@ -1,10 +1,20 @@
 #!/usr/bin/env python3
 from .stmt_node import StmtNode
+from .expr_node import ExprNode
+from .node_kind import NodeKind
+from ..variable_info import NO_SLOT
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class AssignNode(StmtNode):
+    __slots__ = ('slot',)
+    kind = NodeKind.ASSIGNMENT
+
+    def __init__(self, variable: str, expr_node: ExprNode, offset: int):
+        super().__init__(variable, expr_node, offset)
+        self.slot = NO_SLOT
+
     def accept(self, visitor: 'ASTVisitor'):
-        visitor.visit_assign(self)
+        return visitor.visit_assign(self)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+import struct
+from array import array
+from typing import Optional
+
+from ..constants import NOT
+from ..llvm_specifics.data_type import DataType
+from ..llvm_specifics.operator import Operator
+from ..token.line_index import LineIndex
+from ..variable_info import NO_SLOT
+from .ast_node import ASTNode
+from .node_kind import NodeKind
+from .assign_node import AssignNode
+from .binary_op_node import BinaryOpNode
+from .bool_node import BooleanNode
+from .code_block_node import CodeBlockNode
+from .decl_node import DeclNode
+from .elif_node import ElifNode
+from .id_node import IDNode
+from .if_node import IfNode
+from .number_node import NumberNode
+from .program_node import ProgramNode
+from .return_node import ReturnNode
+from .unary_op_node import UnaryOpNode
+from .while_node import WhileNode
+
+NO_NODE = -1
+
+OPERATORS = list(Operator)
+OPERATOR_CODES = {operator: code for code, operator in enumerate(OPERATORS)}
+DATA_TYPES = list(DataType)
+DATA_TYPE_CODES = {data_type: code for code, data_type in enumerate(DATA_TYPES)}
+
+# magic, node count, child count, string table size, root
+HEADER = struct.Struct("<4sIIIi")
+MAGIC = b"PIGA"
+# bytes per node over the kind, operator, left, right, literal and offset columns
+NODE_SIZE = 1 + 1 + 4 + 4 + 4 + 4
+
+# What each column holds per node kind; unused columns stay 0 or NO_NODE.
+#   kind         operator        left              right                literal
+#   PROGRAM      -               statement LIST    return expression    -
+#   DECLARATION  data type       expression        slot * 2 + mutable   name
+#   ASSIGNMENT   -               expression        slot                 name
+#   IF           1 if has else   condition         LIST of then, elif blocks and else
+#   ELIF, WHILE  -               condition         code block           -
+#   CODE_BLOCK   -               statement LIST    RETURN or NO_NODE    scope id
+#   RETURN       -               expression        -                    -
+#   BINARY       operator        left operand      right operand        data type or NO_NODE
+#   UNARY        -               operand           -                    -
+#   IDENTIFIER   -               data type         slot                 name
+#   NUMBER       -               -                 -                    text
+#   BOOLEAN      -               -                 -                    text
+#   LIST         -               first child       child count          -
+# Children are always added before their parent, so every index loop sees them first.
+
+# The arena is the compact form of an AST for storing it and handing it between processes, which the
+# AST cache writes to disk. It is not walked by the compiler passes: the semantic analyzer and the code
+# generator need a statement's scope and declaration before its expression rows and a block's label before
+# its statements, and the rows only come in child-before-parent order. They run on to_nodes() instead.
+class ASTArena:
+    def __init__(self):
+        self.kinds = array('B')
+        self.operators = array('B')
+        self.lefts = array('i')
+        self.rights = array('i')
+        self.literals = array('i')
+        self.offsets = array('I')
+        self.children = array('i')
+        self.strings: list[str] = []
+        self.root = NO_NODE
+
+    def add(self, kind: int, operator: int = 0, left: int = NO_NODE, right: int = NO_NODE,
+            literal: int = NO_NODE, offset: int = 0) -> int:
+        self.kinds.append(kind)
+        self.operators.append(operator)
+        self.lefts.append(left)
+        self.rights.append(right)
+        self.literals.append(literal)
+        self.offsets.append(offset)
+        return len(self.kinds) - 1
+
+    def add_list(self, items: list[int]) -> int:
+        first = len(self.children)
+        self.children.extend(items)
+        return self.add(NodeKind.LIST, left=first, right=len(items))
+
+    def list_items(self, index: int) -> array:
+        first = self.lefts[index]
+        return self.children[first:first + self.rights[index]]
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def to_bytes(self) -> bytes:
+        strings = "\0".join(self.strings).encode("utf-8")
+        columns = (self.kinds, self.operators, self.lefts, self.rights, self.literals, self.offsets, self.children)
+        return b"".join([HEADER.pack(MAGIC, len(self.kinds), len(self.children), len(strings), self.root),
+                         *(column.tobytes() for column in columns), strings])
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'ASTArena':
+        magic, node_count, child_count, strings_size, root = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("This is not a serialized PigLang AST!")
+
+        if len(data) != HEADER.size + node_count * NODE_SIZE + child_count * 4 + strings_size:
+            raise ValueError("This serialized PigLang AST is truncated!")
+
+        arena = ASTArena()
+        arena.root = root
+        offset = HEADER.size
+        for column, count in ((arena.kinds, node_count), (arena.operators, node_count), (arena.lefts, node_count),
+                              (arena.rights, node_count), (arena.literals, node_count), (arena.offsets, node_count),
+                              (arena.children, child_count)):
+            size = count * column.itemsize
+            column.frombytes(data[offset:offset + size])
+            offset += size
+        strings = data[offset:offset + strings_size].decode("utf-8")
+        arena.strings = strings.split("\0") if strings_size else []
+        return arena
+
+    def to_nodes(self) -> Optional[ASTNode]:
+        kinds, operators, lefts, rights, literals, offsets = \
+            self.kinds, self.operators, self.lefts, self.rights, self.literals, self.offsets
+        strings = self.strings
+        nodes: list = [None] * len(kinds)
+
+        def items(index: int) -> list:
+            first = lefts[index]
+            return [nodes[child] for child in self.children[first:first + rights[index]]]
+
+        def node_or_none(index: int):
+            return nodes[index] if index != NO_NODE else None
+
+        for index in range(len(kinds)):
+            left = lefts[index]
+            # the most common kinds come first
+            match kinds[index]:
+                case NodeKind.BINARY:
+                    node = BinaryOpNode(nodes[left], OPERATORS[operators[index]], nodes[rights[index]])
+                    if literals[index] != NO_NODE:
+                        node.data_type = DATA_TYPES[literals[index]]
+                case NodeKind.IDENTIFIER:
+                    node = IDNode(strings[literals[index]])
+                    node.slot = rights[index]
+                    if left != NO_NODE:
+                        node.data_type = DATA_TYPES[left]
+                case NodeKind.ASSIGNMENT:
+                    node = AssignNode(strings[literals[index]], nodes[left], offsets[index])
+                    node.slot = rights[index]
+                case NodeKind.LIST:
+                    continue
+                case NodeKind.CODE_BLOCK:
+                    node = CodeBlockNode(items(left), node_or_none(rights[index]), literals[index])
+                case NodeKind.NUMBER:
+                    node = NumberNode.of(strings[literals[index]])
+                case NodeKind.BOOLEAN:
+                    node = BooleanNode.of(strings[literals[index]])
+                case NodeKind.UNARY:
+                    node = UnaryOpNode(NOT, nodes[left])
+                case NodeKind.DECLARATION:
+                    node = DeclNode(strings[literals[index]], nodes[left], offsets[index], bool(rights[index] & 1),
+                                    DATA_TYPES[operators[index]])
+                    node.slot = rights[index] >> 1
+                case NodeKind.RETURN:
+                    node = ReturnNode(nodes[left], offsets[index])
+                case NodeKind.ELIF:
+                    node = ElifNode(nodes[left], nodes[rights[index]], offsets[index])
+                case NodeKind.WHILE:
+                    node = WhileNode(nodes[left], nodes[rights[index]], offsets[index])
+                case NodeKind.IF:
+                    blocks = items(rights[index])
+                    else_block = blocks.pop() if operators[index] else None
+                    node = IfNode(nodes[left], blocks[0], blocks[1:], else_block, offsets[index])
+                case NodeKind.PROGRAM:
+                    node = ProgramNode(items(left), node_or_none(rights[index]), offsets[index])
+                case _:
+                    node = None
+            nodes[index] = node
+
+        return node_or_none(self.root)
+
+
+class ArenaBuilder:
+    def __init__(self):
+        self.arena = ASTArena()
+        self.string_indexes: dict[str, int] = {}
+        self.shared_literals: dict[tuple[int, str], int] = {}
+
+    def __string(self, value: str) -> int:
+        index = self.string_indexes.get(value)
+        if index is None:
+            index = self.string_indexes[value] = len(self.arena.strings)
+            self.arena.strings.append(value)
+        return index
+
+    def __literal(self, kind: int, text: str) -> int:
+        key = (kind, text)
+        index = self.shared_literals.get(key)
+        if index is None:
+            index = self.shared_literals[key] = self.arena.add(kind, literal=self.__string(text))
+        return index
+
+    def number(self, text: str) -> int:
+        return self.__literal(NodeKind.NUMBER, text)
+
+    def boolean(self, value: str) -> int:
+        return self.__literal(NodeKind.BOOLEAN, value)
+
+    def identifier(self, variable: str, slot: int = NO_SLOT, data_type: Optional[DataType] = None) -> int:
+        return self.arena.add(NodeKind.IDENTIFIER, left=NO_NODE if data_type is None else DATA_TYPE_CODES[data_type],
+                              right=slot, literal=self.__string(variable))
+
+    def binary(self, left: int, operator: Operator, right: int, data_type: Optional[DataType] = None) -> int:
+        return self.arena.add(NodeKind.BINARY, OPERATOR_CODES[operator], left, right,
+                              NO_NODE if data_type is None else DATA_TYPE_CODES[data_type])
+
+    def unary(self, operator: str, operand: int) -> int:
+        return self.arena.add(NodeKind.UNARY, left=operand)
+
+    def declaration(self, variable: str, expr: int, offset: int, mutable: bool, data_type: DataType,
+                    slot: int = NO_SLOT) -> int:
+        return self.arena.add(NodeKind.DECLARATION, DATA_TYPE_CODES[data_type], expr, slot << 1 | int(mutable),
+                              self.__string(variable), offset)
+
+    def assignment(self, variable: str, expr: int, offset: int, slot: int = NO_SLOT) -> int:
+        return self.arena.add(NodeKind.ASSIGNMENT, left=expr, right=slot, literal=self.__string(variable), offset=offset)
+
+    def return_statement(self, expr: int, offset: int) -> int:
+        return self.arena.add(NodeKind.RETURN, left=expr, offset=offset)
+
+    def open_block(self):
+        pass
+
+    def code_block(self, statements: list[int], return_node: Optional[int], scope_id: int) -> int:
+        return self.arena.add(NodeKind.CODE_BLOCK, left=self.arena.add_list(statements),
+                              right=NO_NODE if return_node is None else return_node, literal=scope_id)
+
+    def if_statement(self, condition: int, then_block: int, elif_blocks: list[int],
+                     else_block: Optional[int], offset: int) -> int:
+        has_else = else_block is not None
+        blocks = self.arena.add_list([then_block, *elif_blocks, *([else_block] if has_else else [])])
+        return self.arena.add(NodeKind.IF, int(has_else), condition, blocks, offset=offset)
+
+    def elif_statement(self, condition: int, block: int, offset: int) -> int:
+        return self.arena.add(NodeKind.ELIF, left=condition, right=block, offset=offset)
+
+    def while_loop(self, condition: int, body: int, offset: int) -> int:
+        return self.arena.add(NodeKind.WHILE, left=condition, right=body, offset=offset)
+
+    def program(self, statements: list[int], return_node: Optional[int], offset: int = 0,
+                lines: Optional[LineIndex] = None) -> int:
+        # the arena does not keep the source, so whoever loads the AST gives it the lines of its source
+        self.arena.root = self.arena.add(NodeKind.PROGRAM, left=self.arena.add_list(statements),
+                                         right=NO_NODE if return_node is None else return_node, offset=offset)
+        return self.arena.root
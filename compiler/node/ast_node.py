@@ -6,6 +6,10 @@ if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class ASTNode(ABC):
+    __slots__ = ()
+    # one of NodeKind, set by every concrete node class
+    kind: int
+
     @abstractmethod
     def accept(self, visitor: 'ASTVisitor'):
         pass
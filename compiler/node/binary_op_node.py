@@ -1,18 +1,24 @@
 #!/usr/bin/env python3
 from .expr_node import ExprNode
 from .factor_node import FactorNode
+from ..llvm_specifics.data_type import DataType
 from ..llvm_specifics.operator import Operator
+from .node_kind import NodeKind
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class BinaryOpNode(ExprNode):
+    __slots__ = ('left', 'operator', 'right')
+    kind = NodeKind.BINARY
+
     def __init__(self, left: ExprNode, operator: Operator, right: ExprNode):
         self.left = left
         self.operator = operator
         self.right = right
-        self.result_type = None
+        # arithmetic takes the widest type of its operands, which only the semantic analyzer knows
+        self.data_type = DataType.BOOL if operator.is_for_comparison() or operator.is_logical() else None
 
     def accept(self, visitor: 'ASTVisitor'):
         return visitor.visit_binary_operation(self)
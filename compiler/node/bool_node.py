@@ -1,10 +1,30 @@
 #!/usr/bin/env python3
+from ..constants import TRUE, FALSE
 from .factor_node import FactorNode
+from .node_kind import NodeKind
+from ..llvm_specifics.data_type import DataType
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class BooleanNode(FactorNode):
+    __slots__ = ()
+    kind = NodeKind.BOOLEAN
+
+    def __init__(self, value: str):
+        super().__init__(value)
+        self.data_type = DataType.BOOL
+
+    @staticmethod
+    def of(value: str) -> 'BooleanNode':
+        return BOOLEANS[value]
+
+    def __reduce__(self):
+        return BooleanNode.of, (self.value,)
+
     def accept(self, visitor: 'ASTVisitor'):
         return visitor.visit_boolean(self)
+
+
+BOOLEANS = {value: BooleanNode(value) for value in (TRUE, FALSE)}
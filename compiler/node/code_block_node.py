@@ -2,12 +2,16 @@
 from .ast_node import ASTNode
 from .return_node import ReturnNode
 from .stmt_node import StmtNode
+from .node_kind import NodeKind
 from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class CodeBlockNode(ASTNode):
+    __slots__ = ('statements', 'return_node', 'scope_id')
+    kind = NodeKind.CODE_BLOCK
+
     def __init__(self, statements: list[StmtNode],
                  return_node: Optional[ReturnNode], scope_id: int):
         self.statements = statements
@@ -8,8 +8,10 @@ if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class ConditionNode(StmtNode):
-    def __init__(self, condition: ExprNode, block: CodeBlockNode,line: int):
-        super().__init__("", condition, line)
+    __slots__ = ('condition', 'block')
+
+    def __init__(self, condition: ExprNode, block: CodeBlockNode,offset: int):
+        super().__init__("", condition, offset)
         self.condition = condition
         self.block = block
 
@@ -2,16 +2,22 @@
 from ..llvm_specifics.data_type import DataType
 from .stmt_node import StmtNode
 from .expr_node import ExprNode
+from .node_kind import NodeKind
+from ..variable_info import NO_SLOT
 from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class DeclNode(StmtNode):
-    def __init__(self, variable: str, expr_node: Optional[ExprNode], line: int, mutable: bool, data_type: DataType):
-        super().__init__(variable, expr_node, line)
+    __slots__ = ('mutable', 'data_type', 'slot')
+    kind = NodeKind.DECLARATION
+
+    def __init__(self, variable: str, expr_node: Optional[ExprNode], offset: int, mutable: bool, data_type: DataType):
+        super().__init__(variable, expr_node, offset)
         self.mutable = mutable
         self.data_type = data_type
+        self.slot = NO_SLOT
 
     def accept(self, visitor: 'ASTVisitor'):
-        visitor.visit_declaration(self)
+        return visitor.visit_declaration(self)
@@ -7,6 +7,9 @@ if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class ExprNode(ASTNode):
+    # the type of the value, known up front for literals and operators and set by the semantic analyzer otherwise
+    __slots__ = ('data_type',)
+
     @abstractmethod
     def accept(self, visitor: 'ASTVisitor'):
         pass
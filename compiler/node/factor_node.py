@@ -7,6 +7,8 @@ if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class FactorNode(ExprNode):
+    __slots__ = ('value',)
+
     def __init__(self, value: str):
         self.value = value
 
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+from ..llvm_specifics.data_type import DataType
+from ..llvm_specifics.operator import Operator
+from .assign_node import AssignNode
+from .binary_op_node import BinaryOpNode
+from .code_block_node import CodeBlockNode
+from .decl_node import DeclNode
+from .expr_node import ExprNode
+from .id_node import IDNode
+from .node_builder import NodeBuilder
+from .unary_op_node import UnaryOpNode
+
+NO_VARIABLES = frozenset()
+
+
+# Builds a DAG instead of a tree: structurally identical expressions share one node as long as
+# none of their variables was assigned in between. The table is emptied when a block header starts
+# and when the block ends, so the first evaluation of a shared node always dominates its later uses.
+class HashConsBuilder(NodeBuilder):
+    def __init__(self):
+        self.expressions: dict[tuple, ExprNode] = {}
+        self.variables: dict[ExprNode, frozenset[str]] = {}
+        self.readers: dict[str, list[tuple]] = {}
+
+    def __share(self, key: tuple, node: ExprNode, variables: frozenset[str]) -> ExprNode:
+        self.expressions[key] = node
+        self.variables[node] = variables
+        for variable in variables:
+            self.readers.setdefault(variable, []).append(key)
+        return node
+
+    def __forget(self, variable: str):
+        for key in self.readers.pop(variable, ()):
+            node = self.expressions.pop(key, None)
+            if node is not None:
+                del self.variables[node]
+
+    def __forget_all(self):
+        self.expressions.clear()
+        self.variables.clear()
+        self.readers.clear()
+
+    def identifier(self, variable: str) -> IDNode:
+        key = (variable,)
+        node = self.expressions.get(key)
+        if node is None:
+            node = self.__share(key, IDNode(variable), frozenset(key))
+        return node
+
+    def binary(self, left: ExprNode, operator: Operator, right: ExprNode) -> BinaryOpNode:
+        key = (left, operator, right)
+        node = self.expressions.get(key)
+        if node is None:
+            variables = self.variables.get(left, NO_VARIABLES) | self.variables.get(right, NO_VARIABLES)
+            node = self.__share(key, BinaryOpNode(left, operator, right), variables)
+        return node
+
+    def unary(self, operator: str, operand: ExprNode) -> UnaryOpNode:
+        key = (operator, operand)
+        node = self.expressions.get(key)
+        if node is None:
+            node = self.__share(key, UnaryOpNode(operator, operand), self.variables.get(operand, NO_VARIABLES))
+        return node
+
+    def declaration(self, variable: str, expr: ExprNode, offset: int, mutable: bool, data_type: DataType) -> DeclNode:
+        self.__forget(variable)
+        return DeclNode(variable, expr, offset, mutable, data_type)
+
+    def assignment(self, variable: str, expr: ExprNode, offset: int) -> AssignNode:
+        self.__forget(variable)
+        return AssignNode(variable, expr, offset)
+
+    def open_block(self):
+        self.__forget_all()
+
+    def code_block(self, statements: list, return_node, scope_id: int) -> CodeBlockNode:
+        self.__forget_all()
+        return CodeBlockNode(statements, return_node, scope_id)
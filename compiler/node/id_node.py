@@ -1,14 +1,20 @@
 #!/usr/bin/env python3
 from .factor_node import FactorNode
+from .node_kind import NodeKind
+from ..variable_info import NO_SLOT
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class IDNode(FactorNode):
-    def __init__(self, variable: str, line: int):
+    __slots__ = ('slot',)
+    kind = NodeKind.IDENTIFIER
+
+    def __init__(self, variable: str):
         super().__init__(variable)
-        self.line = line
+        self.slot = NO_SLOT
+        self.data_type = None
 
     def accept(self, visitor: 'ASTVisitor'):
         return visitor.visit_id(self)
@@ -5,16 +5,20 @@ from .expr_node import ExprNode
 from .code_block_node import CodeBlockNode
 from typing import TYPE_CHECKING, Optional
 from .condition_node import ConditionNode
+from .node_kind import NodeKind
 
 if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class IfNode(ConditionNode):
+    __slots__ = ('elif_blocks', 'else_block')
+    kind = NodeKind.IF
+
     def __init__(self, condition: ExprNode,
                   then_block: CodeBlockNode,
                   elif_blocks: list[ElifNode],
-                  else_block: Optional[CodeBlockNode], line: int):
-        super().__init__(condition, then_block, line)
+                  else_block: Optional[CodeBlockNode], offset: int):
+        super().__init__(condition, then_block, offset)
         self.elif_blocks = elif_blocks
         self.else_block = else_block
 
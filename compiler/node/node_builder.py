@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+from .assign_node import AssignNode
+from .binary_op_node import BinaryOpNode
+from .bool_node import BooleanNode
+from .code_block_node import CodeBlockNode
+from .decl_node import DeclNode
+from .elif_node import ElifNode
+from .id_node import IDNode
+from .if_node import IfNode
+from .number_node import NumberNode
+from .program_node import ProgramNode
+from .return_node import ReturnNode
+from .unary_op_node import UnaryOpNode
+from .while_node import WhileNode
+
+
+class NodeBuilder:
+    number = staticmethod(NumberNode.of)
+    boolean = staticmethod(BooleanNode.of)
+    identifier = IDNode
+    binary = BinaryOpNode
+    unary = UnaryOpNode
+    declaration = DeclNode
+    assignment = AssignNode
+    return_statement = ReturnNode
+    code_block = CodeBlockNode
+    if_statement = IfNode
+    elif_statement = ElifNode
+    while_loop = WhileNode
+    program = ProgramNode
+
+    def open_block(self):
+        pass
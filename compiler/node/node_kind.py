@@ -0,0 +1,6 @@
+#!/usr/bin/env python3
+
+
+class NodeKind:
+    PROGRAM, DECLARATION, ASSIGNMENT, IF, ELIF, WHILE, CODE_BLOCK, RETURN, \
+        BINARY, UNARY, IDENTIFIER, NUMBER, BOOLEAN, LIST = range(14)
@@ -1,10 +1,31 @@
 #!/usr/bin/env python3
 from .factor_node import FactorNode
+from .node_kind import NodeKind
+from ..llvm_specifics.data_type import DataType
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class NumberNode(FactorNode):
+    __slots__ = ('int_value',)
+    kind = NodeKind.NUMBER
+
+    def __init__(self, value: str):
+        super().__init__(value)
+        self.int_value = int(value)
+        self.data_type = DataType.of_integer(self.int_value)
+
+    @staticmethod
+    def of(value: str) -> 'NumberNode':
+        node = SMALL_NUMBERS.get(value)
+        return node if node is not None else NumberNode(value)
+
+    def __reduce__(self):
+        return NumberNode.of, (self.value,)
+
     def accept(self, visitor: 'ASTVisitor'):
         return visitor.visit_number(self)
+
+
+SMALL_NUMBERS = {str(value): NumberNode(str(value)) for value in range(-128, 1024)}
@@ -1,16 +1,27 @@
 #!/usr/bin/env python3
+from typing import Optional
 from .ast_node import ASTNode
 from .return_node import ReturnNode
 from .stmt_node import StmtNode
+from .node_kind import NodeKind
+from ..token.line_index import LineIndex
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class ProgramNode(ASTNode):
-    def __init__(self, statement_nodes: list[StmtNode], return_node: ReturnNode):
+    __slots__ = ('statement_nodes', 'return_node', 'offset', 'lines')
+    kind = NodeKind.PROGRAM
+
+    def __init__(self, statement_nodes: list[StmtNode], return_node: ReturnNode, offset: int = 0,
+                 lines: Optional[LineIndex] = None):
         self.statement_nodes = statement_nodes
         self.return_node = return_node
+        # where the return statement starts in the source
+        self.offset = offset
+        # resolves the offsets of the nodes to lines for diagnostics
+        self.lines = lines
 
     def accept(self, visitor: 'ASTVisitor'):
         return visitor.visit_program(self)
@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
 from .ast_node import ASTNode
 from .expr_node import ExprNode
+from .node_kind import NodeKind
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class ReturnNode(ASTNode):
-    def __init__(self, expr_node: ExprNode):
+    __slots__ = ('expr_node', 'offset')
+    kind = NodeKind.RETURN
+
+    def __init__(self, expr_node: ExprNode, offset: int):
         self.expr_node = expr_node
+        self.offset = offset
 
     def accept(self, visitor: 'ASTVisitor'):
         return visitor.visit_return(self)
@@ -8,10 +8,13 @@ if TYPE_CHECKING:
     from ..visitor.ast_visitor import ASTVisitor
 
 class StmtNode(ASTNode):
-    def __init__(self, variable: str, expr_node: ExprNode, line: int):
+    __slots__ = ('variable', 'expr_node', 'offset')
+
+    def __init__(self, variable: str, expr_node: ExprNode, offset: int):
         self.variable = variable
         self.expr_node = expr_node
-        self.line = line
+        # where the statement starts in the source, resolved to a line only for a diagnostic
+        self.offset = offset
 
     @abstractmethod
     def accept(self, visitor: 'ASTVisitor'):
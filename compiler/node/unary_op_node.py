@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 from .expr_node import ExprNode
 from .factor_node import FactorNode
+from .node_kind import NodeKind
+from ..llvm_specifics.data_type import DataType
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -8,9 +10,13 @@ if TYPE_CHECKING:
 
 
 class UnaryOpNode(ExprNode):
+    __slots__ = ('operator', 'operand')
+    kind = NodeKind.UNARY
+
     def __init__(self, operator: str, operand: ExprNode):
         self.operator = operator
         self.operand = operand
+        self.data_type = DataType.BOOL
 
     def accept(self, visitor: 'ASTVisitor'):
         return visitor.visit_unary_operation(self)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+import os
+import stat
+import sys
+import tempfile
+from typing import TextIO
+
+STDOUT = "-"
+TEMP_SUFFIX = ".ll.tmp"
+
+
+# The code generator writes the LLVM IR while it runs, so it goes to a temporary file next to the output
+# file that only replaces it once the compilation succeeded. "-" streams the IR to stdout, e.g. into llc.
+# Pipes, devices and symlinks cannot be replaced like that, so they are written directly.
+class OutputFile:
+    def __init__(self, path: str):
+        self.path = path
+        self.temp_path = None
+        self.committed = False
+        self.stream: TextIO = sys.stdout
+
+    def __enter__(self) -> 'OutputFile':
+        if self.path == STDOUT:
+            return self
+        if not self.__is_replaceable(self.path):
+            self.stream = open(self.path, 'w')
+            return self
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, self.temp_path = tempfile.mkstemp(dir=directory, suffix=TEMP_SUFFIX)
+        # mkstemp only lets the owner read the file, the output gets the permissions of a new file
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(self.temp_path, 0o666 & ~umask)
+        self.stream = os.fdopen(descriptor, 'w')
+        return self
+
+    @staticmethod
+    def __is_replaceable(path: str) -> bool:
+        try:
+            return stat.S_ISREG(os.lstat(path).st_mode)
+        except FileNotFoundError:
+            return True
+
+    def commit(self):
+        self.committed = True
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.path == STDOUT:
+            self.stream.flush()
+            return False
+        if self.temp_path is None:
+            self.stream.close()
+            return False
+
+        self.stream.close()
+        if self.committed:
+            os.replace(self.temp_path, self.path)
+        else:
+            try:
+                os.remove(self.temp_path)
+            except OSError:
+                pass
+        return False
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+import os
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Union
+
+from compiler.limits import CompilerLimits, NO_LIMITS
+from compiler.node.node_builder import NodeBuilder
+from compiler.node.program_node import ProgramNode
+from compiler.node.stmt_node import StmtNode
+from compiler.syntax_parser import SyntaxParser
+from compiler.token.line_index import LineIndex
+from compiler.token.token_buffer import TokenBuffer
+from compiler.token.token_code import *
+from compiler.token.token_type import TokenType
+
+HEADER_CODES = frozenset({TokenCode.IF, TokenCode.WHILE})
+CONTINUATION_CODES = frozenset({TokenCode.ELIF, TokenCode.ELSE})
+
+
+def parse_statement_range(kinds: array, starts: array, ends: array, source: Union[str, bytes],
+                          base: int, first_line: int, first_scope_id: int,
+                          limits: CompilerLimits, builder_type: type) -> list[StmtNode]:
+    tokens = TokenBuffer(source, LineIndex(source, first_line), base)
+    tokens.kinds = kinds
+    tokens.starts = array('I', [offset - base for offset in starts])
+    tokens.ends = array('I', [offset - base for offset in ends])
+    tokens.append(TokenType.THE_END, len(source), len(source))
+    return SyntaxParser(tokens, first_scope_id, limits=limits, builder=builder_type()).parse_statement_range()
+
+
+class StatementRanges:
+    def __init__(self):
+        self.starts: list[int] = []
+        self.scope_ids: list[int] = []
+        self.return_index: Optional[int] = None
+        self.scope_count = 0
+
+
+class ParallelSyntaxParser:
+    def __init__(self, tokens: TokenBuffer, workers: Optional[int] = None, min_range_size: int = 1 << 16,
+                 limits: CompilerLimits = NO_LIMITS, builder_type: type = NodeBuilder):
+        self.tokens = tokens
+        self.limits = limits
+        self.builder_type = builder_type
+        self.workers = workers or os.cpu_count() or 1
+        self.min_range_size = min_range_size
+
+    def parse_program(self) -> ProgramNode:
+        range_count = min(self.workers, len(self.tokens) // self.min_range_size)
+        ranges = self.__find_statement_ranges() if range_count > 1 else None
+        if ranges is None or ranges.return_index is None:
+            return SyntaxParser(self.tokens, limits=self.limits, builder=self.builder_type()).parse_program()
+
+        boundaries, scope_ids = self.__split(ranges, range_count)
+        try:
+            statements = self.__parse_ranges(boundaries, scope_ids)
+        except (ValueError, BrokenProcessPool):
+            # the sequential parser reports the first syntax error in source order and takes over from dead workers
+            return SyntaxParser(self.tokens, limits=self.limits, builder=self.builder_type()).parse_program()
+
+        parser = SyntaxParser(self.tokens, ranges.scope_count + 1, limits=self.limits, builder=self.builder_type())
+        parser.current_token_index = ranges.return_index
+        return parser.resume_program(statements)
+
+    def __find_statement_ranges(self) -> StatementRanges:
+        kinds = self.tokens.kinds
+        ranges = StatementRanges()
+        depth = 0
+        opens_block = closes_block = False
+        line_start = 0
+
+        while line_start < len(kinds):
+            has_border = kinds[line_start] in LINE_START_CODES
+            lead = kinds[line_start + 1] if has_border and line_start + 1 < len(kinds) else kinds[line_start]
+
+            if depth == 0 and not opens_block and not closes_block:
+                if lead == TokenCode.RETURN:
+                    ranges.return_index = line_start
+                    break
+                if not (has_border and lead in CONTINUATION_CODES):
+                    ranges.starts.append(line_start)
+                    ranges.scope_ids.append(ranges.scope_count + 1)
+
+            if opens_block:
+                depth += 1
+                ranges.scope_count += 1
+                opens_block = False
+            elif closes_block or (depth and has_border and lead == TokenCode.BLOCK_BORDER):
+                depth -= 1
+                closes_block = False
+            elif lead in HEADER_CODES or (has_border and lead in CONTINUATION_CODES):
+                opens_block = True
+            elif depth and lead == TokenCode.RETURN:
+                closes_block = True
+
+            try:
+                line_start = kinds.index(TokenCode.NEWLINE, line_start) + 1
+            except ValueError:
+                break
+
+        return ranges
+
+    def __split(self, ranges: StatementRanges, range_count: int) -> tuple[list[int], list[int]]:
+        boundaries, scope_ids = [0], [1]
+        for part in range(1, range_count):
+            candidate = bisect_left(ranges.starts, part * ranges.return_index // range_count)
+            if candidate < len(ranges.starts) and ranges.starts[candidate] > boundaries[-1]:
+                boundaries.append(ranges.starts[candidate])
+                scope_ids.append(ranges.scope_ids[candidate])
+        boundaries.append(ranges.return_index)
+        return boundaries, scope_ids
+
+    def __parse_ranges(self, boundaries: list[int], scope_ids: list[int]) -> list[StmtNode]:
+        tokens = self.tokens
+        jobs = []
+        for start, end, scope_id in zip(boundaries, boundaries[1:], scope_ids):
+            base = tokens.starts[start]
+            source = tokens.source[base:tokens.starts[end]]
+            jobs.append((tokens.kinds[start:end], tokens.starts[start:end], tokens.ends[start:end],
+                         source, base, tokens.line(start), scope_id, self.limits, self.builder_type))
+
+        statements = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for range_statements in executor.map(parse_statement_range, *zip(*jobs)):
+                statements.extend(range_statements)
+        return statements
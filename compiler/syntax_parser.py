@@ -2,462 +2,575 @@
 from typing import Union, Optional
 
 from compiler.node.assign_node import AssignNode
-from compiler.node.binary_op_node import BinaryOpNode
 from compiler.node.code_block_node import CodeBlockNode
 from compiler.node.decl_node import DeclNode
 from compiler.node.expr_node import ExprNode
 from compiler.node.factor_node import FactorNode
-from compiler.node.id_node import IDNode
 from compiler.node.if_node import IfNode
 from compiler.node.elif_node import ElifNode
-from compiler.node.while_node import WhileNode
-from compiler.node.number_node import NumberNode
 from compiler.node.program_node import ProgramNode
 from compiler.node.return_node import ReturnNode
 from compiler.node.stmt_node import StmtNode
 from compiler.llvm_specifics.data_type import DataType
 from compiler.llvm_specifics.operator import Operator
-from compiler.node.bool_node import BooleanNode
-from compiler.node.unary_op_node import UnaryOpNode
-from compiler.token.token_type import TokenType
-from compiler.token.token_class import Token
+from compiler.node.node_builder import NodeBuilder
+from compiler.node.ast_arena import ArenaBuilder
+from compiler.token.token_buffer import TokenBuffer
+from compiler.token.token_stream import TokenStream
+from compiler.token.token_code import *
 from compiler.constants import NOT, FALSE, TRUE
+from compiler.diagnostic import Diagnostic
+from compiler.limits import CompilerLimits, NO_LIMITS
+
+LOGICAL_OR, LOGICAL_AND, COMPARISON, ADDITIVE, MULTIPLICATIVE = range(1, 6)
+
+BINARY_PRECEDENCE = {
+    TokenCode.OR: LOGICAL_OR,
+    TokenCode.AND: LOGICAL_AND,
+    **{code: COMPARISON for code in COMPARISON_CODES},
+    **{code: ADDITIVE for code in ADDITIVE_CODES},
+    **{code: MULTIPLICATIVE for code in MULTIPLICATIVE_CODES},
+}
+
+# (precedence, highest precedence allowed to follow, operator); comparisons do not chain
+BINARY_OPERATORS = {
+    code: (precedence, precedence - 1 if precedence == COMPARISON else precedence, Operator[TOKEN_TYPES[code].name])
+    for code, precedence in BINARY_PRECEDENCE.items()
+}
+MOOD_BINARY_OPERATORS = {
+    code: (precedence, ceiling, operator.invert())
+    for code, (precedence, ceiling, operator) in BINARY_OPERATORS.items()
+}
+
+
+class LineKind:
+    DECLARATION, ASSIGNMENT, IF, ELIF, ELSE, WHILE, BLOCK_BORDER, RETURN, OTHER = range(9)
+
+
+LINE_KINDS = {
+    TokenCode.MUT: LineKind.DECLARATION,
+    TokenCode.CONST: LineKind.DECLARATION,
+    TokenCode.VARIABLE_BORDER: LineKind.ASSIGNMENT,
+    TokenCode.IF: LineKind.IF,
+    TokenCode.ELIF: LineKind.ELIF,
+    TokenCode.ELSE: LineKind.ELSE,
+    TokenCode.WHILE: LineKind.WHILE,
+    TokenCode.BLOCK_BORDER: LineKind.BLOCK_BORDER,
+    TokenCode.RETURN: LineKind.RETURN,
+}
+
+
+class ExpressionFrame:
+    def __init__(self, min_precedence: int, negations: Optional[int] = None):
+        self.min_precedence = min_precedence
+        self.ceiling = MULTIPLICATIVE
+        self.left: Optional[ExprNode] = None
+        self.operator: Optional[Operator] = None
+        self.precedence = min_precedence
+        self.next_ceiling = MULTIPLICATIVE
+        self.negations = negations
+
+
+class OpenStatement:
+    def __init__(self):
+        self.condition: Optional[ExprNode] = None
+        self.offset = 0
+        self.then_block: Optional[CodeBlockNode] = None
+        self.elif_blocks: list[ElifNode] = []
+        self.discarded = False
+
+
+class BlockState:
+    AWAITING_OPEN, OPEN, AWAITING_CLOSE = range(3)
+
+
+class OpenBlock:
+    def __init__(self, owner: OpenStatement, keyword: int):
+        self.owner = owner
+        self.keyword = keyword
+        self.condition: Optional[ExprNode] = None
+        self.offset = 0
+        self.statements: list[StmtNode] = []
+        self.return_node: Optional[ReturnNode] = None
+        self.state = BlockState.AWAITING_OPEN
+        # stays set when the header line fails; recovery then keeps only the block body
+        self.discarded = True
 
 
 class SyntaxParser:
-    def __init__(self, tokens: list[Token]):
+    def __init__(self, tokens: Union[TokenBuffer, TokenStream], first_scope_id: int = 1, recover: bool = False,
+                 limits: CompilerLimits = NO_LIMITS, builder: Union[NodeBuilder, ArenaBuilder] = NodeBuilder()):
         self.tokens = tokens
+        self.builder = builder
+        self.limits = limits
+        self.kinds = tokens.kinds
         self.current_token_index = 0
-        self.next_scope_id = 1
+        self.next_scope_id = first_scope_id
         self.in_mood_line = False
-
-    def __peek(self, count: int = 0) -> Token:
-        return self.tokens[self.current_token_index + count] if self.current_token_index + count < len(self.tokens) else None
-
-    def __eat(self) -> Optional[Token]:
-        token = self.__peek()
-        if token:
-            self.current_token_index += 1
-        return token
-
-    def __expect_token(self, token_type: TokenType) -> Token:
+        self.open_blocks: list[OpenBlock] = []
+        self.pending_if: Optional[OpenStatement] = None
+        self.recover = recover
+        self.diagnostics: list[Diagnostic] = []
+        self.partial_declaration: Optional[DeclNode] = None
+
+    def __peek(self, count: int = 0) -> Optional[int]:
+        try:
+            return self.kinds[self.current_token_index + count]
+        except IndexError:
+            return None
+
+    def __eat(self) -> Optional[int]:
+        if self.__peek() is None:
+            return None
+        self.current_token_index += 1
+        return self.current_token_index - 1
+
+    def __expect_token(self, code: int) -> int:
         token = self.__peek()
-        if not token:
-            raise ValueError(f"I expected a token of the type {token_type.name} but you decided to abandon this promising code!")
+        if token is None:
+            raise ValueError(f"I expected a token of the type {TOKEN_TYPES[code].name} but you decided to abandon this promising code!")
 
-        if token.token_type != token_type:
-            raise ValueError(f"I expected a token of the type {token_type.name} but you gave me {token.token_type.name} "
-                f"at line {token.line} and index {token.index}")
+        if token != code:
+            index = self.current_token_index
+            raise ValueError(f"I expected a token of the type {TOKEN_TYPES[code].name} but you gave me {TOKEN_TYPES[token].name} "
+                f"at line {self.tokens.line(index)} and index {self.tokens.column(index)}")
 
         return self.__eat()
 
-    def parse_program(self) -> ProgramNode:
-        statements = self.__parse_statements()
-        if len(statements) == 0:
-            raise ValueError(f"You cannot write a program with a single return statement!")
-        return_statement = self.__parse_program_return()
-        self.__check_program_end()
+    def __line(self, index: int) -> int:
+        return self.tokens.line(index)
 
-        return ProgramNode(statements, return_statement)
+    def __offset(self, index: int) -> int:
+        return self.tokens.offset(index)
 
-    def __parse_statements(self) -> list[StmtNode]:
-        statements = []
+    def __value(self, index: int) -> str:
+        return self.tokens.value(index)
 
-        while True:
-            token = self.__peek()
-            if len(statements) == 0 and token and token.token_type == TokenType.THE_END:
-                raise ValueError("Program cannot be empty! You have to write something before the return statement!")
+    def __name(self, index: int) -> str:
+        return self.tokens.name(index)
 
-            if not token or token.token_type == TokenType.THE_END:
-                if len(statements) > 0:
-                    raise ValueError('Program must end with "# ... expr ... #"!')    
+    def parse_program(self) -> ProgramNode:
+        return self.resume_program([])
+
+    def resume_program(self, statements: list[StmtNode]) -> ProgramNode:
+        return_statement, return_offset = None, 0
+        if self.__parse_statements(statements):
+            line_start = self.current_token_index
+            try:
+                if len(statements) == 0 and not self.diagnostics:
+                    raise ValueError(f"You cannot write a program with a single return statement!")
+                return_statement, return_offset = self.__parse_program_return()
+                line_start = self.current_token_index
+                self.__check_program_end()
+            except ValueError as error:
+                self.__recover(error, statements, line_start)
+
+        return self.builder.program(statements, return_statement, return_offset, self.tokens.line_index)
+
+    def parse_statement_range(self) -> list[StmtNode]:
+        statements = []
+        self.__parse_statements(statements, stop_at_end=True)
+        if self.__peek() != TokenCode.THE_END:
+            raise ValueError("Top-level statement range must end at a statement boundary!")
+        return statements
 
-            self.__define_line_type(token)
-            
-            token = self.__peek()
-            if token.token_type == TokenType.RETURN:
-                break
+    def __parse_statements(self, statements: list[StmtNode], stop_at_end: bool = False) -> bool:
+        blocks = self.open_blocks
 
-            statement = self.__parse_statement()
-            
-            if statement:
-                statements.append(statement)
+        while True:
+            line_start = self.current_token_index
+            try:
+                pending_if = self.pending_if
+                if pending_if is not None:
+                    kind, has_border = self.__classify_line()
+                    if has_border and kind == LineKind.ELIF:
+                        self.__parse_elif_header(pending_if)
+                        continue
+                    if has_border and kind == LineKind.ELSE:
+                        self.__parse_else_header(pending_if)
+                        continue
+                    self.pending_if = None
+                    self.__add_statement(statements, self.__finish_if_statement(pending_if))
+
+                token = self.__peek()
+                if blocks:
+                    block = blocks[-1]
+                    if block.state == BlockState.AWAITING_OPEN:
+                        self.__parse_block_opening(block)
+                        continue
+                    if block.state == BlockState.AWAITING_CLOSE:
+                        self.__close_block(statements)
+                        continue
+                    if token is None:
+                        raise ValueError("Code block must be closed with 🐖🐖🐖!")
+                    if self.__classify_line() == (LineKind.BLOCK_BORDER, True):
+                        self.__close_block(statements)
+                        continue
+                else:
+                    if stop_at_end and token == TokenCode.THE_END:
+                        return True
+
+                    if len(statements) == 0 and token == TokenCode.THE_END:
+                        raise ValueError("Program cannot be empty! You have to write something before the return statement!")
+
+                    if token is None or token == TokenCode.THE_END:
+                        if len(statements) > 0:
+                            raise ValueError('Program must end with "# ... expr ... #"!')
+
+                self.__define_line_type(token)
+
+                if self.__peek() == TokenCode.RETURN:
+                    if not blocks:
+                        return True
+                    block.state = BlockState.AWAITING_CLOSE
+                    block.return_node = self.__parse_return()
+                    self.__expect_line_end()
+                    continue
+
+                self.__add_statement(statements, self.__parse_statement())
+            except ValueError as error:
+                if not self.__recover(error, statements, line_start):
+                    return False
+
+    def __recover(self, error: ValueError, statements: list[StmtNode], line_start: int) -> bool:
+        if not self.recover:
+            raise error
+
+        self.diagnostics.append(Diagnostic("parser", str(error), self.__line(line_start)))
+        if self.partial_declaration is not None:
+            self.__add_statement(statements, self.partial_declaration)
+            self.partial_declaration = None
+        self.in_mood_line = False
 
-        return statements
+        # every token list ends with THE_END, so the scan stops there without knowing the length,
+        # which a token stream does not know before it reaches the end
+        kinds = self.kinds
+        index = line_start
+        while kinds[index] not in EOL_CODES:
+            index += 1
+        if kinds[index] == TokenCode.THE_END:
+            self.current_token_index = index
+            return False
+        self.current_token_index = index + 1
+        return True
+
+    def __add_statement(self, statements: list[StmtNode], statement: Optional[StmtNode]):
+        if statement is not None:
+            (self.open_blocks[-1].statements if self.open_blocks else statements).append(statement)
+
+    def __classify_line(self) -> tuple[int, bool]:
+        token = self.__peek()
+        has_border = token in LINE_START_CODES
+        if has_border:
+            token = self.__peek(1)
+        return LINE_KINDS.get(token, LineKind.OTHER), has_border
 
-    def __parse_program_return(self) -> ReturnNode:
-        self.__expect_token(TokenType.RETURN)
+    def __parse_program_return(self) -> tuple[ExprNode, int]:
+        offset = self.__offset(self.__expect_token(TokenCode.RETURN))
         return_statement = self.__parse_expression()
-        self.__expect_token(TokenType.RETURN)
+        self.__expect_token(TokenCode.RETURN)
         self.__expect_line_end()
-        return return_statement
+        return return_statement, offset
 
     def __check_program_end(self):
-        if self.__peek() and self.__peek().token_type != TokenType.THE_END:
+        token = self.__peek()
+        if token is not None and token != TokenCode.THE_END:
+            index = self.current_token_index
             raise ValueError(f"I did not want you to place this awful content "
-                f"after the return statement at line {self.__peek().line}: {self.__peek().value}!")
+                f"after the return statement at line {self.__line(index)}: {self.__value(index)}!")
 
     def __parse_statement(self) -> Optional[StmtNode]:
         token = self.__peek()
         stmt = None
-        consumes_own_line_end = False
 
-        match token.token_type:
-            case TokenType.MUT | TokenType.CONST:
+        match LINE_KINDS.get(token, LineKind.OTHER):
+            case LineKind.DECLARATION:
                 stmt = self.__parse_declaration()
-            case TokenType.VARIABLE_BORDER:
+            case LineKind.ASSIGNMENT:
                 stmt = self.__parse_assignment()
-            case TokenType.IF:
-                stmt = self.__parse_if_statement()
-                consumes_own_line_end = True
-            case TokenType.WHILE:
-                stmt = self.__parse_while_statement()
-                consumes_own_line_end = True
-            case TokenType.BLOCK_BORDER:
+            case LineKind.IF | LineKind.WHILE:
+                self.__parse_control_header(token)
+                return None
+            case LineKind.BLOCK_BORDER:
                 self.__eat()
             case _:
                 raise ValueError(f"You should have either declared a variable, assigned this cutie to sth, "
-                    f"or used control flow at line {token.line}, but you decided to use "
-                    f"this token: {token.token_type}")
+                    f"or used control flow at line {self.__line(self.current_token_index)}, but you decided to use "
+                    f"this token: {TOKEN_TYPES[token]}")
 
-        if not consumes_own_line_end:
-            self.__expect_line_end()
+        self.__expect_line_end()
         return stmt
     
     def __expect_line_end(self):
-        token = self.__peek()
         if self.in_mood_line:
-            self.__expect_token(TokenType.MOOD_LINE_BORDER_END) 
+            self.__expect_token(TokenCode.MOOD_LINE_BORDER_END) 
             self.in_mood_line = False
         else:
-            self.__expect_token(TokenType.SIMPLE_LINE_BORDER)
+            self.__expect_token(TokenCode.SIMPLE_LINE_BORDER)
         self.__expect_newline_or_end()
 
-    def __define_line_type(self, token: Token):
-        if not token:
+    def __define_line_type(self, token: Optional[int]):
+        if token is None:
             raise ValueError("Why did you decide to abandon your work?! I want a statement!")
         
-        if token and token.token_type == TokenType.MOOD_LINE_BORDER_START:  
+        if token == TokenCode.MOOD_LINE_BORDER_START:  
             self.in_mood_line = True
             self.__eat()
-        elif token and token.token_type == TokenType.SIMPLE_LINE_BORDER:
+        elif token == TokenCode.SIMPLE_LINE_BORDER:
             self.__eat()
 
     def __expect_newline_or_end(self):
         token = self.__peek()
-        if token and token.token_type not in [TokenType.NEWLINE, TokenType.THE_END]:
+        if token is not None and token not in EOL_CODES:
+            index = self.current_token_index
             raise ValueError(
                 f"Each instruction must be on its own line! "
                 f"You were expected to place a newline after the"
-                f" instruction at line {token.line}, but you placed this: {token.value}")
-        if token and token.token_type == TokenType.NEWLINE:
+                f" instruction at line {self.__line(index)}, but you placed this: {self.__value(index)}")
+        if token == TokenCode.NEWLINE:
             self.__eat()
 
     def __parse_declaration(self) -> DeclNode:
-        mutability_token = self.__peek()
-        can_mutate = mutability_token.token_type == TokenType.MUT
+        can_mutate = self.__peek() == TokenCode.MUT
         self.__eat()
 
         var_type = self.__parse_type()
 
-        self.__expect_token(TokenType.VARIABLE_BORDER)
-        token_variable = self.__expect_token(TokenType.VARIABLE)
-        variable = token_variable.value
-        self.__expect_token(TokenType.VARIABLE_BORDER)
+        self.__expect_token(TokenCode.VARIABLE_BORDER)
+        token_variable = self.__expect_token(TokenCode.VARIABLE)
+        variable = self.__name(token_variable)
+        offset = self.__offset(token_variable)
+        self.__expect_token(TokenCode.VARIABLE_BORDER)
 
-        token = self.__peek()
-        if token and token.token_type == TokenType.ASSIGNMENT:
+        if self.recover:
+            self.partial_declaration = self.builder.declaration(
+                variable, self.__set_default_for_type(var_type), offset, can_mutate, var_type)
+
+        if self.__peek() == TokenCode.ASSIGNMENT:
             self.__eat()
             init_expr = self.__parse_expression()
         else:
             init_expr = self.__set_default_for_type(var_type)
 
-        return DeclNode(variable, init_expr, token_variable.line, can_mutate, var_type)
+        self.partial_declaration = None
+        return self.builder.declaration(variable, init_expr, offset, can_mutate, var_type)
 
     def __parse_type(self) -> DataType:
-        token = self.__eat()
-        match token.token_type:
-            case TokenType.I16_TYPE:
+        index = self.__eat()
+        match self.kinds[index] if index is not None else None:
+            case TokenCode.I16_TYPE:
                 return DataType.I16
-            case TokenType.I32_TYPE:
+            case TokenCode.I32_TYPE:
                 return DataType.I32
-            case TokenType.I64_TYPE:
+            case TokenCode.I64_TYPE:
                 return DataType.I64
-            case TokenType.BOOL:
+            case TokenCode.BOOL:
                 return DataType.BOOL
             case _:
-                raise ValueError(f"I expected some type declaration at line {token.line}!")
+                raise ValueError(f"I expected some type declaration at line {self.__line(index)}!")
 
     def __parse_assignment(self) -> AssignNode:
-        self.__expect_token(TokenType.VARIABLE_BORDER)
-        variable_token = self.__expect_token(TokenType.VARIABLE)
-        variable = variable_token.value
-        self.__expect_token(TokenType.VARIABLE_BORDER)
-        self.__expect_token(TokenType.ASSIGNMENT)
+        self.__expect_token(TokenCode.VARIABLE_BORDER)
+        variable_token = self.__expect_token(TokenCode.VARIABLE)
+        variable = self.__name(variable_token)
+        offset = self.__offset(variable_token)
+        self.__expect_token(TokenCode.VARIABLE_BORDER)
+        self.__expect_token(TokenCode.ASSIGNMENT)
         value_expr = self.__parse_expression()
-        return AssignNode(variable, value_expr, variable_token.line)
-
-    def __parse_if_statement(self) -> IfNode:
-        if_token = self.__expect_token(TokenType.IF)
-        if not self.__peek() or self.__peek().token_type in [TokenType.MOOD_LINE_BORDER_END, TokenType.SIMPLE_LINE_BORDER]:
-            raise ValueError(f"If condition missing at line {if_token.line}!")
-
-        condition = self.__parse_expression()
-        
-        if self.in_mood_line:
-            condition = UnaryOpNode(NOT, condition)
-        
-        then_block = self.__parse_code_block()
-        
-        elif_blocks = []
-        while self.__peek_for_elif():
-            elif_blocks.append(self.__parse_elif_block())
-
-        else_block = self.__try_parse_else_block()
+        return self.builder.assignment(variable, value_expr, offset)
+
+    def __parse_control_header(self, keyword: int):
+        owner = OpenStatement()
+        block = self.__open_block(owner, keyword)
+        keyword_token = self.__expect_token(keyword)
+        owner.offset = block.offset = self.__offset(keyword_token)
+        owner.condition = self.__parse_condition(keyword_token)
+        self.__expect_line_end()
+        block.discarded = False
 
-        return IfNode(condition, then_block, elif_blocks, else_block, if_token.line)
+    def __parse_elif_header(self, owner: OpenStatement):
+        self.pending_if = None
+        block = self.__open_block(owner, TokenCode.ELIF)
+        self.__skip_line_start()
+        keyword_token = self.__expect_token(TokenCode.ELIF)
+        block.offset = self.__offset(keyword_token)
+        block.condition = self.__parse_condition(keyword_token)
+        self.__expect_line_end()
+        block.discarded = False
 
-    def __peek_for_elif(self) -> bool:
-        saved_index = self.current_token_index
-        
-        token = self.__peek()
-        if token and token.token_type in [TokenType.SIMPLE_LINE_BORDER, TokenType.MOOD_LINE_BORDER_START]:
-            self.current_token_index += 1
-            token = self.__peek()
-            result = token and token.token_type == TokenType.ELIF
-        else:
-            result = False
-            
-        self.current_token_index = saved_index
-        return result
+    def __parse_else_header(self, owner: OpenStatement):
+        self.pending_if = None
+        block = self.__open_block(owner, TokenCode.ELSE)
+        self.__eat()
+        self.__eat()
+        self.__expect_line_end()
+        block.discarded = False
 
-    def __parse_elif_block(self) -> ElifNode:
-        
-        self.__skip_line_start()
-        elif_token = self.__expect_token(TokenType.ELIF)
-        if not self.__peek() or self.__peek().token_type in [TokenType.MOOD_LINE_BORDER_END, TokenType.SIMPLE_LINE_BORDER]:
-            raise ValueError(f"If condition missing at line {elif_token.line}!")
+    def __parse_condition(self, keyword_token: int) -> ExprNode:
+        if self.__peek() is None or self.__peek() in LINE_END_CODES:
+            raise ValueError(f"If condition missing at line {self.__line(keyword_token)}!")
         condition = self.__parse_expression()
-        
-        if self.in_mood_line:
-            condition = UnaryOpNode(NOT, condition)
-            
-        then_block = self.__parse_code_block()
-        
-        return ElifNode(condition, then_block, elif_token.line)
 
-    def __parse_while_statement(self) -> WhileNode:
-        while_token = self.__expect_token(TokenType.WHILE)
-        if not self.__peek() or self.__peek().token_type in [TokenType.MOOD_LINE_BORDER_END, TokenType.SIMPLE_LINE_BORDER]:
-            raise ValueError(f"If condition missing at line {while_token.line}!")
-        condition = self.__parse_expression()
-        
         if self.in_mood_line:
-            condition = UnaryOpNode(NOT, condition)
-        
-        body = self.__parse_code_block()
+            condition = self.builder.unary(NOT, condition)
 
-        return WhileNode(condition, body, while_token.line)
-
-    def __try_parse_else_block(self) -> Optional[CodeBlockNode]:
-        saved_index = self.current_token_index
-        
-        token = self.__peek()
-        if token and token.token_type in [TokenType.SIMPLE_LINE_BORDER, TokenType.MOOD_LINE_BORDER_START]:
-            self.current_token_index += 1
-            token = self.__peek()
-            if token and token.token_type == TokenType.ELSE:
-                self.__eat()
-                block = self.__parse_code_block()
-                return block
-        
-        self.current_token_index = saved_index
-        return None
+        return condition
 
     def __skip_line_start(self):
         token = self.__peek()
-        if token and token.token_type in [TokenType.SIMPLE_LINE_BORDER, TokenType.MOOD_LINE_BORDER_START]: 
-            if token.token_type == TokenType.MOOD_LINE_BORDER_START: 
+        if token in LINE_START_CODES: 
+            if token == TokenCode.MOOD_LINE_BORDER_START: 
                 self.in_mood_line = True
             self.__eat()
 
-    def __parse_code_block(self) -> CodeBlockNode:
-        
-        self.__expect_line_end()  
+    def __open_block(self, owner: OpenStatement, keyword: int) -> OpenBlock:
+        block = OpenBlock(owner, keyword)
+        self.open_blocks.append(block)
+        self.builder.open_block()
+        if len(self.open_blocks) > self.limits.max_nesting_depth:
+            index = self.current_token_index
+            raise ValueError(f"You nested code blocks deeper than {self.limits.max_nesting_depth} levels "
+                f"at line {self.__line(index)}! Nobody can read that!")
+        return block
+
+    def __parse_block_opening(self, block: OpenBlock):
+        block.state = BlockState.OPEN
         self.__skip_line_start()  
-        self.__expect_token(TokenType.BLOCK_BORDER) 
+        self.__expect_token(TokenCode.BLOCK_BORDER) 
         self.__expect_line_end()
 
-        statements, return_node = self.__parse_block_contents()
-
-        self.__skip_line_start() 
-        self.__expect_token(TokenType.BLOCK_BORDER)  
-        self.__expect_line_end() 
-
+    def __close_block(self, statements: list[StmtNode]):
+        block = self.open_blocks.pop()
         scope_id = self.next_scope_id
         self.next_scope_id += 1
-        return CodeBlockNode(statements, return_node, scope_id)
+        code_block = self.builder.code_block(block.statements, block.return_node, scope_id)
+        self.__add_statement(statements, self.__attach_block(block, code_block))
 
-    def __parse_block_contents(self) -> tuple[list[StmtNode], Optional[ReturnNode]]:
-        statements = []
-        return_node = None
-
-        while True:
-            token = self.__peek()
+        self.__skip_line_start() 
+        self.__expect_token(TokenCode.BLOCK_BORDER)  
+        self.__expect_line_end() 
 
-            if not token:
-                raise ValueError("Code block must be closed with 🐖🐖🐖!")
+    def __attach_block(self, block: OpenBlock, code_block: CodeBlockNode) -> Optional[StmtNode]:
+        owner = block.owner
+        if block.keyword == TokenCode.IF:
+            owner.discarded = block.discarded
+        if block.discarded or owner.discarded:
+            # the body of a statement whose header did not parse is still analyzed on its own
+            if block.keyword != TokenCode.WHILE:
+                self.pending_if = owner
+            return code_block
+
+        match block.keyword:
+            case TokenCode.WHILE:
+                return self.builder.while_loop(owner.condition, code_block, owner.offset)
+            case TokenCode.IF:
+                owner.then_block = code_block
+            case TokenCode.ELIF:
+                owner.elif_blocks.append(self.builder.elif_statement(block.condition, code_block, block.offset))
+            case TokenCode.ELSE:
+                return self.__finish_if_statement(owner, code_block)
+
+        self.pending_if = owner
+        return None
 
-            if token.token_type in [TokenType.SIMPLE_LINE_BORDER, TokenType.MOOD_LINE_BORDER_START]:
-                saved_index = self.current_token_index
-                self.__eat() 
-                next_token = self.__peek()
-                if next_token and next_token.token_type == TokenType.BLOCK_BORDER:
-                    self.current_token_index = saved_index
-                    break
-                self.current_token_index = saved_index
-            
-            self.__define_line_type(token)
-            
-            token = self.__peek()
-            if token.token_type == TokenType.RETURN:
-                return_node = self.__parse_return()
-                self.__expect_line_end()
-                break
-
-            statement = self.__parse_statement()
-            if statement:
-                statements.append(statement)
-
-        return statements, return_node
+    def __finish_if_statement(self, owner: OpenStatement, else_block: Optional[CodeBlockNode] = None) -> Optional[IfNode]:
+        if owner.discarded:
+            return None
+        return self.builder.if_statement(owner.condition, owner.then_block, owner.elif_blocks, else_block, owner.offset)
 
     def __parse_return(self) -> ReturnNode:
-        self.__expect_token(TokenType.RETURN)
+        offset = self.__offset(self.__expect_token(TokenCode.RETURN))
         expr = self.__parse_expression()
-        self.__expect_token(TokenType.RETURN)
-        return ReturnNode(expr)
+        self.__expect_token(TokenCode.RETURN)
+        return self.builder.return_statement(expr, offset)
 
     def __parse_expression(self) -> ExprNode:
-        return self.__parse_logical_or()
-
-    def __parse_logical_or(self) -> ExprNode:
-        left = self.__parse_logical_and()
-        
-        while self.__peek() and self.__peek().token_type == TokenType.OR:
-            self.__eat()
-            right = self.__parse_logical_and()
-            left = BinaryOpNode(left, Operator.OR, right)
-        
-        return left
-
-    def __parse_logical_and(self) -> ExprNode:
-        left = self.__parse_comparison()
-        
-        while self.__peek() and self.__peek().token_type == TokenType.AND:
-            self.__eat()
-            right = self.__parse_comparison()
-            left = BinaryOpNode(left, Operator.AND, right)
-        
-        return left
-
-    def __parse_comparison(self) -> ExprNode:
-        left = self.__parse_additive()
-        
-        token = self.__peek()
-        if token and token.token_type.if_for_comparision():
-            op_token = self.__eat()
-            operator = Operator.from_string(op_token.value)
-            
-            if self.in_mood_line:
-                operator = operator.invert()
-            
-            right = self.__parse_additive()
-            left = BinaryOpNode(left, operator, right)
-        
-        return left
+        operators = MOOD_BINARY_OPERATORS if self.in_mood_line else BINARY_OPERATORS
+        frames = [ExpressionFrame(LOGICAL_OR)]
+        start = self.current_token_index
+        max_length = self.limits.max_expression_length
 
-    def __parse_additive(self) -> ExprNode:
-        left = self.__parse_multiplicative()
-        
-        while True:
-            token = self.__peek()
-            if not token or not token.token_type.is_additive_operator():
-                break
-            
-            op_token = self.__eat()
-            operator = Operator.from_string(op_token.value)
-            
-            if self.in_mood_line:
-                operator = operator.invert()
-            
-            right = self.__parse_multiplicative()
-            left = BinaryOpNode(left, operator, right)
-        
-        return left
-
-    def __parse_multiplicative(self) -> ExprNode:
-        left = self.__parse_unary()
-        
         while True:
-            token = self.__peek()
-            if not token or not token.token_type.is_multiplicative_operator():
-                break
-            
-            op_token = self.__eat()
-            operator = Operator.from_string(op_token.value)
-            
-            if self.in_mood_line:
-                operator = operator.invert()
-            
-            right = self.__parse_unary()
-            left = BinaryOpNode(left, operator, right)
-        
-        return left
-
-    def __parse_unary(self) -> Union[FactorNode, UnaryOpNode]:
-        token = self.__peek()
+            negations = self.__count_negations()
+            if self.current_token_index - start > max_length:
+                raise ValueError(f"The expression at line {self.__line(start)} is longer than {max_length} tokens! "
+                    f"Split it up!")
+            if self.__peek() == TokenCode.BRACKET:
+                self.__eat()
+                frames.append(ExpressionFrame(LOGICAL_OR, negations))
+                continue
+            operand = self.__negate(self.__parse_value(), negations)
+            binds_tighter = True
+
+            while True:
+                frame = frames[-1]
+                entry = operators.get(self.__peek())
+                if frame.operator is None:
+                    frame.left = operand
+                elif binds_tighter and entry is not None and entry[0] > frame.precedence:
+                    frame = ExpressionFrame(frame.precedence + 1)
+                    frame.left = operand
+                    frames.append(frame)
+                else:
+                    frame.left = self.builder.binary(frame.left, frame.operator, operand)
+                    frame.ceiling = frame.next_ceiling
+                    frame.operator = None
+
+                if entry is not None and frame.min_precedence <= entry[0] <= frame.ceiling:
+                    self.__eat()
+                    frame.precedence, frame.next_ceiling, frame.operator = entry
+                    break
 
-        if token and token.token_type == TokenType.NOT:
+                frames.pop()
+                operand = frame.left
+                binds_tighter = frame.negations is not None
+                if binds_tighter:
+                    self.__expect_token(TokenCode.BRACKET)
+                    operand = self.__negate(operand, frame.negations)
+                if not frames:
+                    return operand
+
+    def __count_negations(self) -> int:
+        negations = 0
+        while self.__peek() == TokenCode.NOT:
             self.__eat()
-            operand = self.__parse_unary()
-            return UnaryOpNode(NOT, operand)
+            negations += 1
+        return negations
 
-        return self.__parse_value()
+    def __negate(self, operand: ExprNode, negations: int) -> ExprNode:
+        for _ in range(negations):
+            operand = self.builder.unary(NOT, operand)
+        return operand
 
     def __parse_value(self) -> Union[FactorNode, ExprNode]:
         token = self.__eat()
 
-        if not token:
+        if token is None:
             raise ValueError(
                 "You should have used either a number, a variable, or a boolean, "
                 "but you decided to abandon your work!")
 
-        match token.token_type:
-            case TokenType.NUMBER:
-                return NumberNode(token.value)
-            case TokenType.VARIABLE_BORDER:
-                var_token = self.__expect_token(TokenType.VARIABLE)
-                self.__expect_token(TokenType.VARIABLE_BORDER)
-                return IDNode(var_token.value, var_token.line)
-            case TokenType.TRUE | TokenType.FALSE:
-                value = token.value
+        match self.kinds[token]:
+            case TokenCode.NUMBER:
+                return self.builder.number(self.__value(token))
+            case TokenCode.VARIABLE_BORDER:
+                var_token = self.__expect_token(TokenCode.VARIABLE)
+                self.__expect_token(TokenCode.VARIABLE_BORDER)
+                return self.builder.identifier(self.__name(var_token))
+            case TokenCode.TRUE | TokenCode.FALSE:
+                value = self.__value(token)
                 if self.in_mood_line:
                     value = FALSE if value == TRUE else TRUE
-                return BooleanNode(value)
-            case TokenType.BRACKET:
-                expr = self.__parse_expression()
-                self.__expect_token(TokenType.BRACKET) 
-                return expr
+                return self.builder.boolean(value)
             case _:
                 raise ValueError(
                     f"You should have used either a number, a variable, or a boolean "
-                    f"at line {token.line}, not {token.value}!")
+                    f"at line {self.__line(token)}, not {self.__value(token)}!")
 
-    @staticmethod
-    def __set_default_for_type(data_type: DataType) -> FactorNode:
+    def __set_default_for_type(self, data_type: DataType) -> FactorNode:
         if data_type == DataType.BOOL:
-            return BooleanNode(FALSE)
+            return self.builder.boolean(FALSE)
         elif data_type in [DataType.I16, DataType.I32, DataType.I64]:
-            return NumberNode("0")
+            return self.builder.number("0")
         else:
             raise ValueError(f"No default value defined for {data_type}")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+from bisect import bisect_right
+from mmap import mmap
+from typing import Optional, Union
+from ..lexer.lexer_constants import NEWLINE
+
+
+class LineIndex:
+    def __init__(self, source: Union[str, bytes, mmap], first_line: int = 1):
+        self.source = source
+        self.first_line = first_line
+        self.is_utf8 = not isinstance(source, str)
+        self.newline = NEWLINE.encode() if self.is_utf8 else NEWLINE
+        self.line_starts: Optional[list[int]] = None
+
+    def __build_line_starts(self) -> list[int]:
+        line_starts = [0]
+        position = self.source.find(self.newline)
+        while position != -1:
+            line_starts.append(position + 1)
+            position = self.source.find(self.newline, position + 1)
+        return line_starts
+
+    def position(self, offset: int) -> tuple[int, int]:
+        if self.line_starts is None:
+            self.line_starts = self.__build_line_starts()
+        line = bisect_right(self.line_starts, offset)
+        line_start = self.line_starts[line - 1]
+        line += self.first_line - 1
+        if self.is_utf8:
+            return line, len(self.source[line_start:offset].decode('utf-8', 'replace')) + 1
+        return line, offset - line_start + 1
+
+    def line(self, offset: int) -> int:
+        return self.position(offset)[0]
+
+    def column(self, offset: int) -> int:
+        return self.position(offset)[1]
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+from array import array
+from mmap import mmap
+from sys import intern
+from typing import Iterator, Union
+from .line_index import LineIndex
+from .token_class import Token
+from .token_code import TOKEN_TYPES
+from .token_type import TokenType
+
+
+class TokenBuffer:
+    def __init__(self, source: Union[str, bytes, mmap], line_index: LineIndex, base: int = 0):
+        self.source = source
+        # where the source starts in the whole program, when it is only a part of it
+        self.base = base
+        self.is_utf8 = not isinstance(source, str)
+        self.line_index = line_index
+        self.kinds = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+
+    def append(self, token_type: TokenType, start: int, end: int):
+        self.kinds.append(token_type.value)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def token_type(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self.kinds[index]]
+
+    def value(self, index: int) -> str:
+        value = self.source[self.starts[index]:self.ends[index]]
+        return value.decode('utf-8') if self.is_utf8 else value
+
+    def name(self, index: int) -> str:
+        return intern(self.value(index))
+
+    def line(self, index: int) -> int:
+        return self.line_index.line(self.starts[index])
+
+    def column(self, index: int) -> int:
+        return self.line_index.column(self.starts[index])
+
+    def offset(self, index: int) -> int:
+        return self.base + self.starts[index]
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> Token:
+        if index < 0:
+            index += len(self.kinds)
+        return Token(self.token_type(index), self.value(index), self.starts[index], self.line_index)
+
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self.kinds)):
+            yield self[index]
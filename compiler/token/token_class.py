@@ -1,17 +1,27 @@
 #!/usr/bin/env python3
+from typing import Optional
+from .line_index import LineIndex
 from .token_type import TokenType
 
 
 class Token:
-    def __init__(self, token_type: TokenType, value: str, line=0, index=0):
+    def __init__(self, token_type: TokenType, value: str, offset: int = 0, line_index: Optional[LineIndex] = None):
         self.token_type = token_type
         self.value = value
-        self.line = line
-        self.index = index
+        self.offset = offset
+        self.line_index = line_index
+
+    @property
+    def line(self) -> int:
+        return self.line_index.line(self.offset) if self.line_index else 0
+
+    @property
+    def index(self) -> int:
+        return self.line_index.column(self.offset) if self.line_index else 0
 
     def __repr__(self):
         return f"Token({self.token_type.name}, '{self.value}', line={self.line}, col={self.index})"
 
     def __str__(self):
         return (f"Token of the type {self.token_type.name} with the value '{self.value}. "
-                f"Located on the line {self.line} and column {self.index}'")
\ No newline at end of file
+                f"Located on the line {self.line} and column {self.index}'")
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+from .token_type import TokenType
+
+
+class TokenCode:
+    pass
+
+
+for token_type in TokenType:
+    setattr(TokenCode, token_type.name, token_type.value)
+
+TOKEN_TYPES = {token_type.value: token_type for token_type in TokenType}
+
+LINE_START_CODES = frozenset({TokenCode.SIMPLE_LINE_BORDER, TokenCode.MOOD_LINE_BORDER_START})
+LINE_END_CODES = frozenset({TokenCode.SIMPLE_LINE_BORDER, TokenCode.MOOD_LINE_BORDER_END})
+EOL_CODES = frozenset({TokenCode.NEWLINE, TokenCode.THE_END})
+COMPARISON_CODES = frozenset(t.value for t in TokenType if t.if_for_comparision())
+ADDITIVE_CODES = frozenset(t.value for t in TokenType if t.is_additive_operator())
+MULTIPLICATIVE_CODES = frozenset(t.value for t in TokenType if t.is_multiplicative_operator())
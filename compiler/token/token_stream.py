@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+from typing import Iterator
+from .token_buffer import TokenBuffer
+from .token_class import Token
+from .token_type import TokenType
+
+LOOKBEHIND = 4
+
+
+class TokenWindow:
+    def __init__(self, stream: 'TokenStream'):
+        self.stream = stream
+        self.kinds = stream.buffer.kinds
+
+    def __getitem__(self, index: int) -> int:
+        local_index = index - self.stream.first_index
+        if 0 <= local_index < len(self.kinds):
+            return self.kinds[local_index]
+        return self.stream.kind(index)
+
+
+class TokenStream:
+    def __init__(self, buffer: TokenBuffer, lines: Iterator[None], lookbehind: int = LOOKBEHIND):
+        self.buffer = buffer
+        self.line_index = buffer.line_index
+        self.lines = lines
+        self.lookbehind = lookbehind
+        self.first_index = 0
+        self.kinds = TokenWindow(self)
+
+    def __pull_line(self) -> bool:
+        discarded = len(self.buffer.kinds) - self.lookbehind
+        if discarded > 0:
+            del self.buffer.kinds[:discarded]
+            del self.buffer.starts[:discarded]
+            del self.buffer.ends[:discarded]
+            self.first_index += discarded
+        return next(self.lines, StopIteration) is not StopIteration
+
+    def __local_index(self, index: int) -> int:
+        while index - self.first_index >= len(self.buffer.kinds):
+            if not self.__pull_line():
+                raise IndexError(f"Token {index} is past the end of the stream")
+        if index < self.first_index:
+            raise IndexError(f"Token {index} has already left the lookahead window")
+        return index - self.first_index
+
+    def kind(self, index: int) -> int:
+        return self.buffer.kinds[self.__local_index(index)]
+
+    def token_type(self, index: int) -> TokenType:
+        return self.buffer.token_type(self.__local_index(index))
+
+    def value(self, index: int) -> str:
+        return self.buffer.value(self.__local_index(index))
+
+    def name(self, index: int) -> str:
+        return self.buffer.name(self.__local_index(index))
+
+    def line(self, index: int) -> int:
+        return self.buffer.line(self.__local_index(index))
+
+    def column(self, index: int) -> int:
+        return self.buffer.column(self.__local_index(index))
+
+    def offset(self, index: int) -> int:
+        return self.buffer.offset(self.__local_index(index))
+
+    def __iter__(self) -> Iterator[Token]:
+        index = self.first_index
+        while True:
+            try:
+                local_index = self.__local_index(index)
+            except IndexError:
+                return
+            yield self.buffer[local_index]
+            index += 1
@@ -57,23 +57,31 @@ class TokenType(Enum):
     MULTILINE_COMMENT = auto() # 👀👀👀
 
     def if_for_comparision(self) -> bool:
-        return self in {TokenType.EQUALS, TokenType.NOT_EQUALS, TokenType.GREATER,
-                        TokenType.LESS, TokenType.GREATER_EQUAL, TokenType.LESS_EQUAL}
+        return self in COMPARISON_TYPES
     
     def is_arithmetic_operator(self) -> bool:
-        return self in {TokenType.PLUS, TokenType.MINUS, TokenType.MULTIPLY, TokenType.DIVIDE}
+        return self in ARITHMETIC_TYPES
     
     def is_logical_operator(self) -> bool:
-        return self in {TokenType.AND, TokenType.OR}
+        return self in LOGICAL_TYPES
     
     def is_additive_operator(self) -> bool:
-        return self in {TokenType.PLUS, TokenType.MINUS}
+        return self in ADDITIVE_TYPES
     
     def is_multiplicative_operator(self) -> bool:
-        return self in {TokenType.MULTIPLY, TokenType.DIVIDE}
+        return self in MULTIPLICATIVE_TYPES
     
     def is_border(self) -> bool:
-        return self in {TokenType.BLOCK_BORDER, 
-                        TokenType.SIMPLE_LINE_BORDER, 
-                        TokenType.MOOD_LINE_BORDER_START,
-                        TokenType.MOOD_LINE_BORDER_END}  # ✅ ADDED THIS LINE
\ No newline at end of file
+        return self in BORDER_TYPES
+
+
+COMPARISON_TYPES = frozenset({TokenType.EQUALS, TokenType.NOT_EQUALS, TokenType.GREATER,
+                              TokenType.LESS, TokenType.GREATER_EQUAL, TokenType.LESS_EQUAL})
+ADDITIVE_TYPES = frozenset({TokenType.PLUS, TokenType.MINUS})
+MULTIPLICATIVE_TYPES = frozenset({TokenType.MULTIPLY, TokenType.DIVIDE})
+ARITHMETIC_TYPES = ADDITIVE_TYPES | MULTIPLICATIVE_TYPES
+LOGICAL_TYPES = frozenset({TokenType.AND, TokenType.OR})
+BORDER_TYPES = frozenset({TokenType.BLOCK_BORDER,
+                          TokenType.SIMPLE_LINE_BORDER,
+                          TokenType.MOOD_LINE_BORDER_START,
+                          TokenType.MOOD_LINE_BORDER_END})
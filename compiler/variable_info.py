@@ -1,7 +1,14 @@
 #!/usr/bin/env python3
 from .llvm_specifics.data_type import DataType
 
+# the slot of a variable reference that the semantic analyzer has not resolved
+NO_SLOT = -1
+
+
 class VariableInfo:
-    def __init__(self, data_type: DataType, mutable: bool):
+    __slots__ = ('data_type', 'mutable', 'slot')
+
+    def __init__(self, data_type: DataType, mutable: bool, slot: int = NO_SLOT):
         self.data_type = data_type
-        self.mutable = mutable
\ No newline at end of file
+        self.mutable = mutable
+        self.slot = slot
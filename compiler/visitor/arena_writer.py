@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+from .ast_visitor import ASTVisitor
+from ..node.ast_arena import ASTArena, ArenaBuilder
+from ..node.assign_node import AssignNode
+from ..node.binary_op_node import BinaryOpNode
+from ..node.bool_node import BooleanNode
+from ..node.code_block_node import CodeBlockNode
+from ..node.decl_node import DeclNode
+from ..node.elif_node import ElifNode
+from ..node.id_node import IDNode
+from ..node.if_node import IfNode
+from ..node.number_node import NumberNode
+from ..node.program_node import ProgramNode
+from ..node.return_node import ReturnNode
+from ..node.unary_op_node import UnaryOpNode
+from ..node.while_node import WhileNode
+
+
+# copies an object AST, including the data types and slots set by the semantic analyzer, into a flat arena
+class ArenaWriter(ASTVisitor):
+    def __init__(self):
+        self.builder = ArenaBuilder()
+        # nodes shared by a hash-consing parser stay shared in the arena
+        self.shared_results = {}
+
+    def write(self, node: ProgramNode) -> ASTArena:
+        self.visit(node)
+        return self.builder.arena
+
+    def __visit_all(self, nodes: list):
+        indexes = []
+        for node in nodes:
+            indexes.append((yield node))
+        return indexes
+
+    def visit_program(self, node: ProgramNode) -> int:
+        statements = yield from self.__visit_all(node.statement_nodes)
+        return_node = (yield node.return_node) if node.return_node else None
+        return self.builder.program(statements, return_node, node.offset)
+
+    def visit_declaration(self, node: DeclNode) -> int:
+        expr = yield node.expr_node
+        return self.builder.declaration(node.variable, expr, node.offset, node.mutable, node.data_type, node.slot)
+
+    def visit_assign(self, node: AssignNode) -> int:
+        expr = yield node.expr_node
+        return self.builder.assignment(node.variable, expr, node.offset, node.slot)
+
+    def visit_return(self, node: ReturnNode) -> int:
+        return self.builder.return_statement((yield node.expr_node), node.offset)
+
+    def visit_binary_operation(self, node: BinaryOpNode) -> int:
+        left = yield node.left
+        right = yield node.right
+        return self.builder.binary(left, node.operator, right, node.data_type)
+
+    def visit_unary_operation(self, node: UnaryOpNode) -> int:
+        return self.builder.unary(node.operator, (yield node.operand))
+
+    def visit_id(self, node: IDNode) -> int:
+        return self.builder.identifier(node.value, node.slot, node.data_type)
+
+    def visit_number(self, node: NumberNode) -> int:
+        return self.builder.number(node.value)
+
+    def visit_boolean(self, node: BooleanNode) -> int:
+        return self.builder.boolean(node.value)
+
+    def visit_if_statement(self, node: IfNode) -> int:
+        condition = yield node.condition
+        then_block = yield node.block
+        elif_blocks = yield from self.__visit_all(node.elif_blocks)
+        else_block = (yield node.else_block) if node.else_block else None
+        return self.builder.if_statement(condition, then_block, elif_blocks, else_block, node.offset)
+
+    def visit_elif_statement(self, node: ElifNode) -> int:
+        condition = yield node.condition
+        block = yield node.block
+        return self.builder.elif_statement(condition, block, node.offset)
+
+    def visit_while_loop(self, node: WhileNode) -> int:
+        condition = yield node.condition
+        body = yield node.block
+        return self.builder.while_loop(condition, body, node.offset)
+
+    def visit_code_block(self, node: CodeBlockNode) -> int:
+        statements = yield from self.__visit_all(node.statements)
+        return_node = (yield node.return_node) if node.return_node else None
+        return self.builder.code_block(statements, return_node, node.scope_id)
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 from abc import ABC, abstractmethod
+from types import GeneratorType
+from typing import Optional
 
+from ..node.ast_node import ASTNode
+from ..node.node_kind import NodeKind
 from ..node.assign_node import AssignNode
 from ..node.binary_op_node import BinaryOpNode
 from ..node.bool_node import BooleanNode
@@ -15,8 +19,84 @@ from ..node.program_node import ProgramNode
 from ..node.return_node import ReturnNode
 from ..node.unary_op_node import UnaryOpNode
 
+VISIT_METHODS = {
+    NodeKind.PROGRAM: "visit_program",
+    NodeKind.DECLARATION: "visit_declaration",
+    NodeKind.ASSIGNMENT: "visit_assign",
+    NodeKind.IF: "visit_if_statement",
+    NodeKind.ELIF: "visit_elif_statement",
+    NodeKind.WHILE: "visit_while_loop",
+    NodeKind.CODE_BLOCK: "visit_code_block",
+    NodeKind.RETURN: "visit_return",
+    NodeKind.BINARY: "visit_binary_operation",
+    NodeKind.UNARY: "visit_unary_operation",
+    NodeKind.IDENTIFIER: "visit_id",
+    NodeKind.NUMBER: "visit_number",
+    NodeKind.BOOLEAN: "visit_boolean",
+}
+
 
 class ASTVisitor(ABC):
+    # maps nodes that the parser may have shared to their finished results, so each is visited once
+    shared_results: Optional[dict] = None
+    # the visit method of every node kind, so visiting a node is one list lookup instead of accept()
+    dispatch_table: list = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatch_table = [getattr(cls, VISIT_METHODS[kind]) if kind in VISIT_METHODS else None
+                              for kind in range(max(VISIT_METHODS) + 1)]
+
+    def visit(self, node: ASTNode):
+        dispatch_table = self.dispatch_table
+        pending = [dispatch_table[node.kind](self, node)]
+        if type(pending[0]) is not GeneratorType:
+            return pending[0]
+
+        shared_results = self.shared_results
+        nodes = [node]
+        result = None
+        while pending:
+            child = None
+            try:
+                child = pending[-1].send(result)
+                if shared_results is not None and child in shared_results:
+                    result = shared_results[child]
+                    continue
+                result = dispatch_table[child.kind](self, child)
+            except StopIteration as finished:
+                pending.pop()
+                result = finished.value
+                if shared_results is not None:
+                    shared_results[nodes[-1]] = result
+                nodes.pop()
+                continue
+            except ValueError as error:
+                self.__unwind(error, pending, nodes, child)
+                result = None
+                continue
+
+            if type(result) is GeneratorType:
+                pending.append(result)
+                nodes.append(child)
+                result = None
+
+        return result
+
+    def __unwind(self, error: ValueError, pending: list, nodes: list[ASTNode], failed: Optional[ASTNode]):
+        while nodes and not self.resumes_after_error(nodes[-1]):
+            failed = nodes.pop()
+            pending.pop()
+        if not nodes:
+            raise error
+        self.report(error, failed)
+
+    def resumes_after_error(self, node: ASTNode) -> bool:
+        return False
+
+    def report(self, error: ValueError, node: Optional[ASTNode]):
+        raise error
+
     @abstractmethod
     def visit_program(self, node: ProgramNode):
         pass
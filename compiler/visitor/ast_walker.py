@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+from ..node.ast_node import ASTNode
+from ..node.node_kind import NodeKind
+from .ast_visitor import VISIT_METHODS
+
+# the children of every node kind in evaluation order; a missing return or else block is None
+CHILDREN = [None] * (max(VISIT_METHODS) + 1)
+CHILDREN[NodeKind.PROGRAM] = lambda node: [*node.statement_nodes, node.return_node]
+CHILDREN[NodeKind.DECLARATION] = lambda node: [node.expr_node]
+CHILDREN[NodeKind.ASSIGNMENT] = lambda node: [node.expr_node]
+CHILDREN[NodeKind.IF] = lambda node: [node.condition, node.block, *node.elif_blocks, node.else_block]
+CHILDREN[NodeKind.ELIF] = lambda node: [node.condition, node.block]
+CHILDREN[NodeKind.WHILE] = lambda node: [node.condition, node.block]
+CHILDREN[NodeKind.CODE_BLOCK] = lambda node: [*node.statements, node.return_node]
+CHILDREN[NodeKind.RETURN] = lambda node: [node.expr_node]
+CHILDREN[NodeKind.BINARY] = lambda node: [node.left, node.right]
+CHILDREN[NodeKind.UNARY] = lambda node: [node.operand]
+CHILDREN[NodeKind.IDENTIFIER] = CHILDREN[NodeKind.NUMBER] = CHILDREN[NodeKind.BOOLEAN] = lambda node: []
+
+# marks that the node below it on the stack has had all of its children walked
+LEAVE = object()
+
+
+# Walks the whole tree without recursion and calls the enter_<kind> and leave_<kind> hooks that a
+# subclass defines, e.g. enter_binary_operation or leave_code_block; every other kind is only passed
+# through. An enter hook that returns False skips the children and the leave hook of its node.
+class ASTWalker:
+    enter_table: list = []
+    leave_table: list = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        names = [VISIT_METHODS.get(kind, "").removeprefix("visit_") for kind in range(len(CHILDREN))]
+        cls.enter_table = [getattr(cls, f"enter_{name}", None) if name else None for name in names]
+        cls.leave_table = [getattr(cls, f"leave_{name}", None) if name else None for name in names]
+
+    def walk(self, root: ASTNode):
+        enter_table, leave_table = self.enter_table, self.leave_table
+        pending = [root]
+        while pending:
+            node = pending.pop()
+            if node is LEAVE:
+                node = pending.pop()
+                leave_table[node.kind](self, node)
+                continue
+
+            kind = node.kind
+            enter = enter_table[kind]
+            if enter is not None and enter(self, node) is False:
+                continue
+            if leave_table[kind] is not None:
+                pending.append(node)
+                pending.append(LEAVE)
+            pending.extend(child for child in reversed(CHILDREN[kind](node)) if child is not None)
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
+import io
+from typing import Optional, TextIO
 from ..llvm_specifics.boolean import Boolean
 from ..llvm_specifics.data_type import DataType
 from .ast_visitor import ASTVisitor
 from ..node.code_block_node import CodeBlockNode
+from ..node.condition_node import ConditionNode
 from ..node.id_node import IDNode
 from ..node.if_node import IfNode
 from ..node.elif_node import ElifNode
@@ -10,162 +13,222 @@ from ..node.while_node import WhileNode
 from ..node.number_node import NumberNode
 from ..node.bool_node import BooleanNode
 from ..node.binary_op_node import BinaryOpNode
-from ..constants import I32_MAX, I32_MIN
+from ..limits import CompilerLimits, NO_LIMITS
 from ..node.unary_op_node import UnaryOpNode
 from ..constants import NOT
-from ..node.factor_node import FactorNode
 from ..node.expr_node import ExprNode
 from ..node.program_node import ProgramNode
 from ..node.decl_node import DeclNode
 from ..node.assign_node import AssignNode
 from ..node.return_node import ReturnNode
+from ..node.node_kind import NodeKind
+from ..token.line_index import LineIndex
+from ..variable_info import NO_SLOT
+from ..ir.basic_block import BasicBlock
+from ..ir.function import Function
+from ..ir.instruction import (Alloca, BinaryInstruction, Branch, CastInstruction, ConditionalBranch, Instruction,
+                              Load, Phi, PrintResult, Return, Store, UNDEF, Value, resolve, trivial_value, value_name)
+from ..ir.ir_printer import IRPrinter
+
+# The blocks are written out in chunks of about this many lines between the top-level statements. Small chunks
+# free the instructions before the garbage collector moves them to its oldest generation, which it then
+# scans along with the whole AST.
+FLUSH_LINES = 1 << 10
+TEMP_PREFIX = "%_temp_"
 
 class CodeGenerator(ASTVisitor):
 
-    def __init__(self):
-        self.variable_versions: dict[str, int] = {}
-        self.variable_types: dict[str, DataType] = {}
-        self.translated_lines: list[str] = []
+    # Writes the LLVM IR to the output as it goes, or returns it from visit() without an output.
+    def __init__(self, limits: CompilerLimits = NO_LIMITS, shared_expressions: bool = False,
+                 stack_variables: bool = False, output: Optional[TextIO] = None, propagate_copies: bool = False):
+        self.limits = limits
+        self.output = output
+        # indexed by the variable slots that the semantic analyzer resolved, -1 before the first register
+        self.variable_versions: list[int] = []
+        self.variable_types: list[Optional[DataType]] = []
+        self.variable_names: list[Optional[str]] = []
+        self.function: Optional[Function] = None
+        # the labels and instructions so far, without the phis and allocas, and how many of them were written out
+        self.line_count = 0
+        self.written_lines = 0
         self.temp_counter = 0
         self.label_counter = 0
-
-    @staticmethod
-    def get_print_function_llvm() -> str:
-        return """declare i32 @printf(i8*, ...)
-
-@exit_format = private unnamed_addr constant [29 x i8] c"Program exit with result %d\\0A\\00", align 1
-
-define void @printResult(i32 %val) {
-  %fmt_ptr = getelementptr inbounds [29 x i8], [29 x i8]* @exit_format, i32 0, i32 0
-  call i32 (i8*, ...) @printf(i8* %fmt_ptr, i32 %val)
-  ret void
-}
-"""
-
-    def visit_program(self, node: ProgramNode) -> str:
-        self.translated_lines = []
+        self.shared_results = {} if shared_expressions else None
+        # keep every variable in an alloca and leave the phis to LLVM's mem2reg pass
+        self.stack_variables = stack_variables
+        # bind the variables to the values assigned to them instead of copying those into new registers
+        self.propagate_copies = propagate_copies
+        # slot-indexed alloca of every stack variable
+        self.pointers: list[Optional[Alloca]] = []
+        self.current_block: Optional[BasicBlock] = None
+        self.top_level_slots: list[int] = []
+        # slot-indexed number of the last write of every variable
+        self.last_writes: list[int] = []
+        self.write_count = 0
+        self.lines: Optional[LineIndex] = None
+
+    def visit_program(self, node: ProgramNode) -> Optional[str]:
+        self.lines = node.lines
+        output = self.output if self.output is not None else io.StringIO()
+        printer = IRPrinter(output)
+        self.function = Function("main", DataType.I32)
+        printer.write_prelude()
+        printer.begin_function(self.function)
+        self.__start_block(BasicBlock("entry"), [])
 
         for stmt in node.statement_nodes:
-            stmt.accept(self)
-
-        node.return_node.accept(self)
-
-        return "\n".join([
-            self.get_print_function_llvm(),
-            "define i32 @main() {",
-            *self.translated_lines,
-            "}"])
+            yield stmt
+            if stmt.kind == NodeKind.DECLARATION:
+                self.top_level_slots.append(stmt.slot)
+            # the allocas come first in the entry block, so the stack variables are only written out at the end.
+            # A flush reads every top-level variable, so it waits for at least as many lines.
+            pending_lines = self.line_count - self.written_lines
+            if pending_lines >= FLUSH_LINES and pending_lines >= len(self.top_level_slots) \
+                    and not self.stack_variables:
+                self.__flush_settled_blocks(printer)
+
+        value = yield from self._visit_program_return(node)
+        self._emit_return(node.return_node, value)
+
+        self.__flush(printer)
+        printer.end_function()
+        return output.getvalue() if self.output is None else None
+
+    # The _emit methods take the values of the already visited children, so that FusedCodeGenerator
+    # can check the types in between.
 
     def visit_declaration(self, node: DeclNode):
-        llvm_type = node.data_type.to_llvm()
-        value = node.expr_node.accept(self)
-        reg = self.__get_variable_register(node.variable)
+        value = yield node.expr_node
+        self._emit_declaration(node, value)
+
+    def _emit_declaration(self, node: DeclNode, value: Value):
+        self.__reserve_slot(node)
+        reg = self.__get_variable_register(node.variable, node.slot)
 
-        self.variable_types[node.variable] = node.data_type
+        self.variable_types[node.slot] = node.data_type
 
         expr_type = self.__get_node_type(node.expr_node)
         
         value = self.__promote_type(value, expr_type, node.data_type)
 
-        self.translated_lines.append(f"  {reg} = add {llvm_type} 0, {value}")
+        if self.stack_variables:
+            pointer = self.pointers[node.slot] = Alloca(reg, node.data_type)
+            self.function.allocas.append(pointer)
+            self.__emit(Store(node.data_type, value, pointer))
+        else:
+            self.__assign_variable(node.slot, reg, node.data_type, value)
 
     def visit_assign(self, node: AssignNode):
-        var_type = self.variable_types[node.variable]
-        llvm_type = var_type.to_llvm()
-        value = node.expr_node.accept(self)
-        reg = self.__get_variable_register(node.variable)
+        value = yield node.expr_node
+        self._emit_assignment(node, value)
+
+    def _emit_assignment(self, node: AssignNode, value: Value):
+        var_type = self.variable_types[node.slot]
         expr_type = self.__get_node_type(node.expr_node)
-        
+
+        if self.stack_variables:
+            value = self.__promote_type(value, expr_type, var_type)
+            self.__emit(Store(var_type, value, self.pointers[node.slot]))
+            return
+
+        reg = self.__get_variable_register(node.variable, node.slot)
         value = self.__promote_type(value, expr_type, var_type)
 
-        self.translated_lines.append(f"  {reg} = add {llvm_type} 0, {value}")
+        self.__assign_variable(node.slot, reg, var_type, value)
+
+    # Without copy propagation the value is copied into the variable's register. With it, the variable holds
+    # the value itself, and the register name only goes to the instruction that was emitted for this value.
+    def __assign_variable(self, slot: int, reg: str, data_type: DataType, value: Value):
+        if not self.propagate_copies:
+            value = self.__emit(BinaryInstruction(reg, "add", data_type, "0", value))
+        else:
+            instructions = self.current_block.instructions
+            if instructions and instructions[-1] is value and value.name.startswith(TEMP_PREFIX):
+                value.name = reg
+        self.__write_variable(slot, value)
 
     def visit_return(self, node: ReturnNode):
-        value = node.expr_node.accept(self)
-        return_type = self.__get_node_type(node.expr_node)
+        value = yield node.expr_node
+        self._emit_return(node.expr_node, value)
+
+    def _emit_return(self, expr_node: ExprNode, value: Value):
+        return_type = self.__get_node_type(expr_node)
         cast_reg = self.__get_temp_register()
-        llvm_type_return = return_type.to_llvm()
 
         match return_type:
             case DataType.BOOL:
-                self.translated_lines.append(f"  {cast_reg} = zext {llvm_type_return} {value} to i32")
+                value = self.__emit(CastInstruction(cast_reg, "zext", value, return_type, DataType.I32))
             case DataType.I64:
-                self.translated_lines.append(f"  {cast_reg} = trunc {llvm_type_return} {value} to i32")
+                value = self.__emit(CastInstruction(cast_reg, "trunc", value, return_type, DataType.I32))
             case DataType.I16:
-                self.translated_lines.append(f"  {cast_reg} = sext {llvm_type_return} {value} to i32")
-            case DataType.I32:
-                cast_reg = value
-        
-        value = cast_reg
+                value = self.__emit(CastInstruction(cast_reg, "sext", value, return_type, DataType.I32))
 
-        self.translated_lines.append(f"  call void @printResult(i32 {value})")
-        self.translated_lines.append(f"  ret i32 {value}")
+        self.__emit(PrintResult(value))
+        self.__emit(Return(DataType.I32, value))
 
-    def visit_binary_operation(self, node: BinaryOpNode) -> str:
-        left_value = node.left.accept(self)
-        right_value = node.right.accept(self)
-        
+    def visit_binary_operation(self, node: BinaryOpNode) -> Value:
+        left_value = yield node.left
+        right_value = yield node.right
+        return self._emit_binary_operation(node, left_value, right_value)
+
+    def _emit_binary_operation(self, node: BinaryOpNode, left_value: Value, right_value: Value) -> Instruction:
         left_type = self.__get_node_type(node.left)
         right_type = self.__get_node_type(node.right)
         
         temp_reg = self.__get_temp_register()
 
         if node.operator.is_for_comparison():
-            self.__generate_comparison(node, left_value, right_value, left_type, right_type, temp_reg)
+            return self.__generate_comparison(node, left_value, right_value, left_type, right_type, temp_reg)
         elif node.operator.is_logical():
-            self.__generate_logical(node, left_value, right_value, temp_reg)
+            return self.__generate_logical(node, left_value, right_value, temp_reg)
         else:
-            self.__generate_arithmetic(node, left_value, right_value, left_type, right_type, temp_reg)
+            return self.__generate_arithmetic(node, left_value, right_value, left_type, right_type, temp_reg)
 
-        return temp_reg
+    def __generate_comparison(self, node: BinaryOpNode, left_value: Value, right_value: Value,
+                              left_type: DataType, right_type: DataType, temp_reg: str) -> Instruction:
+        operand_type = self.__infer_operand_type(left_type, right_type)
 
-    def __generate_comparison(self, node: BinaryOpNode, left_value: str, right_value: str, 
-                              left_type: DataType, right_type: DataType, temp_reg: str):
-        left = node.left.accept(self)
-        right = node.right.accept(self)
-        operand_type = self.__infer_operand_type(left, right)
-        
         left_value = self.__promote_type(left_value, left_type, operand_type)
         right_value = self.__promote_type(right_value, right_type, operand_type)
     
         llvm_op = node.operator.to_llvm()
-        self.translated_lines.append(
-            f"  {temp_reg} = {llvm_op} {operand_type.to_llvm()} {left_value}, {right_value}")
+        return self.__emit(BinaryInstruction(temp_reg, llvm_op, operand_type, left_value, right_value))
 
-    def __generate_logical(self, node: BinaryOpNode, left_value: str, 
-                           right_value: str, temp_reg: str):
+    def __generate_logical(self, node: BinaryOpNode, left_value: Value,
+                           right_value: Value, temp_reg: str) -> Instruction:
         llvm_op = node.operator.to_llvm()
-        self.translated_lines.append(
-            f"  {temp_reg} = {llvm_op} i1 {left_value}, {right_value}")
+        return self.__emit(BinaryInstruction(temp_reg, llvm_op, DataType.BOOL, left_value, right_value))
 
-    def __generate_arithmetic(self, node: BinaryOpNode, left_value: str, right_value: str, 
-                              left_type: DataType, right_type: DataType, temp_reg: str):
-        result_type = node.result_type if node.result_type else DataType.I32
-        llvm_type = result_type.to_llvm()
+    def __generate_arithmetic(self, node: BinaryOpNode, left_value: Value, right_value: Value,
+                              left_type: DataType, right_type: DataType, temp_reg: str) -> Instruction:
+        result_type = node.data_type if node.data_type else DataType.I32
         
         left_value = self.__promote_type(left_value, left_type, result_type)
         right_value = self.__promote_type(right_value, right_type, result_type)
         
         llvm_op = node.operator.to_llvm()
-        self.translated_lines.append( f"  {temp_reg} = {llvm_op} {llvm_type} {left_value}, {right_value}")
+        return self.__emit(BinaryInstruction(temp_reg, llvm_op, result_type, left_value, right_value))
 
-    def __promote_type(self, value: str, from_type: DataType, to_type: DataType):
+    def __promote_type(self, value: Value, from_type: DataType, to_type: DataType) -> Value:
         if from_type == to_type:
             return value
+        # a constant is the same number in the wider type, only registers start with %
+        if self.propagate_copies and type(value) is str and not value.startswith("%"):
+            return value
         
         ext_reg = self.__get_temp_register()
-        llvm_type_from = DataType.to_llvm(from_type)
-        llvm_type_to = DataType.to_llvm(to_type)
 
         if (from_type == DataType.I16 and to_type in [DataType.I32, DataType.I64]) or \
               (from_type == DataType.I32 and to_type == DataType.I64):
-            self.translated_lines.append(f"  {ext_reg} = sext {llvm_type_from} {value} to {llvm_type_to}")
-            return ext_reg
+            return self.__emit(CastInstruction(ext_reg, "sext", value, from_type, to_type))
         
         return value
     
-    def visit_id(self, node: IDNode) -> str:
-        return self.__get_current_register(node.value)
+    def visit_id(self, node: IDNode) -> Value:
+        if self.stack_variables:
+            temp_reg = self.__get_temp_register()
+            return self.__emit(Load(temp_reg, self.variable_types[node.slot], self.pointers[node.slot]))
+        return self.__read_variable(node.slot, self.current_block)
 
     def visit_number(self, node: NumberNode) -> str:
         return node.value
@@ -173,28 +236,40 @@ define void @printResult(i32 %val) {
     def visit_boolean(self, node: BooleanNode) -> str:
         return Boolean.from_string(node.value).to_llvm()
 
-    def __get_variable_register(self, variable: str) -> str:
-        if variable not in self.variable_versions:
-            self.variable_versions[variable] = 0
+    def __check_instruction_budget(self):
+        if self.line_count >= self.limits.max_instructions:
+            raise ValueError(f"Your program needs more than {self.limits.max_instructions} LLVM instructions! "
+                f"I am not translating all of that!")
+
+    def __reserve_slot(self, node: DeclNode):
+        if node.slot == NO_SLOT:
+            raise ValueError(f"Variable '{node.variable}' at line {self.lines.line(node.offset)} was never resolved, "
+                f"run the semantic analyzer first!")
+        missing = node.slot + 1 - len(self.variable_versions)
+        if missing > 0:
+            self.variable_versions.extend([-1] * missing)
+            self.variable_types.extend([None] * missing)
+            self.variable_names.extend([None] * missing)
+            self.last_writes.extend([-1] * missing)
+            self.pointers.extend([None] * missing)
+        self.variable_names[node.slot] = node.variable
+
+    def __get_variable_register(self, variable: str, slot: int) -> str:
+        self.__check_instruction_budget()
+        version = self.variable_versions[slot] + 1
+        self.variable_versions[slot] = version
+        if version == 0:
             return f"%{variable}"
-        else:
-            self.variable_versions[variable] += 1
-            return f"%{variable}.{self.variable_versions[variable]}"
-
-    def __get_current_register(self, variable: str) -> str:
-        if variable not in self.variable_versions or self.variable_versions[variable] == 0:
-            return f"%{variable}"
-        return f"%{variable}.{self.variable_versions[variable]}"
+        return f"%{variable}.{version}"
 
     def __get_temp_register(self) -> str:
-        reg = f"%_temp_{self.temp_counter}"
+        self.__check_instruction_budget()
+        reg = f"{TEMP_PREFIX}{self.temp_counter}"
         self.temp_counter += 1
         return reg
     
-    def __infer_operand_type(self, left_node: FactorNode, right_node: FactorNode) -> DataType:
-        left_type = self.__get_node_type(left_node)
-        right_type = self.__get_node_type(right_node)
-        
+    @staticmethod
+    def __infer_operand_type(left_type: DataType, right_type: DataType) -> DataType:
         if left_type == DataType.I64 or right_type == DataType.I64:
             return DataType.I64
         elif left_type == DataType.I32 or right_type == DataType.I32:
@@ -204,103 +279,265 @@ define void @printResult(i32 %val) {
         else:
             return DataType.BOOL
 
-    def __get_node_type(self, node: ExprNode) -> DataType:
-        if isinstance(node, IDNode):
-            return self.variable_types[node.value]
-        if isinstance(node, NumberNode):
-            value = int(node.value)
-            if -32768 <= value <= 32767:
-                return DataType.I16
-            elif I32_MIN <= value <= I32_MAX:
-                return DataType.I32
-            else:
-                return DataType.I64
-        if isinstance(node, BooleanNode):
-            return DataType.BOOL
-        if isinstance(node, BinaryOpNode):
-            if node.operator.is_for_comparison() or node.operator.is_logical():
-                return DataType.BOOL
-            return node.result_type if node.result_type else DataType.I32
-        if isinstance(node, UnaryOpNode):
-            return DataType.BOOL
-        return DataType.I32
+    @staticmethod
+    def __get_node_type(node: ExprNode) -> DataType:
+        return node.data_type if node.data_type else DataType.I32
 
     def visit_if_statement(self, node: IfNode):
         label_id = self.__get_next_label_id()
         
-        then_label = f"then_{label_id}"
-        elif_labels = [f"elif_{label_id}_{i}" for i in range(len(node.elif_blocks))]
-        else_label = f"else_{label_id}" if node.else_block else f"end_{label_id}"
-        end_label = f"end_{label_id}"
+        then_block = BasicBlock(f"then_{label_id}")
+        elif_blocks = [BasicBlock(f"elif_{label_id}_{i}") for i in range(len(node.elif_blocks))]
+        end_block = BasicBlock(f"end_{label_id}")
+        else_block = BasicBlock(f"else_{label_id}") if node.else_block else end_block
         
-        condition_value = node.condition.accept(self)
-        next_label = elif_labels[0] if elif_labels else else_label
-        self.translated_lines.append(
-            f"  br i1 {condition_value}, label %{then_label}, label %{next_label}")
+        # the blocks that jump to the end block, whose variables the phis of the end block merge
+        ends: list[BasicBlock] = []
+        dominator, first_write = self.current_block, self.write_count
+
+        condition_value = yield from self._visit_condition(node)
+        next_block = elif_blocks[0] if elif_blocks else else_block
+        self.__emit(ConditionalBranch(condition_value, then_block, next_block))
+        branch_block = self.current_block
         
-        self.__emit_block_with_label(node.block, then_label, end_label)
+        yield from self.__emit_block(node.block, then_block, end_block, [branch_block], ends)
         
         for i, elif_node in enumerate(node.elif_blocks):
-            self._emit_label(elif_labels[i])
-            condition_value = elif_node.condition.accept(self)
-            next_label = elif_labels[i + 1] if i + 1 < len(elif_labels) else else_label
-            self.translated_lines.append(
-                f"  br i1 {condition_value}, label %{elif_labels[i]}_body, label %{next_label}")
+            self.__start_block(elif_blocks[i], [branch_block])
+            condition_value = yield from self._visit_condition(elif_node)
+            body_block = BasicBlock(f"{elif_blocks[i].label}_body")
+            next_block = elif_blocks[i + 1] if i + 1 < len(elif_blocks) else else_block
+            self.__emit(ConditionalBranch(condition_value, body_block, next_block))
+            branch_block = self.current_block
             
-            self.__emit_block_with_label(elif_node.block, f"{elif_labels[i]}_body", end_label)
+            yield from self.__emit_block(elif_node.block, body_block, end_block, [branch_block], ends)
         
         if node.else_block:
-            self.__emit_block_with_label(node.else_block, else_label, end_label)
+            yield from self.__emit_block(node.else_block, else_block, end_block, [branch_block], ends)
+        else:
+            ends.append(branch_block)
         
-        self._emit_label(end_label)
+        self.__start_block(end_block, ends)
+        end_block.dominator, end_block.first_write = dominator, first_write
 
     def visit_elif_statement(self, node: ElifNode):
         pass
 
     def visit_while_loop(self, node: WhileNode):
         label_id = self.__get_next_label_id()
-        cond_label = f"while_cond_{label_id}"
-        body_label = f"while_body_{label_id}"
-        end_label = f"while_end_{label_id}"
+        header = BasicBlock(f"while_cond_{label_id}")
+        body_block = BasicBlock(f"while_body_{label_id}")
+        end_block = BasicBlock(f"while_end_{label_id}")
         
-        self.translated_lines.append(f"  br label %{cond_label}")
+        self.__emit(Branch(header))
+        pre_header, first_write = self.current_block, self.write_count
         
-        self._emit_label(cond_label)
-        condition_value = node.condition.accept(self)
-        self.translated_lines.append(f"  br i1 {condition_value}, label %{body_label}, label %{end_label}")
+        # the loop header only learns about its back edge after the body, so it is sealed after it
+        self.__start_block(header, [self.current_block], sealed=False)
+        condition_value = yield from self._visit_condition(node)
+        self.__emit(ConditionalBranch(condition_value, body_block, end_block))
+        header_end = self.current_block
         
-        self._emit_label(body_label)
-        node.block.accept(self)
+        self.__start_block(body_block, [header_end])
+        yield node.block
         if not node.block.return_node:
-            self.translated_lines.append(f"  br label %{cond_label}")
+            self.__emit(Branch(header))
+            header.predecessors.append(self.current_block)
+        self.__seal(header)
+        header.dominator, header.first_write = pre_header, first_write
         
-        self._emit_label(end_label)
+        self.__start_block(end_block, [header_end])
 
     def __get_next_label_id(self) -> int:
+        self.__check_instruction_budget()
         label_id = self.label_counter
         self.label_counter += 1
         return label_id
 
-    def __emit_block_with_label(self, block: CodeBlockNode, label: str, end_label: str):
-        self._emit_label(label)
-        block.accept(self)
-        if not block.return_node:
-            self.translated_lines.append(f"  br label %{end_label}")
+    def __emit_block(self, node: CodeBlockNode, block: BasicBlock, end_block: BasicBlock,
+                     predecessors: list[BasicBlock], ends: list[BasicBlock]):
+        self.__start_block(block, predecessors)
+        yield node
+        if not node.return_node:
+            self.__emit(Branch(end_block))
+            ends.append(self.current_block)
+
+    def _visit_condition(self, node: ConditionNode):
+        return (yield node.condition)
+
+    def _visit_program_return(self, node: ProgramNode):
+        return (yield node.return_node)
+
+    def __start_block(self, block: BasicBlock, predecessors: list[BasicBlock], sealed: bool = True):
+        block.predecessors = predecessors
+        if not sealed:
+            block.sealed = False
+            block.incomplete_phis = {}
+        self.function.blocks.append(block)
+        self.line_count += 1
+        self.current_block = block
+
+    def __emit(self, instruction: Instruction) -> Instruction:
+        self.current_block.instructions.append(instruction)
+        self.line_count += 1
+        return instruction
+
+    # The SSA construction of Braun et al.: a variable that a block did not write is looked up in its
+    # predecessors, and a block with several of them gets a phi that is dropped again if it merges a single value.
+
+    def __read_variable(self, slot: int, block: BasicBlock):
+        value = block.definitions.get(slot)
+        if value is None:
+            value, block = self.__find_definition(slot, block)
+            if value is None:
+                value = self.__merge_variable(slot, block)
+        return resolve(value) if type(value) is Phi else value
+
+    # Follows the blocks that can only be entered from one place. Returns the definition and None, or None
+    # and the block where the search ends because the variable needs a phi there.
+    def __find_definition(self, slot: int, block: BasicBlock):
+        passed: list[BasicBlock] = []
+        while True:
+            value = block.definitions.get(slot)
+            if value is not None:
+                break
+            if not block.sealed:
+                return None, block
+            if len(block.predecessors) == 1:
+                above = block.predecessors[0]
+            elif block.dominator is not None and self.last_writes[slot] < block.first_write:
+                above = block.dominator
+            else:
+                return None, block
+            passed.append(block)
+            block = above
+
+        for passed_block in passed:
+            passed_block.definitions[slot] = value
+        return value, None
+
+    def __merge_variable(self, slot: int, block: BasicBlock):
+        # the phis of phis are looked up without recursion, like the visitors
+        lookups = [self.__new_phi_for(slot, block)]
+        value = None
+        while lookups:
+            try:
+                predecessor = lookups[-1].send(value)
+            except StopIteration as finished:
+                lookups.pop()
+                value = finished.value
+                continue
+            value, block = self.__find_definition(slot, predecessor)
+            if value is None:
+                lookups.append(self.__new_phi_for(slot, block))
+        return value
+
+    def __new_phi_for(self, slot: int, block: BasicBlock):
+        if not block.sealed:
+            value = block.incomplete_phis[slot] = self.__new_phi(slot, block)
+        elif not block.predecessors:
+            value = UNDEF
+        else:
+            # the phi is recorded before its operands are looked up, which ends the search around loops
+            phi = block.definitions[slot] = self.__new_phi(slot, block)
+            for predecessor in block.predecessors:
+                self.__add_phi_operand(phi, (yield predecessor))
+            value = self.__remove_trivial_phis(phi)
+            if value is phi:
+                self.__name_phi(phi)
+        block.definitions[slot] = value
+        return value
+
+    def __write_variable(self, slot: int, value: Value):
+        self.current_block.definitions[slot] = value
+        self.last_writes[slot] = self.write_count
+        self.write_count += 1
 
-    def _emit_label(self, label: str):
-        self.translated_lines.append(f"{label}:")
+    def __new_phi(self, slot: int, block: BasicBlock) -> Phi:
+        phi = Phi(slot, self.variable_types[slot], block)
+        block.phis.append(phi)
+        return phi
+
+    # most phis merge a single value and are dropped again, so only the ones that stay get a register
+    def __name_phi(self, phi: Phi):
+        phi.name = self.__get_variable_register(self.variable_names[phi.slot], phi.slot)
+
+    @staticmethod
+    def __add_phi_operand(phi: Phi, value):
+        phi.operands.append(value)
+        if type(value) is Phi:
+            value.users.append(phi)
+
+    def __seal(self, block: BasicBlock):
+        for slot, phi in block.incomplete_phis.items():
+            for predecessor in block.predecessors:
+                self.__add_phi_operand(phi, self.__read_variable(slot, predecessor))
+        block.sealed = True
+        for phi in block.incomplete_phis.values():
+            if self.__remove_trivial_phis(phi) is phi:
+                self.__name_phi(phi)
+        block.incomplete_phis = None
+
+    # Replaces the phi if all of its operands are the same value, and then looks at the phis that used it,
+    # which may have become trivial in turn. Returns what the phi stands for now.
+    @staticmethod
+    def __remove_trivial_phis(phi: Phi):
+        candidates = [phi]
+        while candidates:
+            candidate = candidates.pop()
+            block = candidate.block
+            # phis whose operands are still being looked up are checked once they have all of them
+            if candidate.replacement is not None or not block.sealed \
+                    or len(candidate.operands) < len(block.predecessors):
+                continue
+            same = trivial_value(candidate)
+            if same is None:
+                continue
+            candidate.replacement = same
+            if type(same) is Phi:
+                same.users.extend(user for user in candidate.users if user is not candidate)
+            candidates.extend(candidate.users)
+        return resolve(phi)
+
+    # Between the top-level statements the current block dominates all code that is still to come. Once it
+    # knows the values of the variables, no phi can be added to the blocks before it anymore.
+    def __flush_settled_blocks(self, printer: IRPrinter):
+        block = self.current_block
+        for slot in self.top_level_slots:
+            block.definitions[slot] = self.__read_variable(slot, block)
+        blocks = self.function.blocks
+        self.__flush(printer)
+
+        # the later code only gets the registers from here, so the earlier blocks and phis can go. They
+        # point at each other around loops and through the definitions, so they are taken apart to be freed now.
+        definitions = {slot: value_name(value) for slot, value in block.definitions.items()}
+        for earlier_block in blocks:
+            for phi in earlier_block.phis:
+                phi.block = phi.operands = phi.users = None
+            earlier_block.predecessors, earlier_block.phis, earlier_block.instructions = [], [], []
+            earlier_block.definitions = earlier_block.dominator = None
+        block.definitions = definitions
+        block.continued = True
+        self.function.blocks = [block]
+
+    def __flush(self, printer: IRPrinter):
+        printer.write_blocks(self.function)
+        self.written_lines = self.line_count
+        self.function.blocks = []
 
     def visit_code_block(self, node: CodeBlockNode):
         for n in node.statements:
-            n.accept(self)
+            yield n
         if node.return_node:
-            node.return_node.accept(self)
+            yield node.return_node
+
+    def visit_unary_operation(self, node: UnaryOpNode) -> Value:
+        operand = yield node.operand
+        return self._emit_unary_operation(node, operand)
 
-    def visit_unary_operation(self, node: UnaryOpNode) -> str:
+    def _emit_unary_operation(self, node: UnaryOpNode, operand: Value) -> Instruction:
         if node.operator == NOT:
-            operand = node.operand.accept(self)
             temp_reg = self.__get_temp_register()
-            self.translated_lines.append(f"  {temp_reg} = xor i1 {operand}, 1")
-            return temp_reg
+            return self.__emit(BinaryInstruction(temp_reg, "xor", DataType.BOOL, operand, "1"))
 
         raise ValueError(f"Unsupported unary operator: {node.operator}")
\ No newline at end of file
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+from typing import Optional, TextIO
+from ..limits import CompilerLimits, NO_LIMITS
+from ..node.assign_node import AssignNode
+from ..node.binary_op_node import BinaryOpNode
+from ..node.code_block_node import CodeBlockNode
+from ..node.condition_node import ConditionNode
+from ..node.decl_node import DeclNode
+from ..node.id_node import IDNode
+from ..node.node_kind import NodeKind
+from ..node.program_node import ProgramNode
+from ..node.return_node import ReturnNode
+from ..node.unary_op_node import UnaryOpNode
+from .code_generator import CodeGenerator
+from .semantic_analyzer import SemanticAnalyzer
+
+STATEMENT_NAMES = {NodeKind.IF: "If", NodeKind.ELIF: "Elif", NodeKind.WHILE: "While"}
+
+
+# Type-checks and emits the LLVM IR in one walk over the AST. Every node runs the checks of the
+# SemanticAnalyzer before its code is emitted, and the children's types are read from their data_type.
+class FusedCodeGenerator(CodeGenerator):
+
+    def __init__(self, limits: CompilerLimits = NO_LIMITS, shared_expressions: bool = False,
+                 stack_variables: bool = False, output: Optional[TextIO] = None, propagate_copies: bool = False):
+        super().__init__(limits, shared_expressions, stack_variables, output, propagate_copies)
+        self.analyzer = SemanticAnalyzer(limits=limits, shared_expressions=shared_expressions)
+
+    def generate(self, node: ProgramNode) -> Optional[str]:
+        self.analyzer.lines = node.lines
+        try:
+            return self.visit(node)
+        except ValueError:
+            # the emitted code can run out of its budget before a later semantic error is found, so the
+            # errors are looked up again in the order of the separate semantic analysis
+            SemanticAnalyzer(limits=self.limits, shared_expressions=self.shared_results is not None).visit(node)
+            raise
+
+    def visit_declaration(self, node: DeclNode):
+        self.analyzer.declare(node)
+        value = yield node.expr_node
+        self.analyzer.check_initializer(node, node.expr_node.data_type)
+        self._emit_declaration(node, value)
+
+    def visit_assign(self, node: AssignNode):
+        data_type = self.analyzer.resolve_assignment(node)
+        value = yield node.expr_node
+        self.analyzer.check_assigned_value(node, data_type, node.expr_node.data_type)
+        self._emit_assignment(node, value)
+
+    def visit_return(self, node: ReturnNode):
+        self.analyzer.statement = node
+        yield from CodeGenerator.visit_return(self, node)
+
+    def visit_binary_operation(self, node: BinaryOpNode) -> str:
+        left_value = yield node.left
+        right_value = yield node.right
+        self.analyzer.binary_operation_type(node, node.left.data_type, node.right.data_type)
+        return self._emit_binary_operation(node, left_value, right_value)
+
+    def visit_unary_operation(self, node: UnaryOpNode) -> str:
+        operand = yield node.operand
+        self.analyzer.unary_operation_type(node, node.operand.data_type)
+        return self._emit_unary_operation(node, operand)
+
+    def visit_id(self, node: IDNode) -> str:
+        self.analyzer.resolve_id(node)
+        return CodeGenerator.visit_id(self, node)
+
+    def _visit_condition(self, node: ConditionNode):
+        self.analyzer.statement = node
+        value = yield node.condition
+        self.analyzer.check_condition(node, node.condition.data_type, STATEMENT_NAMES[node.kind])
+        return value
+
+    def _visit_program_return(self, node: ProgramNode):
+        self.analyzer.statement = node
+        return (yield node.return_node)
+
+    def visit_code_block(self, node: CodeBlockNode):
+        self.analyzer.context.enter_scope()
+        yield from CodeGenerator.visit_code_block(self, node)
+        self.analyzer.context.exit_scope()
@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
+from typing import Optional
+from ..diagnostic import Diagnostic
+from ..limits import CompilerLimits, NO_LIMITS
+from ..node.ast_node import ASTNode
+from ..node.node_kind import NodeKind
 from ..node.condition_node import ConditionNode
 from ..constants import *
 from .ast_visitor import ASTVisitor
 from ..context import Context
+from ..token.line_index import LineIndex
 from ..llvm_specifics.data_type import DataType
 from ..node.assign_node import AssignNode
 from ..node.binary_op_node import BinaryOpNode
@@ -18,52 +24,106 @@ from ..node.program_node import ProgramNode
 from ..node.return_node import ReturnNode
 from ..node.unary_op_node import UnaryOpNode
 
+RESUME_KINDS = frozenset({NodeKind.PROGRAM, NodeKind.CODE_BLOCK, NodeKind.IF, NodeKind.ELIF, NodeKind.WHILE})
+
 
 class SemanticAnalyzer(ASTVisitor):
-    def __init__(self):
+    def __init__(self, recover: bool = False, limits: CompilerLimits = NO_LIMITS, shared_expressions: bool = False):
         self.context = Context()
+        self.limits = limits
+        self.variable_count = 0
+        self.recover = recover
+        self.diagnostics: list[Diagnostic] = []
+        self.shared_results = {} if shared_expressions else None
+        # the statement whose expressions are being checked; identifiers report its line because the
+        # parser may share one identifier node between the expressions of several lines
+        self.statement: Optional[ASTNode] = None
+        # the nodes keep their offsets in the source, which become lines only for a diagnostic
+        self.lines: Optional[LineIndex] = None
+
+    def resumes_after_error(self, node: ASTNode) -> bool:
+        # a statement with a broken condition still has its blocks checked
+        return self.recover and node.kind in RESUME_KINDS
+
+    def report(self, error: ValueError, node: Optional[ASTNode]):
+        self.context.currently_initializing = None
+        if node is not None and not hasattr(node, "offset"):
+            # the return expression of the program has no offset of its own
+            node = self.statement
+        self.diagnostics.append(Diagnostic("semantic", str(error), self.line(node) if node is not None else None))
+
+    def line(self, node: ASTNode) -> int:
+        return self.lines.line(node.offset)
 
     def visit_program(self, node: ProgramNode):
+        self.lines = node.lines
         for n in node.statement_nodes:
-            n.accept(self)
-        node.return_node.accept(self)
+            yield n
+        if node.return_node:
+            self.statement = node
+            yield node.return_node
+
+    # The checks below are shared with FusedCodeGenerator, which runs them while it emits the IR.
 
     def visit_declaration(self, node: DeclNode):
+        self.declare(node)
+        expr_type = yield node.expr_node
+        self.check_initializer(node, expr_type)
+
+    def declare(self, node: DeclNode):
+        self.statement = node
         if not self.context.declare_variable(node.variable, node.data_type, node.mutable):
-            raise ValueError( f"Variable '{node.variable}' has already been declared at line {node.line}!!!!!!!!!!")
+            raise ValueError( f"Variable '{node.variable}' has already been declared at line {self.line(node)}!!!!!!!!!!")
+        node.slot = self.context.slots[node.variable]
+
+        self.variable_count += 1
+        if self.variable_count > self.limits.max_variables:
+            raise ValueError(f"You declared more than {self.limits.max_variables} variables, "
+                f"the last one at line {self.line(node)}! Reuse some of them!")
 
         self.context.currently_initializing = node.variable
-        expr_type = node.expr_node.accept(self)
 
+    def check_initializer(self, node: DeclNode, expr_type: DataType):
         if not self.__is_type_compatible(expr_type, node.data_type):
-            raise ValueError( f"Types do not match at line {node.line}: you cannot assign "
+            raise ValueError( f"Types do not match at line {self.line(node)}: you cannot assign "
                 f"{expr_type} to {node.data_type}! Be careful!")
 
         self.context.currently_initializing = None
 
     def visit_assign(self, node: AssignNode):
-        if not self.context.is_variable_mutable(node.variable):
+        data_type = self.resolve_assignment(node)
+        expr_type = yield node.expr_node
+        self.check_assigned_value(node, data_type, expr_type)
+
+    def resolve_assignment(self, node: AssignNode) -> DataType:
+        self.statement = node
+        variable = self.context.lookup_variable(node.variable)
+        if variable is None or not variable.mutable:
             raise ValueError(
                 f"Sorry, but you cannot assign something new to an immutable "
-                f"variable!!! Remove '{node.variable}' from line {node.line}!")
+                f"variable!!! Remove '{node.variable}' from line {self.line(node)}!")
 
-        if isinstance(node.expr_node, IDNode) and node.expr_node.value == node.variable:
-            raise ValueError(f"Self-assignment like '{node.variable} = {node.variable}' is not allowed at line {node.line}!")
+        if node.expr_node.kind == NodeKind.IDENTIFIER and node.expr_node.value == node.variable:
+            raise ValueError(f"Self-assignment like '{node.variable} = {node.variable}' is not allowed at line {self.line(node)}!")
 
-        data_type = self.context.get_variable_type(node.variable)
-        expr_type = node.expr_node.accept(self)
+        node.slot = variable.slot
+        return variable.data_type
 
+    def check_assigned_value(self, node: AssignNode, data_type: DataType, expr_type: DataType):
         if not self.__is_type_compatible(expr_type, data_type):
-            raise ValueError(f"Types do not match at line {node.line}: you cannot assign "
+            raise ValueError(f"Types do not match at line {self.line(node)}: you cannot assign "
                 f"{expr_type} to {data_type}! Be careful!")
 
     def visit_return(self, node: ReturnNode) -> DataType:
-        return node.expr_node.accept(self)
+        self.statement = node
+        return (yield node.expr_node)
 
     def visit_binary_operation(self, node: BinaryOpNode) -> DataType:
-        left_type = node.left.accept(self)
-        right_type = node.right.accept(self)
+        left_type = yield node.left
+        right_type = yield node.right
+        return self.binary_operation_type(node, left_type, right_type)
 
+    def binary_operation_type(self, node: BinaryOpNode, left_type: DataType, right_type: DataType) -> DataType:
         if node.operator.is_for_comparison():
             return self.__compare(node, left_type, right_type)
 
@@ -97,13 +157,13 @@ class SemanticAnalyzer(ASTVisitor):
         self.__ensure_both_operands_are_numbers(node, left_type, right_type)
 
         if left_type == DataType.I64 or right_type == DataType.I64:
-            node.result_type = DataType.I64
+            node.data_type = DataType.I64
         elif left_type == DataType.I32 or right_type == DataType.I32:
-            node.result_type = DataType.I32
+            node.data_type = DataType.I32
         else:
-            node.result_type = DataType.I16
+            node.data_type = DataType.I16
 
-        return node.result_type
+        return node.data_type
 
     @staticmethod
     def __ensure_both_operands_are_numbers(node: BinaryOpNode, left_type: DataType, right_type: DataType):
@@ -111,62 +171,76 @@ class SemanticAnalyzer(ASTVisitor):
             raise ValueError(f"You cannot play math using {node.operator} on booleans!" )
 
     def visit_id(self, node: IDNode) -> DataType:
+        return self.resolve_id(node)
+
+    def resolve_id(self, node: IDNode) -> DataType:
         if self.context.currently_initializing == node.value:
             raise ValueError(
-                f"Self-assignment like '{node.value} = {node.value}' is not allowed at line {node.line}!")
+                f"Self-assignment like '{node.value} = {node.value}' is not allowed at line {self.line(self.statement)}!")
 
-        if not self.context.is_variable_declared(node.value):
+        variable = self.context.lookup_variable(node.value)
+        if variable is None:
             raise ValueError(
                 f"Why did you decide that you are permitted to use uninitialized variables??? "
-                f"You placed uninitialized '{node.value}' at line {node.line}!!!")
+                f"You placed uninitialized '{node.value}' at line {self.line(self.statement)}!!!")
 
-        return self.context.get_variable_type(node.value)
+        node.slot = variable.slot
+        node.data_type = variable.data_type
+        return variable.data_type
 
     def visit_number(self, node: NumberNode) -> DataType:
-        value = int(node.value)
-        
-        if I16_MIN <= value <= I16_MAX:
-            return DataType.I16
-        elif I32_MIN <= value <= I32_MAX:
-            return DataType.I32
-        else:
-            return DataType.I64
+        return node.data_type
 
     def visit_boolean(self, node: BooleanNode) -> DataType:
-        return DataType.BOOL
+        return node.data_type
 
     def visit_if_statement(self, node: IfNode):
-        self.__validate_condition_and_visit_block(node, "If")
+        yield from self.__validate_condition_and_visit_block(node, "If")
         
         for elif_node in node.elif_blocks:
-            elif_node.accept(self)
+            yield elif_node
 
         if node.else_block:
-            node.else_block.accept(self)
+            yield node.else_block
 
     def visit_elif_statement(self, node: ElifNode):
-        self.__validate_condition_and_visit_block(node, "Elif")
+        yield from self.__validate_condition_and_visit_block(node, "Elif")
 
     def visit_while_loop(self, node: WhileNode):
-        self.__validate_condition_and_visit_block(node, "While")
+        yield from self.__validate_condition_and_visit_block(node, "While")
 
     def __validate_condition_and_visit_block(self, node: ConditionNode, statement_name: str):
-        condition_type = node.condition.accept(self)
+        self.statement = node
+        condition_type = yield node.condition
+        # without a type the condition already failed and was reported
+        if condition_type is not None:
+            try:
+                self.check_condition(node, condition_type, statement_name)
+            except ValueError as error:
+                if not self.recover:
+                    raise
+                self.report(error, node)
+        yield node.block
+
+    def check_condition(self, node: ConditionNode, condition_type: DataType, statement_name: str):
         if condition_type != DataType.BOOL:
             raise ValueError(f"{statement_name} condition must be of type bool, but you placed "
-                f"{condition_type} at line {node.line}! How could you????????")
-        node.block.accept(self)
+                f"{condition_type} at line {self.line(node)}! How could you????????")
 
     def visit_code_block(self, node: CodeBlockNode):
         self.context.enter_scope()
         for n in node.statements:
-            n.accept(self)
+            yield n
         if node.return_node:
-            node.return_node.accept(self)
+            yield node.return_node
         self.context.exit_scope()
 
     def visit_unary_operation(self, node: UnaryOpNode) -> DataType:
-        operand_type = node.operand.accept(self)
+        operand_type = yield node.operand
+        return self.unary_operation_type(node, operand_type)
+
+    @staticmethod
+    def unary_operation_type(node: UnaryOpNode, operand_type: DataType) -> DataType:
         if node.operator == NOT:
             if operand_type != DataType.BOOL:
                 raise ValueError(f"The NOT operator {node.operator} can only be applied to the boolean values, dummy, "
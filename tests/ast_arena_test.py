@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+import pickle
+import unittest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from program_generator import generate_program
+from depth_benchmark import nested_blocks, nested_brackets
+from compiler.lexer.lexer import Lexer
+from compiler.node.ast_arena import ASTArena, ArenaBuilder
+from compiler.node.ast_node import ASTNode
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+
+def dump(value):
+    if isinstance(value, ASTNode):
+        # the program's line index belongs to the source, not to the tree
+        fields = [name for cls in type(value).__mro__ for name in getattr(cls, "__slots__", ()) if name != "lines"]
+        return type(value).__name__, {name: dump(getattr(value, name)) for name in fields}
+    if isinstance(value, list):
+        return [dump(item) for item in value]
+    return value
+
+
+def parse_into_arena(source: str) -> ASTArena:
+    builder = ArenaBuilder()
+    SyntaxParser(Lexer(source).tokenize(), builder=builder).parse_program()
+    return builder.arena
+
+
+def compile_ast(ast) -> str:
+    SemanticAnalyzer().visit(ast)
+    return CodeGenerator().visit(ast)
+
+
+class ASTArenaTest(unittest.TestCase):
+
+    sources = [
+        ("generated_program", generate_program(400, seed=3)),
+        ("nested_blocks", nested_blocks(50)),
+        ("nested_brackets", nested_brackets(50)),
+        ("if_elif_else", "# 😀 🐷 🐖x🐖 @ 1 #\n# SAVE 🐖x🐖 > 1 #\n# 🐖🐖🐖 #\n# 🐖x🐖 @ 2 #\n# 🐖🐖🐖 #\n"
+                         "#~ HURT 🐖x🐖 > 2 ~#\n# 🐖🐖🐖 #\n# ... 🐖x🐖 ... #\n🐖🐖🐖 #\n"
+                         "# KILL #\n# 🐖🐖🐖 #\n# 🐖x🐖 @ 💩 LOVE 🌸🌸 HATE #\n# 🐖🐖🐖 #\n# ... 🐖x🐖 ... #"),
+    ]
+
+    def test_materialized_arena_matches_object_ast(self):
+        for name, source in self.sources:
+            with self.subTest(name=name):
+                expected = SyntaxParser(Lexer(source).tokenize()).parse_program()
+                self.assertEqual(dump(parse_into_arena(source).to_nodes()), dump(expected))
+
+    def test_serialization_round_trip(self):
+        for name, source in self.sources:
+            with self.subTest(name=name):
+                arena = parse_into_arena(source)
+                for copy in (ASTArena.from_bytes(arena.to_bytes()), pickle.loads(pickle.dumps(arena))):
+                    self.assertEqual(dump(copy.to_nodes()), dump(arena.to_nodes()))
+
+    def test_existing_visitors_run_on_materialized_arena(self):
+        source = self.sources[0][1]
+        expected = compile_ast(SyntaxParser(Lexer(source).tokenize()).parse_program())
+        self.assertEqual(compile_ast(parse_into_arena(source).to_nodes()), expected)
+
+    def test_shares_literal_nodes(self):
+        arena = parse_into_arena("# 😀 🐷 🐖x🐖 @ 1 ❤️ 1 ❤️ 1 #\n# ... 🐖x🐖 ... #")
+        self.assertEqual(len(arena), 7)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
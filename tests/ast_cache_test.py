@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import unittest
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from program_generator import generate_program
+from compiler.ast_cache import ASTCache
+from compiler.lexer.lexer import Lexer
+from compiler.limits import NO_LIMITS, UNTRUSTED_LIMITS
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+
+def analyze(source: str):
+    ast = SyntaxParser(Lexer(source).tokenize()).parse_program()
+    SemanticAnalyzer().visit(ast)
+    return ast
+
+
+def store_and_load(directory: str, seed: int) -> bool:
+    cache = ASTCache(directory)
+    source = generate_program(200, seed=seed % 3)
+    key = ASTCache.key(source, NO_LIMITS)
+    cache.store(key, analyze(source))
+    ast = cache.load(key)
+    return CodeGenerator().visit(ast) == CodeGenerator().visit(analyze(source))
+
+
+class ASTCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ASTCache(self.directory.name)
+        self.source = generate_program(300, seed=7)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def entries(self) -> list[str]:
+        return sorted(os.listdir(self.directory.name))
+
+    def test_hit_generates_the_same_code(self):
+        key = ASTCache.key(self.source, NO_LIMITS)
+        self.assertIsNone(self.cache.load(key))
+        self.cache.store(key, analyze(self.source))
+        cached = self.cache.load(key)
+        self.assertIsNotNone(cached)
+        self.assertEqual(CodeGenerator().visit(cached), CodeGenerator().visit(analyze(self.source)))
+
+    def test_key_depends_on_source_and_limits(self):
+        key = ASTCache.key(self.source, NO_LIMITS)
+        self.assertEqual(key, ASTCache.key(self.source.encode("utf-8"), NO_LIMITS))
+        self.assertNotEqual(key, ASTCache.key(self.source + "\n", NO_LIMITS))
+        self.assertNotEqual(key, ASTCache.key(self.source, UNTRUSTED_LIMITS))
+
+    def test_damaged_entry_is_a_miss_and_removed(self):
+        key = ASTCache.key(self.source, NO_LIMITS)
+        self.cache.store(key, analyze(self.source))
+        path = os.path.join(self.directory.name, self.entries()[0])
+        with open(path, 'r+b') as file:
+            file.truncate(os.path.getsize(path) // 2)
+        self.assertIsNone(self.cache.load(key))
+        self.assertEqual(self.entries(), [])
+
+    def test_evicts_least_recently_used_entries(self):
+        # trailing blank lines change the key but not the size of the entry
+        sources = [self.source + "\n" * count for count in range(3)]
+        keys = [ASTCache.key(source, NO_LIMITS) for source in sources]
+        self.cache.store(keys[0], analyze(sources[0]))
+        entry_size = os.path.getsize(os.path.join(self.directory.name, self.entries()[0]))
+        self.cache.max_size = entry_size * 5 // 2
+
+        self.cache.store(keys[1], analyze(sources[1]))
+        os.utime(os.path.join(self.directory.name, keys[1] + ".ast"), (0, 0))
+        self.cache.load(keys[0])
+        self.cache.store(keys[2], analyze(sources[2]))
+
+        self.assertIsNotNone(self.cache.load(keys[0]))
+        self.assertIsNone(self.cache.load(keys[1]))
+        self.assertIsNotNone(self.cache.load(keys[2]))
+
+    def test_concurrent_processes_share_the_cache(self):
+        with ProcessPoolExecutor(4) as executor:
+            results = list(executor.map(store_and_load, [self.directory.name] * 12, range(12)))
+        self.assertTrue(all(results))
+        self.assertEqual(len(self.entries()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from depth_benchmark import nested_blocks, nested_brackets
+from compiler.lexer.lexer import Lexer
+from compiler.node.node_kind import NodeKind
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.ast_walker import ASTWalker
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+SOURCE = ("# 😀 🐷 🐖x🐖 @ 1 ❤️ 2 #\n"
+          "# OINK 🐖x🐖 < 5 #\n# 🐖🐖🐖 #\n# 🐖x🐖 @ 🐖x🐖 💞 3 #\n# 🐖🐖🐖 #\n"
+          "# SAVE 🐖x🐖 > 1 #\n# 🐖🐖🐖 #\n# 🐖x🐖 @ 🐖x🐖 💔 1 #\n# 🐖🐖🐖 #\n"
+          "# KILL #\n# 🐖🐖🐖 #\n# 🐖x🐖 @ 0 #\n# 🐖🐖🐖 #\n"
+          "# ... 🐖x🐖 ... #")
+
+
+def parse(source: str):
+    return SyntaxParser(Lexer(source).tokenize()).parse_program()
+
+
+class OperatorCollector(ASTWalker):
+    def __init__(self, skip_loops: bool = False):
+        self.skip_loops = skip_loops
+        self.events = []
+
+    def enter_while_loop(self, node):
+        return not self.skip_loops
+
+    def enter_binary_operation(self, node):
+        self.events.append(("enter", node.operator.name))
+
+    def leave_binary_operation(self, node):
+        self.events.append(("leave", node.operator.name))
+
+    def enter_id(self, node):
+        self.events.append(("id", node.value))
+
+
+class BlockDepth(ASTWalker):
+    def __init__(self):
+        self.depth = self.deepest = 0
+
+    def enter_code_block(self, node):
+        self.depth += 1
+        self.deepest = max(self.deepest, self.depth)
+
+    def leave_code_block(self, node):
+        self.depth -= 1
+
+
+class ASTWalkerTest(unittest.TestCase):
+
+    def test_calls_hooks_in_pre_and_post_order(self):
+        walker = OperatorCollector()
+        walker.walk(parse(SOURCE))
+        self.assertEqual(walker.events[:8], [
+            ("enter", "PLUS"), ("leave", "PLUS"),
+            ("enter", "LESS"), ("id", "x"), ("leave", "LESS"),
+            ("enter", "MULTIPLY"), ("id", "x"), ("leave", "MULTIPLY")])
+        self.assertEqual(walker.events[-1], ("id", "x"))
+
+    def test_enter_hook_can_skip_children(self):
+        walker = OperatorCollector(skip_loops=True)
+        walker.walk(parse(SOURCE))
+        self.assertNotIn(("enter", "MULTIPLY"), walker.events)
+        self.assertIn(("enter", "MINUS"), walker.events)
+
+    def test_walks_deep_programs_without_recursion(self):
+        walker = BlockDepth()
+        walker.walk(parse(nested_blocks(sys.getrecursionlimit() * 2)))
+        self.assertEqual(walker.deepest, sys.getrecursionlimit() * 2)
+        self.assertEqual(walker.depth, 0)
+        OperatorCollector().walk(parse(nested_brackets(sys.getrecursionlimit() * 2)))
+
+    def test_passes_dispatch_through_node_kinds(self):
+        ast = parse(SOURCE)
+        self.assertEqual(ast.kind, NodeKind.PROGRAM)
+        self.assertIs(SemanticAnalyzer.dispatch_table[NodeKind.BINARY], SemanticAnalyzer.visit_binary_operation)
+        self.assertIs(CodeGenerator.dispatch_table[NodeKind.CODE_BLOCK], CodeGenerator.visit_code_block)
+        SemanticAnalyzer().visit(ast)
+        self.assertIn("icmp slt", CodeGenerator().visit(ast))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from adversarial_benchmark import nested_comparisons
+from comparison_benchmark import arithmetic_operands
+from compiler.lexer.lexer import Lexer
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+
+def compile_source(source: str) -> str:
+    ast = SyntaxParser(Lexer(source).tokenize()).parse_program()
+    SemanticAnalyzer().visit(ast)
+    return CodeGenerator().visit(ast)
+
+
+class ComparisonTest(unittest.TestCase):
+
+    def test_emits_operands_once(self):
+        code = compile_source(arithmetic_operands(3))
+        self.assertEqual(code.count(" = mul i64 "), 12)
+        self.assertEqual(compile_source(nested_comparisons(30)).count(" = icmp eq i1 "), 30)
+
+    def test_compares_in_the_widest_operand_type(self):
+        code = compile_source("# 😀 🐗 🐖big🐖 @ 3000000000 #\n# 😀 🐽 🐖s🐖 @ 7 #\n"
+                              "# 😀 wow 🐖b🐖 @ 🐖big🐖 > 🐖s🐖 #\n"
+                              "# 😀 wow 🐖c🐖 @ 🐖s🐖 🌸< 100 #\n"
+                              "# 😀 wow 🐖d🐖 @ 🐖b🐖 💩🌸 🐖c🐖 #\n# ... 🐖s🐖 ... #")
+        self.assertIn("  %_temp_1 = sext i16 %s to i64\n  %_temp_0 = icmp sgt i64 %big, %_temp_1", code)
+        self.assertIn("icmp sle i16 %s, 100", code)
+        self.assertIn("icmp ne i1 %b, %c", code)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
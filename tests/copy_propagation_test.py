@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import unittest
+from unittest import mock
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import compiler.visitor.code_generator as code_generator
+from compiler.lexer.lexer import Lexer
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+LOOP = ("# 😀 🐷 🐖a🐖 @ 0 #\n# 😀 🐷 🐖b🐖 @ 1 #\n"
+        "# OINK 🐖a🐖 < 10 #\n# 🐖🐖🐖 #\n# 🐖a🐖 @ 🐖a🐖 ❤️ 🐖b🐖 #\n# 🐖🐖🐖 #\n# ... 🐖a🐖 ... #")
+
+
+def compile_source(source: str) -> str:
+    ast = SyntaxParser(Lexer(source).tokenize()).parse_program()
+    SemanticAnalyzer().visit(ast)
+    return CodeGenerator(propagate_copies=True).visit(ast)
+
+
+class CopyPropagationTest(unittest.TestCase):
+
+    def test_variables_bind_to_constants(self):
+        code = compile_source(LOOP)
+        self.assertIn("while_cond_0:\n  %a.2 = phi i32 [ 0, %entry ], [ %a.1, %while_body_0 ]\n"
+                      "  %_temp_0 = icmp slt i32 %a.2, 10\n", code)
+        self.assertIn("while_body_0:\n  %a.1 = add i32 %a.2, 1\n  br label %while_cond_0\n", code)
+        self.assertNotIn(" = add i32 0, ", code)
+        self.assertNotIn(" = sext ", code)
+
+    def test_the_computed_value_takes_the_name_of_its_first_variable(self):
+        code = compile_source("# 😀 🐷 🐖x🐖 @ 7 #\n# 😀 🐷 🐖c🐖 @ 🐖x🐖 💞 🐖x🐖 #\n# 😀 🐷 🐖d🐖 @ 🐖c🐖 #\n"
+                              "# 🐖x🐖 @ 🐖d🐖 💔 1 #\n# ... 🐖d🐖 ❤️ 🐖x🐖 ... #")
+        self.assertIn("entry:\n  %c = mul i32 7, 7\n  %x.1 = sub i32 %c, 1\n  %_temp_2 = add i32 %c, %x.1\n", code)
+        self.assertNotIn("%d =", code)
+
+    def test_registers_that_were_written_out_are_still_widened(self):
+        with mock.patch.object(code_generator, 'FLUSH_LINES', 1):
+            code = compile_source("# 😀 🐽 🐖s🐖 @ 3 💞 4 #\n# 😀 🐗 🐖big🐖 @ 🐖s🐖 #\n# ... 🐖big🐖 ... #")
+        self.assertIn("  %s = mul i16 3, 4\n  %big = sext i16 %s to i64\n", code)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from depth_benchmark import nested_blocks, nested_brackets, operator_chain, negations
+from compiler.lexer.lexer import Lexer
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+DEPTH = 5000
+
+
+def compile_source(source: str) -> str:
+    ast = SyntaxParser(Lexer(source).tokenize()).parse_program()
+    SemanticAnalyzer().visit(ast)
+    return CodeGenerator().visit(ast)
+
+
+class DeepNestingTest(unittest.TestCase):
+
+    def test_nested_blocks(self):
+        self.assertEqual(compile_source(nested_blocks(DEPTH)).count("br i1"), DEPTH)
+
+    def test_nested_brackets(self):
+        self.assertEqual(compile_source(nested_brackets(DEPTH)).count(" = add i16 "), DEPTH)
+
+    def test_operator_chain(self):
+        self.assertEqual(compile_source(operator_chain(DEPTH)).count(" = add i16 "), DEPTH)
+
+    def test_negations(self):
+        self.assertEqual(compile_source(negations(DEPTH)).count("xor i1"), DEPTH)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
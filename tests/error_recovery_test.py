@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compiler.diagnostic import Diagnostic
+from compiler.lexer.lexer import Lexer
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+
+def first_error(source: str) -> str:
+    try:
+        SemanticAnalyzer().visit(SyntaxParser(Lexer(source).tokenize()).parse_program())
+    except ValueError as e:
+        return str(e)
+
+
+def all_errors(source: str, stream: bool = False) -> list[Diagnostic]:
+    lexer = Lexer(source, recover=True)
+    parser = SyntaxParser(lexer.stream() if stream else lexer.tokenize(), recover=True)
+    analyzer = SemanticAnalyzer(recover=True)
+    analyzer.visit(parser.parse_program())
+    return lexer.diagnostics + parser.diagnostics + analyzer.diagnostics
+
+
+class ErrorRecoveryTest(unittest.TestCase):
+
+    many_errors = """# 😀 🐷 🐖x🐖 @ 1 ❤️ #
+# 😀 🐷 🐖y🐖 @ 12a #
+# 🐖x🐖 @ $ #
+# 😀 🐷 🐖z🐖 @ LOVE #
+# SAVE 🐖x🐖 > #
+# 🐖🐖🐖 #
+# 🐖w🐖 @ 3 #
+# 🐖🐖🐖 #
+# SAVE 🐖x🐖 > 1 #
+# 🐖🐖🐖 #
+# 🐖q🐖 @ 1 #
+# 🐖🐖🐖 #
+#~ HURT 🐖x🐖 >
+# 🐖🐖🐖 #
+# 🐖x🐖 @ 2 #
+# 🐖🐖🐖 #
+# ... 🐖x🐖 ... #"""
+
+    sources = [
+        ("valid", "# 😀 🐷 🐖x🐖 @ 1 #\n# SAVE 🐖x🐖 > 0 #\n# 🐖🐖🐖 #\n# 🐖x🐖 @ 2 #\n# 🐖🐖🐖 #\n# ... 🐖x🐖 ... #"),
+        ("many_errors", many_errors),
+        ("unclosed_block", "# 😀 🐷 🐖x🐖 @ 1 #\n# OINK 🐖x🐖 > 0 #\n# 🐖🐖🐖 #\n# ... 🐖x🐖 ... #"),
+        ("missing_return", "# 😀 🐷 🐖x🐖 @ 1 #"),
+        ("code_after_return", "# 😀 🐷 🐖x🐖 @ 1 #\n# ... 🐖x🐖 ... #\n# 🐖x🐖 @ 2 #"),
+    ]
+
+    def test_first_diagnostic_matches_default_mode(self):
+        for name, source in self.sources:
+            with self.subTest(name=name):
+                diagnostics = all_errors(source)
+                self.assertEqual(diagnostics[0].message if diagnostics else None, first_error(source))
+
+    def test_reports_every_error_once(self):
+        diagnostics = [(d.stage, d.line) for d in all_errors(self.many_errors)]
+        self.assertEqual(diagnostics, [
+            ("lexer", 2), ("lexer", 3),
+            ("parser", 1), ("parser", 3), ("parser", 5), ("parser", 13),
+            ("semantic", 4), ("semantic", 7), ("semantic", 11),
+        ])
+
+    def test_checks_the_blocks_of_a_statement_with_an_invalid_condition(self):
+        source = ("# 😀 🐷 🐖x🐖 @ 1 #\n"
+                  "# SAVE 🐖x🐖 #\n# 🐖🐖🐖 #\n# 🐖z🐖 @ 1 #\n# 😀 wow 🐖b🐖 @ 5 #\n# 🐖🐖🐖 #\n"
+                  "# HURT 🐖p🐖 #\n# 🐖🐖🐖 #\n# 🐖y🐖 @ 1 #\n# 🐖🐖🐖 #\n"
+                  "# KILL #\n# 🐖🐖🐖 #\n# 🐖v🐖 @ 1 #\n# 🐖🐖🐖 #\n"
+                  "# OINK 🐖q🐖 > 1 #\n# 🐖🐖🐖 #\n# 🐖w🐖 @ 2 #\n# 🐖🐖🐖 #\n"
+                  "# ... 🐖x🐖 ... #")
+        diagnostics = all_errors(source)
+        self.assertEqual([d.line for d in diagnostics], [2, 4, 5, 7, 9, 13, 15, 17])
+        self.assertEqual(diagnostics[0].message, first_error(source))
+
+    def test_recovers_on_a_token_stream(self):
+        for name, source in self.sources:
+            with self.subTest(name=name):
+                self.assertEqual([vars(d) for d in all_errors(source, stream=True)],
+                                 [vars(d) for d in all_errors(source)])
+
+    def test_recovery_keeps_valid_program_unchanged(self):
+        source = self.sources[0][1]
+        default = SyntaxParser(Lexer(source).tokenize()).parse_program()
+        recovered = SyntaxParser(Lexer(source).tokenize(), recover=True).parse_program()
+        self.assertEqual(len(default.statement_nodes), len(recovered.statement_nodes))
+        self.assertEqual([type(node) for node in default.statement_nodes],
+                         [type(node) for node in recovered.statement_nodes])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from program_generator import generate_program
+from compiler.lexer.lexer import Lexer
+from compiler.limits import CompilerLimits, NO_LIMITS
+from compiler.node.hash_cons_builder import HashConsBuilder
+from compiler.node.node_builder import NodeBuilder
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.fused_code_generator import FusedCodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+DECLARATIONS = "# 😀 🐷 🐖a🐖 @ 3 #\n# 😀 wow 🐖b🐖 @ LOVE #\n"
+
+
+def parse(source: str, shared_expressions: bool = False):
+    builder = HashConsBuilder() if shared_expressions else NodeBuilder()
+    return SyntaxParser(Lexer(source).tokenize(), builder=builder).parse_program()
+
+
+def compile_in_two_passes(source: str, limits: CompilerLimits = NO_LIMITS, shared_expressions: bool = False) -> str:
+    ast = parse(source, shared_expressions)
+    SemanticAnalyzer(limits=limits, shared_expressions=shared_expressions).visit(ast)
+    return CodeGenerator(limits, shared_expressions).visit(ast)
+
+
+def compile_fused(source: str, limits: CompilerLimits = NO_LIMITS, shared_expressions: bool = False) -> str:
+    return FusedCodeGenerator(limits, shared_expressions).generate(parse(source, shared_expressions))
+
+
+class FusedCodeGeneratorTest(unittest.TestCase):
+
+    def test_emits_the_same_code_as_both_passes(self):
+        source = generate_program(2000)
+        self.assertEqual(compile_fused(source), compile_in_two_passes(source))
+        self.assertEqual(compile_fused(source, shared_expressions=True),
+                         compile_in_two_passes(source, shared_expressions=True))
+
+    def test_reports_the_same_errors_as_both_passes(self):
+        programs = [
+            "# 😀 🐷 🐖a🐖 @ 🐖a🐖 ❤️ 1 #\n# ... 🐖a🐖 ... #",
+            DECLARATIONS + "# 🐖a🐖 @ 🐖b🐖 #\n# ... 🐖a🐖 ... #",
+            DECLARATIONS + "# OINK 🐖a🐖 #\n# 🐖🐖🐖 #\n# 🐖a🐖 @ 1 #\n# 🐖🐖🐖 #\n# ... 🐖a🐖 ... #",
+            DECLARATIONS + "# SAVE 🐖b🐖 #\n# 🐖🐖🐖 #\n# 😀 🐷 🐖c🐖 @ 1 #\n# 🐖🐖🐖 #\n# ... 🐖c🐖 ... #",
+            DECLARATIONS + "# 😀 🐷 🐖a🐖 @ 1 #\n# ... 🐖a🐖 ... #",
+        ]
+        for source in programs:
+            with self.subTest(source=source):
+                with self.assertRaises(ValueError) as two_passes:
+                    compile_in_two_passes(source)
+                with self.assertRaises(ValueError) as fused:
+                    compile_fused(source)
+                self.assertEqual(str(fused.exception), str(two_passes.exception))
+
+    def test_semantic_errors_win_over_the_instruction_budget(self):
+        source = DECLARATIONS + "# 🐖a🐖 @ 🐖a🐖 ❤️ 1 #\n" * 20 + "# 🐖a🐖 @ 🐖b🐖 #\n# ... 🐖a🐖 ... #"
+        limits = CompilerLimits(max_instructions=10)
+        with self.assertRaises(ValueError) as fused:
+            compile_fused(source, limits)
+        self.assertIn("Types do not match at line 23", str(fused.exception))
+        with self.assertRaises(ValueError) as fused:
+            compile_fused(source.replace("# 🐖a🐖 @ 🐖b🐖 #\n", ""), limits)
+        self.assertIn("LLVM instructions", str(fused.exception))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
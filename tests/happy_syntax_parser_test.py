@@ -13,7 +13,9 @@ from compiler.node.if_node import IfNode
 from compiler.node.while_node import WhileNode
 from compiler.node.binary_op_node import BinaryOpNode
 from compiler.node.number_node import NumberNode
+from compiler.node.unary_op_node import UnaryOpNode
 from compiler.llvm_specifics.data_type import DataType
+from compiler.llvm_specifics.operator import Operator
 
 
 class SyntaxParserHappyTest(unittest.TestCase):
@@ -63,6 +65,34 @@ def assert_while_loop(self, ast):
     self.assertIsInstance(while_stmt.condition, BinaryOpNode)
     self.assertEqual(len(while_stmt.block.statements), 1)
 
+def assert_operator_precedence(self, ast):
+    condition = ast.statement_nodes[1].expr_node
+    self.assertEqual(condition.operator, Operator.OR)
+    self.assertEqual(condition.left.operator, Operator.AND)
+    comparison = condition.left.left
+    self.assertEqual(comparison.operator, Operator.LESS)
+    self.assertEqual(comparison.left.operator, Operator.PLUS)
+    self.assertEqual(comparison.left.right.operator, Operator.MULTIPLY)
+    self.assertIsInstance(condition.left.right, UnaryOpNode)
+
+def assert_mood_line_inverts_operators(self, ast):
+    value = ast.statement_nodes[1].expr_node
+    self.assertEqual(value.operator, Operator.MINUS)
+    self.assertEqual(value.left.operator, Operator.PLUS)
+    self.assertEqual(value.right.operator, Operator.MULTIPLY)
+
+def assert_deeply_nested_blocks(self, ast):
+    statement = ast.statement_nodes[1]
+    depth = 0
+    while isinstance(statement, IfNode):
+        depth += 1
+        self.assertEqual(statement.block.scope_id, NESTING_DEPTH - depth + 1)
+        statement = statement.block.statements[0]
+    self.assertEqual(depth, NESTING_DEPTH)
+    self.assertIsInstance(statement, AssignNode)
+
+
+NESTING_DEPTH = 2000
 
 all_tests = [
     (
@@ -100,6 +130,29 @@ all_tests = [
 # ... 🐖counter🐖 ... #""",
         assert_while_loop
     ),
+    (
+        "operator_precedence",
+        """# 😀 wow 🐖b🐖 @ LOVE #
+# 🐖b🐖 @ 1 ❤️ 2 💞 3 < 4 hru 💩 🐖b🐖 bruh HATE #
+# ... 1 ... #""",
+        assert_operator_precedence
+    ),
+    (
+        "mood_line_inverts_operators",
+        """# 😀 🐷 🐖x🐖 @ 1 #
+#~ 🐖x🐖 @ 1 💔 2 ❤️ 3 💕 4 ~#
+# ... 🐖x🐖 ... #""",
+        assert_mood_line_inverts_operators
+    ),
+    (
+        "deeply_nested_blocks",
+        "# 😀 🐷 🐖x🐖 @ 1 #\n"
+        + "# SAVE 🐖x🐖 > 0 #\n# 🐖🐖🐖 #\n" * NESTING_DEPTH
+        + "# 🐖x🐖 @ 2 #\n"
+        + "# 🐖🐖🐖 #\n" * NESTING_DEPTH
+        + "# ... 🐖x🐖 ... #",
+        assert_deeply_nested_blocks
+    ),
 ]
 
 for name, source, func in all_tests:
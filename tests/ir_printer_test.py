@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import io
+import unittest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from compiler.ir.basic_block import BasicBlock
+from compiler.ir.function import Function
+from compiler.ir.instruction import (BinaryInstruction, Branch, CastInstruction, ConditionalBranch, Phi, PrintResult,
+                                     Return)
+from compiler.ir.ir_printer import IRPrinter
+from compiler.llvm_specifics.data_type import DataType
+
+
+class IRPrinterTest(unittest.TestCase):
+
+    def test_prints_a_loop(self):
+        function = Function("main", DataType.I32)
+        entry, header, body, end = BasicBlock("entry"), BasicBlock("cond"), BasicBlock("body"), BasicBlock("end")
+        header.predecessors = [entry, body]
+        body.predecessors = [header]
+        end.predecessors = [header]
+
+        counter = Phi(0, DataType.I16, header)
+        counter.name = "%i"
+        next_counter = BinaryInstruction("%i.1", "add", DataType.I16, counter, "1")
+        counter.operands = ["0", next_counter]
+        header.phis = [counter]
+
+        condition = BinaryInstruction("%_temp_0", "icmp slt", DataType.I16, counter, "10")
+        result = CastInstruction("%_temp_1", "sext", counter, DataType.I16, DataType.I32)
+        entry.instructions = [Branch(header)]
+        header.instructions = [condition, ConditionalBranch(condition, body, end)]
+        body.instructions = [next_counter, Branch(header)]
+        end.instructions = [result, PrintResult(result), Return(DataType.I32, result)]
+        function.blocks = [entry, header, body, end]
+
+        output = io.StringIO()
+        printer = IRPrinter(output)
+        printer.begin_function(function)
+        printer.write_blocks(function)
+        printer.end_function()
+        self.assertEqual(output.getvalue(),
+                         "\ndefine i32 @main() {\n"
+                         "entry:\n  br label %cond\n"
+                         "cond:\n  %i = phi i16 [ 0, %entry ], [ %i.1, %body ]\n"
+                         "  %_temp_0 = icmp slt i16 %i, 10\n  br i1 %_temp_0, label %body, label %end\n"
+                         "body:\n  %i.1 = add i16 %i, 1\n  br label %cond\n"
+                         "end:\n  %_temp_1 = sext i16 %i to i32\n  call void @printResult(i32 %_temp_1)\n"
+                         "  ret i32 %_temp_1\n"
+                         "}")
+
+    def test_trivial_phis_are_printed_as_their_replacement(self):
+        block = BasicBlock("merge")
+        phi = Phi(0, DataType.I32, block)
+        phi.replacement = "%a.1"
+        block.phis = [phi]
+        block.instructions = [BinaryInstruction("%b", "mul", DataType.I32, phi, phi)]
+        function = Function("main", DataType.I32)
+        function.blocks = [block]
+
+        output = io.StringIO()
+        IRPrinter(output).write_blocks(function)
+        self.assertEqual(output.getvalue(), "merge:\n  %b = mul i32 %a.1, %a.1\n")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
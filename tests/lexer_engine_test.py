@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from program_generator import generate_program
+from compiler.lexer.lexer import Lexer
+from state_machine_lexer import StateMachineLexer
+
+
+def lex(lexer_class, source: str):
+    try:
+        return [(t.token_type, t.value, t.line, t.index) for t in lexer_class(source).tokenize()]
+    except ValueError as e:
+        return str(e)
+
+
+class LexerEngineTest(unittest.TestCase):
+
+    sources = [
+        ("unicode_identifier", "# 😀 🐷 🐖café&ß🐖 @ 1 #\n"),
+        ("unicode_digits", "# 😀 🐷 🐖x🐖 @ -٣٤ #\n"),
+        ("comment_after_statement", "# 😀 🐷 🐖x🐖 @ 1 # 👀 no newline token\n# ... 🐖x🐖 ... #"),
+        ("multiline_comment_lines", "# 🐖x🐖 @ 1 #\n👀👀👀\na\nb👀👀👀 # 🐖y🐖 @ 2 #\n"),
+        ("unclosed_multiline_comment", "👀👀👀\n# 🐖x🐖 @ 1 #\n"),
+        ("number_followed_by_letter", "# 🐖x🐖 @ 12a #\n"),
+        ("lonely_tilde", "# 🐖x🐖 @ 1 ~\n"),
+        ("broken_heart_emoji", "# 🐖x🐖 @ 1 ❤ 2 #\n"),
+        ("generated_program", generate_program(300, seed=7)),
+    ]
+
+    def test_same_stream_as_state_machine(self):
+        for name, source in self.sources:
+            with self.subTest(name=name):
+                self.assertEqual(lex(Lexer, source), lex(StateMachineLexer, source))
+
+    def test_same_stream_for_test_cases(self):
+        directory = os.path.join(ROOT, "test_cases")
+        for file_name in sorted(os.listdir(directory)):
+            with self.subTest(name=file_name):
+                with open(os.path.join(directory, file_name)) as file:
+                    source = file.read()
+                self.assertEqual(lex(Lexer, source), lex(StateMachineLexer, source))
+
+    def test_same_stream_for_utf8_bytes(self):
+        for name, source in self.sources:
+            with self.subTest(name=name):
+                self.assertEqual(lex(Lexer, source.encode('utf-8')), lex(Lexer, source))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from adversarial_benchmark import SHAPES
+from compiler.lexer.lexer import Lexer
+from compiler.limits import CompilerLimits
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+SIZE = 300
+
+
+def compile_source(source: str, limits: CompilerLimits) -> str:
+    ast = SyntaxParser(Lexer(source, limits=limits).tokenize(), limits=limits).parse_program()
+    SemanticAnalyzer(limits=limits).visit(ast)
+    return CodeGenerator(limits).visit(ast)
+
+
+class LimitsTest(unittest.TestCase):
+
+    cases = [
+        ("long identifier", CompilerLimits(max_identifier_length=SIZE - 1), "characters long"),
+        ("long number", CompilerLimits(max_number_length=SIZE - 1), "characters long"),
+        ("many variables", CompilerLimits(max_variables=SIZE - 1), "variables"),
+        ("comment flood", CompilerLimits(max_source_length=SIZE), "too long"),
+        ("nested blocks", CompilerLimits(max_nesting_depth=SIZE - 1), "deeper than"),
+        ("nested brackets", CompilerLimits(max_expression_length=SIZE), "tokens"),
+        ("operator chain", CompilerLimits(max_expression_length=SIZE), "tokens"),
+        ("negations", CompilerLimits(max_expression_length=SIZE - 1), "tokens"),
+        ("nested comparisons", CompilerLimits(max_instructions=SIZE), "LLVM instructions"),
+    ]
+
+    def test_limits_reject_adversarial_input(self):
+        for shape, limits, message in self.cases:
+            with self.subTest(shape=shape):
+                with self.assertRaises(ValueError) as context:
+                    compile_source(SHAPES[shape](SIZE), limits)
+                self.assertIn(message, str(context.exception))
+
+    def test_limits_at_the_boundary_accept_input(self):
+        source = SHAPES["nested blocks"](SIZE)
+        self.assertEqual(compile_source(source, CompilerLimits(max_nesting_depth=SIZE)),
+                         compile_source(source, CompilerLimits()))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
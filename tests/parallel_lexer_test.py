@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from program_generator import generate_program
+from compiler.lexer.lexer import Lexer
+from compiler.lexer.parallel_lexer import ParallelLexer
+
+
+def lex(tokenize):
+    try:
+        return [(t.token_type, t.value, t.line, t.index) for t in tokenize()]
+    except ValueError as e:
+        return str(e)
+
+
+class ParallelLexerTest(unittest.TestCase):
+
+    program = generate_program(400, seed=11)
+    comment = "👀👀👀\n" + "# 🐖x🐖 @ 1 #\n" * 200 + "👀👀👀"
+
+    sources = [
+        ("generated_program", program),
+        ("multiline_comment_across_chunks", program + comment + "\n" + program),
+        ("unclosed_multiline_comment", program + comment[:-len("👀👀👀")]),
+        ("eyes_inside_single_line_comment", program + "👀 not 👀👀👀 a block\n" + program),
+        ("no_trailing_newline", program + "# ... 🐖alpha🐖 ... #"),
+        ("error_in_last_chunk", program + program + "# 🐖x🐖 @ 12a #\n"),
+        ("earliest_error_wins", program + "# 🐖x🐖 @ 1 ❤ 2 #\n" + program + "# 🐖x🐖 @ 12a #\n"),
+    ]
+
+    def test_same_stream_as_sequential_lexer(self):
+        for name, source in self.sources:
+            for encode in (False, True):
+                with self.subTest(name=name, bytes=encode):
+                    if encode:
+                        source = source.encode('utf-8')
+                    parallel = ParallelLexer(source, workers=4, min_chunk_size=1000)
+                    self.assertEqual(lex(parallel.tokenize), lex(Lexer(source).tokenize))
+
+    def test_small_source_is_lexed_in_process(self):
+        tokens = ParallelLexer(self.program, workers=4).tokenize()
+        self.assertEqual(lex(lambda: tokens), lex(Lexer(self.program).tokenize))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from program_generator import generate_program
+from compiler.lexer.lexer import Lexer
+from compiler.node.ast_node import ASTNode
+from compiler.parallel_syntax_parser import ParallelSyntaxParser
+from compiler.syntax_parser import SyntaxParser
+
+
+def dump(value):
+    if isinstance(value, ASTNode):
+        # the program's line index belongs to the source, not to the tree
+        fields = [name for cls in type(value).__mro__ for name in getattr(cls, "__slots__", ()) if name != "lines"]
+        return type(value).__name__, {name: dump(getattr(value, name)) for name in fields}
+    if isinstance(value, list):
+        return [dump(item) for item in value]
+    return value
+
+
+def parse(source: str, parallel: bool):
+    tokens = Lexer(source).tokenize()
+    try:
+        if parallel:
+            return dump(ParallelSyntaxParser(tokens, workers=4, min_range_size=200).parse_program())
+        return dump(SyntaxParser(tokens).parse_program())
+    except ValueError as e:
+        return str(e)
+
+
+class ParallelSyntaxParserTest(unittest.TestCase):
+
+    program = generate_program(600, seed=21)
+    body, return_line = program.rsplit("# ...", 1)
+    nested = "# SAVE 🐖alpha🐖 > 1 #\n# 🐖🐖🐖 #\n# OINK 🐖beta🐖 < 3 #\n# 🐖🐖🐖 #\n" \
+             "# ... 🐖beta🐖 ... #\n🐖🐖🐖 #\n# 🐖🐖🐖 #\n#~ HURT 🐖alpha🐖 > 2 ~#\n# 🐖🐖🐖 #\n" \
+             "# 🐖🐖🐖 #\n# KILL #\n# 🐖🐖🐖 #\n# 🐖alpha🐖 @ 1 #\n# 🐖🐖🐖 #\n"
+
+    sources = [
+        ("generated_program", program),
+        ("nested_blocks_and_returns", body + nested * 20 + body.split("\n", 9)[9] + "# ..." + return_line),
+        ("error_in_last_range", body + "# 🐖alpha🐖 @ #\n# ..." + return_line),
+        ("unclosed_block", body + "# SAVE LOVE #\n# 🐖🐖🐖 #\n" + body.split("\n", 9)[9] + "# ..." + return_line),
+        ("no_return", body),
+    ]
+
+    def test_same_ast_as_sequential_parser(self):
+        for name, source in self.sources:
+            with self.subTest(name=name):
+                self.assertEqual(parse(source, parallel=True), parse(source, parallel=False))
+
+    def test_only_syntax_errors_and_dead_workers_fall_back_to_sequential_parsing(self):
+        parse_ranges = "_ParallelSyntaxParser__parse_ranges"
+        with mock.patch.object(ParallelSyntaxParser, parse_ranges, side_effect=BrokenProcessPool):
+            self.assertEqual(parse(self.program, parallel=True), parse(self.program, parallel=False))
+        with mock.patch.object(ParallelSyntaxParser, parse_ranges, side_effect=MemoryError):
+            with self.assertRaises(MemoryError):
+                parse(self.program, parallel=True)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
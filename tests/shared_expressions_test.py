@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from compiler.lexer.lexer import Lexer
+from compiler.node.hash_cons_builder import HashConsBuilder
+from compiler.parallel_syntax_parser import ParallelSyntaxParser
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.arena_writer import ArenaWriter
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+DECLARATIONS = "# 😀 🐷 🐖a🐖 @ 3 #\n# 😀 🐷 🐖b🐖 @ 4 #\n"
+
+
+def parse_shared(source: str):
+    return SyntaxParser(Lexer(source).tokenize(), builder=HashConsBuilder()).parse_program()
+
+
+def compile_ast(ast, shared_expressions: bool) -> str:
+    SemanticAnalyzer(shared_expressions=shared_expressions).visit(ast)
+    return CodeGenerator(shared_expressions=shared_expressions).visit(ast)
+
+
+class SharedExpressionsTest(unittest.TestCase):
+
+    def test_shares_repeated_subexpressions(self):
+        ast = parse_shared(DECLARATIONS + "# 😀 🐷 🐖c🐖 @ 🐖a🐖 💞 🐖b🐖 ❤️ 🐖a🐖 💞 🐖b🐖 #\n"
+                                          "# 😀 🐷 🐖d🐖 @ 🐖a🐖 💞 🐖b🐖 #\n# ... 🐖d🐖 ... #")
+        first = ast.statement_nodes[2].expr_node
+        self.assertIs(first.left, first.right)
+        self.assertIs(ast.statement_nodes[3].expr_node, first.left)
+
+    def test_assignment_ends_sharing_of_its_readers(self):
+        ast = parse_shared(DECLARATIONS + "# 😀 🐷 🐖c🐖 @ 🐖a🐖 💞 🐖b🐖 #\n# 😀 🐷 🐖d🐖 @ 🐖b🐖 ❤️ 1 #\n"
+                                          "# 🐖a🐖 @ 2 #\n"
+                                          "# 🐖c🐖 @ 🐖a🐖 💞 🐖b🐖 #\n# 🐖d🐖 @ 🐖b🐖 ❤️ 1 #\n# ... 🐖d🐖 ... #")
+        statements = ast.statement_nodes
+        self.assertIsNot(statements[5].expr_node, statements[2].expr_node)
+        self.assertIs(statements[6].expr_node, statements[3].expr_node)
+
+    def test_block_borders_end_sharing(self):
+        ast = parse_shared(DECLARATIONS + "# SAVE 🐖a🐖 > 1 #\n# 🐖🐖🐖 #\n# 🐖b🐖 @ 🐖a🐖 ❤️ 1 #\n# 🐖🐖🐖 #\n"
+                                          "# 😀 🐷 🐖c🐖 @ 🐖a🐖 ❤️ 1 #\n# ... 🐖c🐖 ... #")
+        inside = ast.statement_nodes[2].block.statements[0].expr_node
+        self.assertIsNot(ast.statement_nodes[3].expr_node, inside)
+
+    def test_emits_shared_expressions_once(self):
+        source = DECLARATIONS + "# 😀 🐷 🐖c🐖 @ ** 🐖a🐖 ❤️ 🐖b🐖 ** 💞 ** 🐖a🐖 ❤️ 🐖b🐖 ** #\n# ... 🐖c🐖 ... #"
+        tree_code = compile_ast(SyntaxParser(Lexer(source).tokenize()).parse_program(), False)
+        shared_code = compile_ast(parse_shared(source), True)
+        self.assertEqual(tree_code.count(" = add i32 %a, %b"), 2)
+        self.assertEqual(shared_code.count(" = add i32 %a, %b"), 1)
+        self.assertIn(" = mul i32 %_temp_2, %_temp_2", shared_code)
+
+    def test_arena_keeps_the_dag(self):
+        source = DECLARATIONS + "# 😀 🐷 🐖c🐖 @ ** 🐖a🐖 ❤️ 🐖b🐖 ** 💞 ** 🐖a🐖 ❤️ 🐖b🐖 ** #\n# ... 🐖c🐖 ... #"
+        ast = parse_shared(source)
+        SemanticAnalyzer(shared_expressions=True).visit(ast)
+        copy = ArenaWriter().write(ast).to_nodes()
+        self.assertEqual(CodeGenerator(shared_expressions=True).visit(copy),
+                         CodeGenerator(shared_expressions=True).visit(ast))
+
+    def test_shared_identifiers_report_the_line_of_each_use(self):
+        source = "# 😀 🐷 🐖a🐖 @ 🐖q🐖 #\n# 😀 🐷 🐖b🐖 @ 🐖q🐖 #\n# 😀 🐷 🐖c🐖 @ 🐖q🐖 #\n# ... 🐖q🐖 ... #"
+        ast = parse_shared(source)
+        self.assertIs(ast.statement_nodes[0].expr_node, ast.statement_nodes[2].expr_node)
+        analyzer = SemanticAnalyzer(recover=True, shared_expressions=True)
+        analyzer.visit(ast)
+        self.assertEqual([d.line for d in analyzer.diagnostics], [1, 2, 3, 4])
+        for diagnostic in analyzer.diagnostics:
+            self.assertIn(f"uninitialized 'q' at line {diagnostic.line}!", diagnostic.message)
+
+    def test_parallel_parser_builds_the_dag_in_every_range(self):
+        line = "# 🐖c🐖 @ 🐖a🐖 💞 🐖b🐖 ❤️ 🐖a🐖 💞 🐖b🐖 #\n"
+        source = DECLARATIONS + "# 😀 🐷 🐖c🐖 @ 0 #\n" + line * 3000 + "# ... 🐖c🐖 ... #"
+        ast = ParallelSyntaxParser(Lexer(source).tokenize(), workers=2, min_range_size=1 << 12,
+                                   builder_type=HashConsBuilder).parse_program()
+        expressions = {id(statement.expr_node) for statement in ast.statement_nodes[3:]}
+        # sharing starts afresh in every worker's range
+        self.assertLess(len(expressions), 3000)
+        self.assertEqual(compile_ast(ast, True).count(" = mul i32 %a, %b"), len(expressions))
+        for statement in ast.statement_nodes[3:]:
+            self.assertIs(statement.expr_node.left, statement.expr_node.right)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from depth_benchmark import nested_blocks
+from compiler.lexer.lexer import Lexer
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+DEPTH = 5000
+DECLARATIONS = "# 😀 🐷 🐖a🐖 @ 0 #\n# 😀 🐷 🐖b🐖 @ 1 #\n"
+LOOP = DECLARATIONS + "# OINK 🐖a🐖 < 10 #\n# 🐖🐖🐖 #\n# 🐖a🐖 @ 🐖a🐖 ❤️ 🐖b🐖 #\n# 🐖🐖🐖 #\n# ... 🐖a🐖 ... #"
+
+
+def compile_source(source: str, stack_variables: bool = False) -> str:
+    ast = SyntaxParser(Lexer(source).tokenize()).parse_program()
+    SemanticAnalyzer().visit(ast)
+    return CodeGenerator(stack_variables=stack_variables).visit(ast)
+
+
+class SSATest(unittest.TestCase):
+
+    def test_loop_carried_variables_get_a_phi_in_the_loop_header(self):
+        code = compile_source(LOOP)
+        self.assertIn("while_cond_0:\n  %a.2 = phi i32 [ %a, %entry ], [ %a.1, %while_body_0 ]\n", code)
+        self.assertIn("  %_temp_4 = add i32 %a.2, %b\n  %a.1 = add i32 0, %_temp_4\n", code)
+        self.assertIn("  ret i32 %a.2\n", code)
+        self.assertEqual(code.count(" = phi "), 1)
+
+    def test_branches_are_merged_only_where_they_differ(self):
+        code = compile_source(DECLARATIONS + "# SAVE 🐖b🐖 > 0 #\n# 🐖🐖🐖 #\n# 🐖a🐖 @ 🐖b🐖 #\n# 🐖🐖🐖 #\n"
+                              "# KILL #\n# 🐖🐖🐖 #\n# 🐖a🐖 @ 2 #\n# 🐖🐖🐖 #\n# ... 🐖a🐖 💞 🐖b🐖 ... #")
+        self.assertIn("end_0:\n  %a.3 = phi i32 [ %a.1, %then_0 ], [ %a.2, %else_0 ]\n", code)
+        self.assertIn(" = mul i32 %a.3, %b\n", code)
+        self.assertEqual(code.count(" = phi "), 1)
+
+    def test_stack_variables_leave_the_phis_to_mem2reg(self):
+        code = compile_source(LOOP, stack_variables=True)
+        self.assertIn("entry:\n  %a = alloca i32\n  %b = alloca i32\n", code)
+        self.assertIn("  store i32 %_temp_0, i32* %a\n", code)
+        self.assertIn(" = load i32, i32* %b\n", code)
+        self.assertNotIn(" = phi ", code)
+
+    def test_deeply_nested_merges(self):
+        self.assertEqual(compile_source(nested_blocks(DEPTH)).count(" = phi "), DEPTH)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
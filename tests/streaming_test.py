@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import io
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from program_generator import generate_program
+import compiler.visitor.code_generator as code_generator
+from compiler.lexer.lexer import Lexer
+from compiler.output_file import OutputFile
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+LINES = 300
+
+
+def parse(source: str):
+    ast = SyntaxParser(Lexer(source).tokenize()).parse_program()
+    SemanticAnalyzer().visit(ast)
+    return ast
+
+
+class StreamingTest(unittest.TestCase):
+
+    def test_streams_the_same_code_as_it_returns(self):
+        source = generate_program(LINES)
+        expected = CodeGenerator().visit(parse(source))
+
+        output = io.StringIO()
+        generator = CodeGenerator(output=output)
+        self.assertIsNone(generator.visit(parse(source)))
+        self.assertEqual(output.getvalue(), expected)
+
+    def test_flushes_settled_blocks_while_it_runs(self):
+        source = generate_program(LINES)
+        with mock.patch.object(code_generator, 'FLUSH_LINES', 4):
+            output = io.StringIO()
+            generator = CodeGenerator(output=output)
+            writes = mock.Mock(side_effect=output.write)
+            with mock.patch.object(output, 'write', writes):
+                generator.visit(parse(source))
+        self.assertGreater(writes.call_count, 10)
+        self.assertEqual(generator.function.blocks, [])
+        self.assertNotIn("\0", output.getvalue())
+        self.assertTrue(output.getvalue().endswith("}"))
+
+    def test_output_file_is_only_replaced_on_success(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "out.ll")
+            with OutputFile(path) as output:
+                output.stream.write("old")
+                output.commit()
+            with self.assertRaises(ValueError):
+                with OutputFile(path) as output:
+                    output.stream.write("new")
+                    raise ValueError()
+            with open(path) as file:
+                self.assertEqual(file.read(), "old")
+            self.assertEqual(os.listdir(directory), ["out.ll"])
+
+    def test_pipes_are_written_directly(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "out.ll")
+            os.mkfifo(path)
+            received = []
+            reader = threading.Thread(target=lambda: received.append(open(path).read()))
+            reader.start()
+            with OutputFile(path) as output:
+                output.stream.write("define i32 @main()")
+                output.commit()
+            reader.join(timeout=10)
+            self.assertEqual(received, ["define i32 @main()"])
+            self.assertEqual(os.listdir(directory), ["out.ll"])
+            self.assertFalse(os.path.isfile(path))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
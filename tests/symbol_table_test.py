@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from depth_benchmark import nested_blocks
+from compiler.context import Context
+from compiler.lexer.lexer import Lexer
+from compiler.llvm_specifics.data_type import DataType
+from compiler.syntax_parser import SyntaxParser
+from compiler.variable_info import NO_SLOT
+from compiler.visitor.code_generator import CodeGenerator
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+SIBLINGS = ("# 😀 🐷 🐖x🐖 @ 1 #\n"
+            "# SAVE 🐖x🐖 > 0 #\n# 🐖🐖🐖 #\n# 😀 🐷 🐖y🐖 @ 🐖x🐖 #\n# 🐖y🐖 @ 2 #\n# 🐖🐖🐖 #\n"
+            "# OINK 🐖x🐖 < 0 #\n# 🐖🐖🐖 #\n# 😀 🐽 🐖y🐖 @ 3 #\n# 🐖🐖🐖 #\n"
+            "# ... 🐖x🐖 ... #")
+
+
+def parse(source: str):
+    return SyntaxParser(Lexer(source).tokenize()).parse_program()
+
+
+class SymbolTableTest(unittest.TestCase):
+
+    def test_exiting_a_scope_forgets_its_variables(self):
+        context = Context()
+        self.assertTrue(context.declare_variable("x", DataType.I32, True))
+        context.enter_scope()
+        self.assertTrue(context.declare_variable("y", DataType.BOOL, False))
+        self.assertFalse(context.declare_variable("x", DataType.I16, True))
+        self.assertTrue(context.is_declared_in_current_scope("y"))
+        self.assertFalse(context.is_declared_in_current_scope("x"))
+        self.assertEqual(context.get_variable_type("y"), DataType.BOOL)
+        context.exit_scope()
+        self.assertFalse(context.is_variable_declared("y"))
+        self.assertTrue(context.is_variable_mutable("x"))
+        context.exit_scope()
+        self.assertTrue(context.is_variable_declared("x"))
+
+    def test_redeclared_names_keep_their_slot(self):
+        context = Context()
+        context.enter_scope()
+        context.declare_variable("y", DataType.I32, True)
+        context.exit_scope()
+        context.declare_variable("x", DataType.I32, True)
+        context.declare_variable("y", DataType.I16, False)
+        self.assertEqual(context.lookup_variable("y").slot, 0)
+        self.assertEqual(context.lookup_variable("x").slot, 1)
+
+    def test_analysis_resolves_slots_of_references(self):
+        ast = parse(SIBLINGS)
+        self.assertEqual(ast.return_node.slot, NO_SLOT)
+        SemanticAnalyzer().visit(ast)
+        declaration, first_if, loop = ast.statement_nodes
+        inner_declaration, assignment = first_if.block.statements
+        self.assertEqual((declaration.slot, first_if.condition.left.slot, ast.return_node.slot), (0, 0, 0))
+        self.assertEqual((inner_declaration.slot, inner_declaration.expr_node.slot, assignment.slot), (1, 0, 1))
+        self.assertEqual(loop.block.statements[0].slot, 1)
+
+        code = CodeGenerator().visit(ast)
+        self.assertIn("%y.1 = add i32 0, ", code)
+        self.assertIn("%y.2 = add i16 0, 3", code)
+
+    def test_deep_nesting_is_checked_in_linear_time(self):
+        ast = parse(nested_blocks(20000))
+        analyzer = SemanticAnalyzer()
+        analyzer.visit(ast)
+        self.assertFalse(analyzer.diagnostics)
+        self.assertEqual(len(analyzer.context.scopes), 1)
+        self.assertEqual(analyzer.context.depths, {"x": 0})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
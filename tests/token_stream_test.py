@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from program_generator import generate_program
+from compiler.lexer.lexer import Lexer
+from compiler.syntax_parser import SyntaxParser
+from sad_syntax_parser_test import SyntaxParserSadTest
+
+
+def token_tuples(tokens):
+    return [(t.token_type, t.value, t.line, t.index) for t in tokens]
+
+
+def parse_error(source: str, stream: bool) -> str:
+    try:
+        lexer = Lexer(source)
+        SyntaxParser(lexer.stream() if stream else lexer.tokenize()).parse_program()
+    except ValueError as e:
+        return str(e)
+    return ""
+
+
+class TokenStreamTest(unittest.TestCase):
+
+    def test_stream_yields_same_tokens(self):
+        source = generate_program(200, seed=3)
+        self.assertEqual(token_tuples(Lexer(source).stream()), token_tuples(Lexer(source).tokenize()))
+
+    def test_parser_window_stays_small(self):
+        source = generate_program(2000, seed=4)
+        stream = Lexer(source).stream()
+        program = SyntaxParser(stream).parse_program()
+        self.assertGreater(len(program.statement_nodes), 100)
+        self.assertLess(len(stream.buffer.kinds), 100)
+        self.assertGreater(stream.first_index, 10000)
+
+    def test_same_errors_as_buffered_parsing(self):
+        for name, source in SyntaxParserSadTest.failing_cases:
+            with self.subTest(name=name):
+                expected = parse_error(source, stream=False)
+                self.assertTrue(expected)
+                self.assertEqual(parse_error(source, stream=True), expected)
+
+    def test_released_tokens_cannot_be_read(self):
+        stream = Lexer(generate_program(100, seed=5)).stream()
+        stream.kind(500)
+        with self.assertRaises(IndexError):
+            stream.value(0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+import unittest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from compiler.lexer.lexer import Lexer
+from compiler.llvm_specifics.data_type import DataType
+from compiler.node.number_node import NumberNode
+from compiler.syntax_parser import SyntaxParser
+from compiler.visitor.arena_writer import ArenaWriter
+from compiler.visitor.semantic_analyzer import SemanticAnalyzer
+
+SOURCE = ("# 😀 🐽 🐖a🐖 @ 7 #\n"
+          "# 😀 🐗 🐖b🐖 @ 🐖a🐖 💞 3000000000 #\n"
+          "# 😀 wow 🐖c🐖 @ 🐖a🐖 < 100000 hru 💩 LOVE #\n"
+          "# ... 🐖b🐖 ❤️ 🐖a🐖 ... #")
+
+
+def parse(source: str):
+    return SyntaxParser(Lexer(source).tokenize()).parse_program()
+
+
+def expression_types(ast) -> list:
+    b, c = ast.statement_nodes[1].expr_node, ast.statement_nodes[2].expr_node
+    return [b.data_type, b.left.data_type, b.right.data_type,
+            c.data_type, c.left.data_type, c.left.right.data_type, c.right.data_type,
+            ast.return_node.data_type, ast.return_node.right.data_type]
+
+
+class TypedASTTest(unittest.TestCase):
+
+    def test_literals_are_typed_when_parsed(self):
+        self.assertEqual((NumberNode.of("-5").int_value, NumberNode.of("-5").data_type), (-5, DataType.I16))
+        self.assertEqual(NumberNode.of("40000").data_type, DataType.I32)
+        self.assertEqual(NumberNode.of("3000000000").int_value, 3000000000)
+        self.assertEqual(NumberNode.of("3000000000").data_type, DataType.I64)
+
+    def test_analysis_types_every_expression(self):
+        ast = parse(SOURCE)
+        self.assertIsNone(ast.statement_nodes[1].expr_node.data_type)
+        SemanticAnalyzer().visit(ast)
+        self.assertEqual(expression_types(ast), [
+            DataType.I64, DataType.I16, DataType.I64,
+            DataType.BOOL, DataType.BOOL, DataType.I32, DataType.BOOL,
+            DataType.I64, DataType.I16])
+
+    def test_arena_keeps_the_types(self):
+        ast = parse(SOURCE)
+        SemanticAnalyzer().visit(ast)
+        self.assertEqual(expression_types(ArenaWriter().write(ast).to_nodes()), expression_types(ast))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)